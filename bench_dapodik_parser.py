@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the streaming school table parser against BeautifulSoup.
+
+Generates a large kecamatan page in the site's layout (see
+dapodik_fixture_server.py), then parses it with:
+- a BeautifulSoup baseline that builds the whole document tree
+- dapodik_parser.SchoolTableParser fed in 64 KB chunks
+
+Reports time, records per second and peak Python memory, and checks both
+produce the same records.
+
+Requirements:
+    pip install beautifulsoup4
+
+Usage:
+    python bench_dapodik_parser.py
+    python bench_dapodik_parser.py --rows 200000
+    python bench_dapodik_parser.py --page saved_page.html
+"""
+
+import argparse
+import html
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from dapodik_fixture_server import render_page, render_table
+from dapodik_parser import iter_school_table, school_from_row
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def bs4_parse_school_table(page, kecamatan_name):
+    """BeautifulSoup baseline: build the tree, then walk the first NPSN table."""
+    soup = BeautifulSoup(page, 'html.parser')
+    schools = []
+    for table in soup.find_all('table'):
+        header = [cell.get_text(strip=True) for cell in table.find_all('th')]
+        if 'NPSN' not in header:
+            continue
+
+        for tr in table.find_all('tr'):
+            cells = [cell.get_text(' ', strip=True) for cell in tr.find_all('td')]
+            if len(cells) != len(header):
+                continue
+            school = school_from_row(dict(zip(header, cells)), kecamatan_name, len(schools) + 1)
+            if school:
+                schools.append(school)
+        break
+    return schools
+
+
+def streaming_parse_school_table(page, kecamatan_name):
+    """Streaming parser fed in network-sized chunks."""
+    chunks = (page[i:i + CHUNK_SIZE] for i in range(0, len(page), CHUNK_SIZE))
+    return list(iter_school_table(chunks, kecamatan_name))
+
+
+def make_page(rows):
+    """Build a kecamatan page with the given number of school rows."""
+    header = ['No', 'NPSN', 'Nama Satuan Pendidikan', 'Alamat', 'Kelurahan', 'Status']
+    table_rows = [
+        [
+            str(i),
+            str(20300000 + i),
+            html.escape(f"SD NEGERI {i % 9 + 1} DESA {i}"),
+            html.escape(f"Jl. Raya No. {i} &amp; Gg. {i % 7}"),
+            f"Desa {i % 300}",
+            'NEGERI' if i % 5 else 'SWASTA',
+        ]
+        for i in range(1, rows + 1)
+    ]
+    return render_page("Kec. Contoh", render_table(header, table_rows))
+
+
+def measure(func, page):
+    """Return (seconds, peak bytes, result) for one parse."""
+    start = time.perf_counter()
+    result = func(page, "Contoh")
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(page, "Contoh")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the streaming Dapodik table parser'
+    )
+    parser.add_argument(
+        '--rows',
+        type=int,
+        default=50000,
+        help='Rows in the generated page (default: 50000)'
+    )
+    parser.add_argument(
+        '--page',
+        type=str,
+        help='Parse a saved page instead of a generated one'
+    )
+
+    args = parser.parse_args()
+
+    if args.page:
+        with open(args.page, 'rb') as f:
+            page = f.read()
+    else:
+        page = make_page(args.rows)
+
+    print("=" * 70)
+    print(f"Dapodik Table Parser Benchmark ({len(page) / 1e6:.1f} MB page)")
+    print("=" * 70)
+
+    results = {}
+    print(f"\n{'Parser':<20}{'Time (s)':>10}{'Records/s':>12}{'Peak MB':>10}")
+    for name, func in [("BeautifulSoup", bs4_parse_school_table),
+                       ("Streaming", streaming_parse_school_table)]:
+        elapsed, peak, records = measure(func, page)
+        results[name] = records
+        print(f"{name:<20}{elapsed:>10.2f}{len(records) / elapsed:>12.0f}{peak / 1e6:>10.1f}")
+
+    same = results["BeautifulSoup"] == results["Streaming"]
+    print(f"\nRecords: {len(results['Streaming'])} ({'identical' if same else 'DIFFERENT'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the on-disk derived-field cache (derived_fields.py).
+
+Builds a province-scale hierarchy (one copy of hierarchy.json per
+kabupaten, unit names made unique per kabupaten) and derives jabatan,
+kode_jabatan and the simplified jabatan for every unit:
+- cold: straight from jabatan_rules with its in-process caches cleared, as
+  in a fresh run without the cache
+- warm: from a DerivedCache saved by an earlier run
+- after edits: the warm cache after renaming some units; only those are
+  classified again, and only their entries are appended to the cache
+
+Usage:
+    python bench_derived_fields.py
+    python bench_derived_fields.py --kabupaten 20 --edits 200
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import jabatan_rules
+from bench_hierarchy_diff import make_province
+from derived_fields import DerivedCache
+
+
+def unique_units(kabupaten):
+    """(name, eselon, jabatan) of every unit, names suffixed with their kabupaten."""
+    units = []
+    for i, organization in enumerate(make_province(kabupaten), 1):
+        stack = list(organization['children'])
+        while stack:
+            unit = stack.pop()
+            units.append([f"{unit['name']} {i}", unit.get('eselon', ''), unit.get('jabatan', '')])
+            stack.extend(unit.get('children', []))
+    return units
+
+
+def derive_all(rules, units):
+    for name, eselon, jabatan in units:
+        rules.determine_jabatan(name, eselon)
+        rules.generate_kode_jabatan(jabatan, name)
+        rules.simplify_jabatan(jabatan)
+
+
+def clear_rule_caches():
+    for func in (jabatan_rules.determine_jabatan, jabatan_rules.generate_kode_jabatan,
+                 jabatan_rules.simplify_jabatan):
+        func.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the persistent derived-field cache'
+    )
+    parser.add_argument(
+        '--kabupaten',
+        type=int,
+        default=10,
+        help='Copies of hierarchy.json (default: 10)'
+    )
+    parser.add_argument(
+        '--edits',
+        type=int,
+        default=100,
+        help='Units renamed before the last run (default: 100)'
+    )
+
+    args = parser.parse_args()
+    units = unique_units(args.kabupaten)
+
+    print("=" * 70)
+    print(f"Derived Field Cache Benchmark ({len(units):,} units)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = Path(tmpdir) / "derived"
+
+        clear_rule_caches()
+        start = time.perf_counter()
+        derive_all(jabatan_rules, units)
+        cold = time.perf_counter() - start
+
+        clear_rule_caches()
+        with DerivedCache(cache_dir) as rules:
+            derive_all(rules, units)
+
+        clear_rule_caches()
+        start = time.perf_counter()
+        rules = DerivedCache(cache_dir)
+        derive_all(rules, units)
+        rules.save()
+        warm = time.perf_counter() - start
+        warm_misses = rules.misses
+
+        rng = random.Random(0)
+        for unit in rng.sample(units, args.edits):
+            unit[0] += " Baru"
+        clear_rule_caches()
+        start = time.perf_counter()
+        rules = DerivedCache(cache_dir)
+        derive_all(rules, units)
+        rules.save()
+        edited = time.perf_counter() - start
+
+        print(f"\n{'Run':<28}{'Time (s)':>10}{'Classified':>12}")
+        print(f"{'Cold (jabatan_rules)':<28}{cold:>10.3f}{'all':>12}")
+        print(f"{'Warm cache':<28}{warm:>10.3f}{warm_misses:>12}")
+        print(f"{f'After {args.edits} renames':<28}{edited:>10.3f}{rules.misses:>12}")
+        size = sum(path.stat().st_size for path in cache_dir.iterdir())
+        print(f"\nCache files: {size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the export backends in export_formats.py.
+
+Writes the same synthetic records in every available format and reports
+write time, time to read the file back and file size. The last line writes
+all formats from a single pass over the records, as
+`export_to_xlsx.py --format ...` does.
+
+Usage:
+    python bench_export_formats.py
+    python bench_export_formats.py --rows 200000 --formats csv parquet sqlite
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from bench_xlsx_export import synthetic_records
+from export_formats import SQLITE_TABLE, WRITERS, ExportError, load_pyarrow, open_writers, output_path, write_records
+from export_to_xlsx import COLUMNS
+
+
+KEYS = [key for key, _ in COLUMNS]
+
+pyarrow = load_pyarrow()
+
+
+def read_back(fmt, path):
+    """Read every row of an exported file; returns the row count."""
+    if fmt == 'csv':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return sum(1 for _ in csv.reader(f)) - 1
+    if fmt == 'ndjson':
+        with open(path, 'r', encoding='utf-8') as f:
+            return sum(1 for line in f if json.loads(line))
+    if fmt == 'parquet':
+        return len(pyarrow.parquet.read_table(path).to_pylist())
+    if fmt == 'sqlite':
+        with sqlite3.connect(path) as db:
+            return len(db.execute(f"SELECT * FROM {SQLITE_TABLE}").fetchall())
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True)
+    rows = sum(1 for _ in workbook.active.iter_rows(values_only=True)) - 1
+    workbook.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark export formats'
+    )
+    parser.add_argument(
+        '--rows',
+        type=int,
+        default=100000,
+        help='Number of synthetic rows to write (default: 100000)'
+    )
+    parser.add_argument(
+        '--formats',
+        nargs='+',
+        choices=list(WRITERS),
+        default=list(WRITERS),
+        help='Formats to compare (default: all)'
+    )
+
+    args = parser.parse_args()
+    rows = args.rows
+    formats = [fmt for fmt in args.formats if fmt != 'parquet' or pyarrow is not None]
+    if len(formats) < len(args.formats):
+        print("pyarrow is not installed; skipping parquet")
+
+    print("=" * 70)
+    print(f"Export Format Benchmark ({rows} rows)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base = Path(tmpdir) / "hierarchy_export"
+        print(f"\n{'Format':<12}{'Write (s)':>11}{'Rows/s':>12}{'Read (s)':>10}{'Size MB':>10}")
+        total_write = 0.0
+        for fmt in formats:
+            path = output_path(base, fmt)
+            start = time.perf_counter()
+            try:
+                write_records(synthetic_records(rows), open_writers({fmt: path}, KEYS))
+            except ExportError as e:
+                print(f"{fmt:<12}{e}")
+                continue
+            elapsed = time.perf_counter() - start
+            total_write += elapsed
+
+            start = time.perf_counter()
+            assert read_back(fmt, path) == rows
+            read_time = time.perf_counter() - start
+
+            print(f"{fmt:<12}{elapsed:>11.2f}{rows / elapsed:>12.0f}{read_time:>10.2f}"
+                  f"{path.stat().st_size / 1e6:>10.1f}")
+
+        start = time.perf_counter()
+        write_records(synthetic_records(rows), open_writers({fmt: output_path(base, fmt) for fmt in formats}, KEYS))
+        elapsed = time.perf_counter() - start
+        print(f"\nAll formats, one pass: {elapsed:.2f}s (separate runs: {total_write:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
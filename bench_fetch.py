@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark and check for the async Dapodik fetcher.
+
+Starts dapodik_fixture_server.py on a free local port with injected latency
+(and optionally transient 503 errors) and fetches all 27 kecamatan:
+- sequentially (concurrency 1), cold cache
+- concurrently, cold cache
+- concurrently, warm cache (every page answered with 304)
+
+Fetched schools are compared with the sd_negeri_*.json files the fixture
+pages were generated from. A small "Diff" count is expected: names are
+rebuilt with the KECAMATAN_MAP spelling ("Baturaden" vs "Baturraden" in
+the files) and with collapsed double spaces.
+
+Requirements:
+    pip install aiohttp
+
+Usage:
+    python bench_fetch.py
+    python bench_fetch.py --latency 0.2 --fail-rate 0.1 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from dapodik_client import fetch_kecamatan_schools
+from dapodik_fixture_server import start_fixture_server
+from update_sd_data import KECAMATAN_MAP
+
+
+def count_mismatches(results):
+    """Count fetched schools that differ from the local JSON files."""
+    mismatches = 0
+    base_path = Path(__file__).parent
+    for kec_key, kec_name in KECAMATAN_MAP.items():
+        with open(base_path / f"sd_negeri_{kec_key}.json", 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+        fetched = results.get(kec_name, [])
+        if len(fetched) != len(expected):
+            mismatches += abs(len(fetched) - len(expected))
+        mismatches += sum(1 for a, b in zip(fetched, expected) if a != b)
+    return mismatches
+
+
+def run(server, concurrency, cache_dir):
+    """Fetch all kecamatan and return (seconds, results, stats)."""
+    stats = {}
+    start = time.perf_counter()
+    results = asyncio.run(fetch_kecamatan_schools(
+        list(KECAMATAN_MAP.values()),
+        base_url=server.base_url,
+        concurrency=concurrency,
+        retries=5,
+        cache_dir=cache_dir,
+        stats=stats,
+    ))
+    return time.perf_counter() - start, results, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the async Dapodik fetcher against a local fixture server'
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.1,
+        help='Server latency per request in seconds (default: 0.1)'
+    )
+    parser.add_argument(
+        '--fail-rate',
+        type=float,
+        default=0.0,
+        help='Fraction of requests answered with 503 (default: 0)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Concurrent requests for the parallel runs (default: 8)'
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"Dapodik Fetch Benchmark (latency {args.latency}s, fail rate {args.fail_rate})")
+    print("=" * 70)
+
+    server = start_fixture_server(latency=args.latency, fail_rate=args.fail_rate)
+    try:
+        with tempfile.TemporaryDirectory() as seq_cache, tempfile.TemporaryDirectory() as par_cache:
+            runs = [
+                ("sequential, cold cache", 1, seq_cache),
+                (f"concurrency {args.concurrency}, cold cache", args.concurrency, par_cache),
+                (f"concurrency {args.concurrency}, warm cache", args.concurrency, par_cache),
+            ]
+
+            print(f"\n{'Run':<32}{'Time (s)':>10}{'Pages/s':>10}{'200':>6}{'304':>6}"
+                  f"{'Retry':>7}{'Diff':>6}")
+            for name, concurrency, cache_dir in runs:
+                elapsed, results, stats = run(server, concurrency, cache_dir)
+                pages = stats['downloaded'] + stats['not_modified']
+                print(f"{name:<32}{elapsed:>10.2f}{pages / elapsed:>10.1f}"
+                      f"{stats['downloaded']:>6}{stats['not_modified']:>6}"
+                      f"{stats['retries']:>7}{count_mismatches(results):>6}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
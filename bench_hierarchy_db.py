@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for hierarchy_db subtree queries.
+
+Answers "all IV.a units under Dinas Kesehatan dan Keluarga Berencana" and
+"every school under Kecamatan Ajibarang" twice:
+- by loading hierarchy.json and the sd_negeri files and walking them, as
+  the scripts did before hierarchy_db.py
+- with the indexed queries of HierarchyDB
+
+Usage:
+    python bench_hierarchy_db.py
+    python bench_hierarchy_db.py --repeat 500
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from hierarchy_db import HierarchyDB, build_database, kecamatan_of, school_files
+
+
+UNIT = "Dinas Kesehatan dan Keluarga Berencana"
+KECAMATAN = "Ajibarang"
+
+
+def walk_units(json_file, unit_name, eselon):
+    """Load hierarchy.json and collect the units with an eselon under a unit."""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    found = []
+    stack = [(item, False) for item in data]
+    while stack:
+        item, inside = stack.pop()
+        if inside and item.get('eselon') == eselon:
+            found.append(item['name'])
+        stack.extend((child, inside or item['name'] == unit_name) for child in item.get('children', []))
+    return found
+
+
+def walk_schools(paths, kecamatan):
+    """Load the sd_negeri files and collect the schools of one kecamatan."""
+    found = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        if kecamatan_of(path) == kecamatan:
+            found.extend(record['NPSN'] for record in records)
+    return found
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark SQLite subtree queries against walking the JSON files'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=50,
+        help='Repetitions per query (default: 50)'
+    )
+
+    args = parser.parse_args()
+    json_file = Path(__file__).parent / "hierarchy.json"
+    schools = school_files(json_file.parent)
+
+    print("=" * 70)
+    print("Hierarchy Database Benchmark")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_file = Path(tmpdir) / "hierarchy.db"
+        start = time.perf_counter()
+        counts = build_database(db_file, json_file, schools)
+        print(f"\nImport: {time.perf_counter() - start:.2f}s "
+              f"({counts['units']} units, {counts['closure']} closure rows, {counts['schools']} schools)")
+
+        with HierarchyDB(db_file) as db:
+            unit_id = db.find(UNIT)[0]['id']
+            kecamatan_id = db.find(f"Kecamatan {KECAMATAN}")[0]['id']
+            queries = [
+                (f"IV.a under {UNIT[:20]}...",
+                 lambda: walk_units(json_file, UNIT, "IV.a"),
+                 lambda: db.units_under(unit_id, eselon="IV.a")),
+                (f"Schools in {KECAMATAN}",
+                 lambda: walk_schools(schools, KECAMATAN),
+                 lambda: db.schools_under(kecamatan_id)),
+            ]
+
+            print(f"\n{'Query':<36}{'Rows':>6}{'JSON walk (ms)':>16}{'SQLite (ms)':>13}")
+            for name, walk, query in queries:
+                walk_time, expected = timed(walk, args.repeat)
+                query_time, rows = timed(query, args.repeat)
+                assert len(rows) == len(expected)
+                print(f"{name:<36}{len(rows):>6}{walk_time * 1000:>16.2f}{query_time * 1000:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
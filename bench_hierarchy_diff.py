@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark for hierarchy_diff on province-scale trees.
+
+Builds a synthetic province by repeating hierarchy.json once per kabupaten
+under a top-level unit each, applies random renames, moves, removals,
+additions and eselon changes to a copy, and times diff_hierarchies on the
+two versions for growing sizes. Near-linear scaling shows as a roughly
+constant time per unit.
+
+The synthetic renames only append " Baru", so every renamed unit has an
+exact-looking match. Real renames (schools renamed to "... Kecamatan X")
+put hundreds of similar names under one parent; the diff of a real
+version pair (hierarchy.json.bak3 -> hierarchy.json by default) is timed
+as well, and match_siblings is timed on single sibling groups of growing
+size filled with such renames; its time per name should stay roughly flat.
+
+Usage:
+    python bench_hierarchy_diff.py
+    python bench_hierarchy_diff.py --kabupaten 10 20 40 --edits 500
+    python bench_hierarchy_diff.py --pair hierarchy.json.bak hierarchy.json
+    python bench_hierarchy_diff.py --group-sizes 1000 4000 16000
+"""
+
+import argparse
+import copy
+import json
+import random
+import time
+from pathlib import Path
+
+from hierarchy_diff import diff_hierarchies, match_siblings
+from hierarchy_index import HierarchyIndex
+
+
+BASE_DIR = Path(__file__).parent
+
+# Syllables of the synthetic village names
+SYLLABLES = ['ka', 'ra', 'ng', 'su', 'mb', 'ja', 'wi', 'lo', 'te', 'gah', 'pu', 'rwo', 'ke', 'di', 'an']
+
+# Largest allowed growth of the time per name across the group sizes
+MAX_PER_NAME_GROWTH = 3
+
+
+def make_province(kabupaten):
+    """Return a hierarchy with one copy of hierarchy.json per kabupaten."""
+    with open(BASE_DIR / "hierarchy.json", 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [
+        {'name': f"Pemerintah Kabupaten {i}", 'children': copy.deepcopy(data)}
+        for i in range(1, kabupaten + 1)
+    ]
+
+
+def apply_edits(data, edits, seed=0):
+    """Apply random edits to a copy of data; return (new data, edit counts)."""
+    rng = random.Random(seed)
+    data = copy.deepcopy(data)
+    units = []
+    stack = [(data, None)]
+    while stack:
+        items, parent = stack.pop()
+        for item in items:
+            units.append((item, items))
+            stack.append((item.get('children', []), item))
+
+    counts = {'rename': 0, 'move': 0, 'remove': 0, 'add': 0, 'eselon': 0}
+    for _ in range(edits):
+        unit, siblings = rng.choice(units)
+        kind = rng.choice(list(counts))
+        if kind == 'rename':
+            unit['name'] += " Baru"
+        elif kind == 'move':
+            target, _ = rng.choice(units)
+            if target is unit or unit not in siblings:
+                continue
+            siblings.remove(unit)
+            target.setdefault('children', []).append(unit)
+        elif kind == 'remove':
+            if unit in siblings:
+                siblings.remove(unit)
+        elif kind == 'add':
+            unit.setdefault('children', []).append({'name': f"Unit Tambahan {rng.random():.6f}", 'children': []})
+        else:
+            unit['eselon'] = rng.choice(["II.b", "III.a", "IV.a"])
+        counts[kind] += 1
+    return data, counts
+
+
+def make_school_group(size, seed=0):
+    """
+    Return (old names, new names) of one sibling group of schools.
+
+    Every village has up to four numbered schools, and every new name
+    appends the kecamatan as in the real renames ("... Kecamatan Kembaran").
+    """
+    rng = random.Random(seed)
+    kecamatan = [f"Kecamatan {rng.choice(SYLLABLES).title()}{rng.choice(SYLLABLES)}" for _ in range(27)]
+    old_names, new_names = {}, {}
+    while len(old_names) < size:
+        village = ''.join(rng.choice(SYLLABLES) for _ in range(4)).title()
+        suffix = rng.choice(kecamatan)
+        for number in range(1, rng.randint(1, 4) + 1):
+            name = f"Sekolah Dasar Negeri {number} {village}"
+            old_names[len(old_names)] = name
+            new_names[len(new_names)] = f"{name} {suffix}"
+    return old_names, new_names
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark hierarchy_diff on province-scale trees'
+    )
+    parser.add_argument(
+        '--kabupaten',
+        type=int,
+        nargs='+',
+        default=[5, 10, 20],
+        help='Kabupaten counts to test (default: 5 10 20)'
+    )
+    parser.add_argument(
+        '--edits',
+        type=int,
+        default=300,
+        help='Random edits applied to the new version (default: 300)'
+    )
+    parser.add_argument(
+        '--pair',
+        nargs=2,
+        metavar=('OLD', 'NEW'),
+        default=['hierarchy.json.bak3', 'hierarchy.json'],
+        help='Real version pair to diff (default: hierarchy.json.bak3 hierarchy.json)'
+    )
+    parser.add_argument(
+        '--group-sizes',
+        type=int,
+        nargs='+',
+        default=[500, 1000, 2000, 4000],
+        help='Sibling group sizes for match_siblings (default: 500 1000 2000 4000)'
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Hierarchy Diff Benchmark")
+    print("=" * 70)
+    print(f"\n{'Units':>10}{'Diff (s)':>10}{'us/unit':>10}{'Added':>8}{'Removed':>9}{'Renamed':>9}{'Moved':>7}")
+
+    for kabupaten in args.kabupaten:
+        old_data = make_province(kabupaten)
+        new_data, _ = apply_edits(old_data, args.edits)
+        old, new = HierarchyIndex(old_data), HierarchyIndex(new_data)
+
+        start = time.perf_counter()
+        result = diff_hierarchies(old, new)
+        elapsed = time.perf_counter() - start
+
+        print(f"{len(old):>10,}{elapsed:>10.2f}{elapsed / len(old) * 1e6:>10.1f}"
+              f"{len(result['added']):>8}{len(result['removed']):>9}"
+              f"{len(result['renamed']):>9}{len(result['moved']):>7}")
+
+    print(f"\n{'Siblings':>10}{'Match (s)':>11}{'us/name':>10}{'Renamed':>9}")
+    per_name = []
+    for size in args.group_sizes:
+        old_names, new_names = make_school_group(size)
+        start = time.perf_counter()
+        pairs = match_siblings(old_names, new_names)
+        elapsed = time.perf_counter() - start
+        per_name.append(elapsed / len(old_names))
+        print(f"{len(old_names):>10,}{elapsed:>11.3f}{per_name[-1] * 1e6:>10.1f}{len(pairs):>9}")
+    growth = max(per_name) / min(per_name)
+    status = "✓" if growth < MAX_PER_NAME_GROWTH else "✗"
+    print(f"{status} Time per name grows {growth:.1f}x across group sizes (limit {MAX_PER_NAME_GROWTH}x)")
+
+    old_file, new_file = (BASE_DIR / name for name in args.pair)
+    if not old_file.exists() or not new_file.exists():
+        print(f"\nSkipping real version pair: {old_file.name} or {new_file.name} not found")
+        return
+
+    with open(old_file, 'r', encoding='utf-8') as f:
+        old = HierarchyIndex(json.load(f))
+    with open(new_file, 'r', encoding='utf-8') as f:
+        new = HierarchyIndex(json.load(f))
+
+    start = time.perf_counter()
+    result = diff_hierarchies(old, new)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nReal pair {old_file.name} -> {new_file.name}:")
+    print(f"{len(old):>10,}{elapsed:>10.2f}{elapsed / len(old) * 1e6:>10.1f}"
+          f"{len(result['added']):>8}{len(result['removed']):>9}"
+          f"{len(result['renamed']):>9}{len(result['moved']):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark for streaming JSON ingestion of hierarchy.json.
+
+Builds a synthetic hierarchy (the real organizations with every school and
+puskesmas repeated as extra leaves) and flattens it with:
+- json.load + iter_flatten_hierarchy (whole document in memory)
+- load_json (fast backend, if installed) + iter_flatten_hierarchy
+- iter_nodes streaming + iter_flatten_nodes
+
+Reports time and peak traced memory for each path and checks that all of
+them produce the same records.
+
+Requirements:
+    pip install openpyxl
+    pip install orjson  (optional, for the fast backend)
+
+Usage:
+    python bench_json_stream.py
+    python bench_json_stream.py --copies 200
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from export_to_xlsx import iter_flatten_hierarchy, iter_flatten_nodes
+from json_stream import FAST_BACKEND, iter_nodes, load_json
+
+
+def make_synthetic_hierarchy(copies):
+    """
+    Build a larger hierarchy from hierarchy.json.
+
+    Args:
+        copies: How many numbered copies of each childless unit to attach
+
+    Returns:
+        List of top-level units
+    """
+    with open(Path(__file__).parent / "hierarchy.json", 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    stack = list(data)
+    while stack:
+        unit = stack.pop()
+        children = unit.get('children') or []
+        stack.extend(children)
+        leaves = [child for child in children if not child.get('children')]
+        for leaf in leaves:
+            for i in range(1, copies):
+                copy = dict(leaf)
+                copy['name'] = f"{leaf['name']} {i}"
+                children.append(copy)
+    return data
+
+
+def measure(flatten):
+    """Run flatten() under tracemalloc; return (seconds, peak MB, row count, checksum)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = 0
+    checksum = 0
+    for record in flatten():
+        rows += 1
+        checksum ^= hash((record['nama_unit'], record['nama_parent'], record['kode_jabatan']))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), rows, checksum
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark streaming JSON ingestion of hierarchy.json'
+    )
+    parser.add_argument(
+        '--copies',
+        type=int,
+        default=50,
+        help='Copies of each leaf unit in the synthetic hierarchy (default: 50)'
+    )
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = Path(tmp) / "hierarchy.json"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(make_synthetic_hierarchy(args.copies), f, ensure_ascii=False, indent=2)
+        size_mb = json_file.stat().st_size / (1024 * 1024)
+
+        def with_json_load():
+            with open(json_file, 'r', encoding='utf-8') as f:
+                return iter_flatten_hierarchy(json.load(f))
+
+        paths = [
+            ("json.load", with_json_load),
+            (f"load_json ({FAST_BACKEND})", lambda: iter_flatten_hierarchy(load_json(json_file))),
+            ("iter_nodes (stream)", lambda: iter_flatten_nodes(iter_nodes(json_file, backend='stream'))),
+        ]
+
+        print("=" * 70)
+        print(f"Streaming JSON Ingestion Benchmark ({size_mb:.1f} MB)")
+        print("=" * 70)
+
+        print(f"\n{'Path':<28}{'Time (s)':>10}{'Peak (MB)':>12}{'Rows':>12}")
+        checksums = set()
+        for name, flatten in paths:
+            elapsed, peak, rows, checksum = measure(flatten)
+            checksums.add((rows, checksum))
+            print(f"{name:<28}{elapsed:>10.2f}{peak:>12.1f}{rows:>12,}")
+
+        print(f"\nRecords across paths: {'identical' if len(checksums) == 1 else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the fuzzy name index.
+
+Generates candidate names by garbling unit names from hierarchy.json the way
+setting.md does (casing, double spaces, list markers, "Sub Bagian", dropped
+or swapped letters) and reconciles them with:
+- an all-pairs scan scoring every indexed name
+- NameIndex.search (trigram prefix filtering)
+
+The indexed corpus can be enlarged with numbered copies of every name to
+approach province scale. Reports queries per second and how often the
+garbled name is matched back to its original.
+
+Usage:
+    python bench_name_index.py
+    python bench_name_index.py --queries 5000 --copies 20
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from hierarchy_index import HierarchyIndex
+from name_index import MIN_SCORE, NameIndex, dice, normalize_name, trigrams
+
+
+def garble(name, rng):
+    """Return a setting.md-style variant of a unit name."""
+    text = name.replace("Subbagian", rng.choice(["Subbagian", "Sub Bagian", "sub bagian"]))
+    if rng.random() < 0.5:
+        text = text.lower()
+    if rng.random() < 0.3:
+        text = text.replace(" ", "  ", 1)
+    if rng.random() < 0.4 and len(text) > 6:
+        i = rng.randrange(1, len(text) - 2)
+        if rng.random() < 0.5:
+            text = text[:i] + text[i + 1:]
+        else:
+            text = text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    marker = rng.choice(["", "a. ", "c. ", "1\\. ", "   2. "])
+    return marker + text + rng.choice(["", ";", "; dan", ","])
+
+
+def all_pairs_search(query, corpus):
+    """Best match by scoring every name in the corpus."""
+    grams = trigrams(normalize_name(query))
+    best_score, best = 0.0, None
+    for i, other in enumerate(corpus):
+        score = dice(grams, other)
+        if score > best_score:
+            best_score, best = score, i
+    return best if best_score >= MIN_SCORE else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the fuzzy name index'
+    )
+    parser.add_argument(
+        '--queries',
+        type=int,
+        default=3000,
+        help='Candidate names to reconcile (default: 3000)'
+    )
+    parser.add_argument(
+        '--copies',
+        type=int,
+        default=10,
+        help='Numbered copies of every unit name in the corpus (default: 10)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed (default: 0)'
+    )
+
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    unit_names = list(dict.fromkeys(HierarchyIndex.from_file(Path(__file__).parent / "hierarchy.json").names))
+    names = unit_names + [f"{name} {copy}" for copy in range(2, args.copies + 1) for name in unit_names]
+    targets = [rng.choice(names) for _ in range(args.queries)]
+    queries = [garble(name, rng) for name in targets]
+
+    print("=" * 70)
+    print(f"Name Index Benchmark ({len(names):,} names, {len(queries):,} queries)")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    index = NameIndex(names)
+    print(f"\nIndex build: {time.perf_counter() - start:.2f}s")
+
+    # The all-pairs scan is slow; time it on a sample and extrapolate
+    sample = queries[:max(1, len(queries) // 20)]
+    corpus = index.grams
+    start = time.perf_counter()
+    for query in sample:
+        all_pairs_search(query, corpus)
+    scan_rate = len(sample) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    matches = [index.search(query, k=1) for query in queries]
+    index_rate = len(queries) / (time.perf_counter() - start)
+
+    recovered = sum(
+        1 for target, match in zip(targets, matches)
+        if match and normalize_name(match[0][1]) == normalize_name(target)
+    )
+
+    print(f"\n{'Method':<28}{'Queries/s':>12}")
+    print(f"{'All-pairs scan':<28}{scan_rate:>12,.0f}")
+    print(f"{'NameIndex.search':<28}{index_rate:>12,.0f}")
+    print(f"\nSpeed-up: {index_rate / scan_rate:.1f}x")
+    print(f"Original name recovered: {recovered / len(queries):.1%}")
+
+
+if __name__ == "__main__":
+    main()
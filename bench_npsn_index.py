@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the NPSN index (npsn_index.py).
+
+Builds a province-scale set of sd_negeri files (copies of the real files
+with their NPSNs moved into another range per copy) and compares:
+- the current approach: load every file and build an NPSN -> record dict
+- building and opening the index
+- single lookups (get) and batch lookups (get_many, with and without NumPy)
+- prefix range scans
+
+Usage:
+    python bench_npsn_index.py
+    python bench_npsn_index.py --copies 90 --batch 10000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import npsn_index
+from hierarchy_db import school_files
+from npsn_index import NpsnIndex, build_npsn_index
+
+
+BASE_DIR = Path(__file__).parent
+
+
+def make_files(directory, copies):
+    """Write copies of the sd_negeri files; copy c gets NPSNs (10 + c) * 10**6 + ..."""
+    total = 0
+    for source in school_files(BASE_DIR):
+        with open(source, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        for copy in range(copies):
+            shifted = [
+                dict(record, NPSN=f"{(10 + copy) * 10 ** 6 + int(record['NPSN']) % 10 ** 6:08d}")
+                for record in records
+            ]
+            with open(Path(directory) / f"{source.stem}_{copy}.json", 'w', encoding='utf-8') as f:
+                json.dump(shifted, f, ensure_ascii=False)
+            total += len(shifted)
+    return total
+
+
+def load_dict(directory):
+    """What a script does today: read every file into one NPSN dict."""
+    schools = {}
+    for path in school_files(directory):
+        with open(path, 'r', encoding='utf-8') as f:
+            for record in json.load(f):
+                schools.setdefault(record['NPSN'], record)
+    return schools
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark NPSN lookups through the index'
+    )
+    parser.add_argument(
+        '--copies',
+        type=int,
+        default=60,
+        help='Copies of each sd_negeri file (default: 60)'
+    )
+    parser.add_argument(
+        '--batch',
+        type=int,
+        default=5000,
+        help='NPSNs per batch lookup (default: 5000)'
+    )
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        total = make_files(tmpdir, args.copies)
+        index_file = Path(tmpdir) / "npsn.idx"
+
+        print("=" * 70)
+        print(f"NPSN Index Benchmark ({total:,} schools, batch of {args.batch:,})")
+        print("=" * 70)
+
+        schools, load_time = timed(load_dict, tmpdir)
+        _, build_time = timed(build_npsn_index, tmpdir, index_file)
+        index, open_time = timed(NpsnIndex, index_file)
+
+        rng = random.Random(0)
+        keys = rng.sample(sorted(schools), args.batch // 2)
+        # Half of the batch misses
+        keys += [f"{rng.randrange(10 ** 7, 10 ** 8):08d}" for _ in range(args.batch - len(keys))]
+        rng.shuffle(keys)
+
+        # Import NumPy (if installed) outside the timed calls
+        index.find_many(keys[:1])
+        _, dict_time = timed(lambda: [schools.get(key) for key in keys])
+        single, get_time = timed(lambda: [index.get(key) for key in keys])
+        batch, batch_time = timed(index.get_many, keys)
+        rows, find_time = timed(index.find_many, keys)
+
+        numpy = npsn_index._numpy
+        npsn_index._numpy = lambda: None
+        try:
+            plain, plain_time = timed(index.find_many, keys)
+        finally:
+            npsn_index._numpy = numpy
+        assert single == batch and plain == rows
+
+        prefixes = [f"{10 + copy}30" for copy in range(args.copies)]
+        scans, scan_time = timed(lambda: [len(index.prefix(prefix)) for prefix in prefixes])
+
+        print(f"\n{'Step':<40}{'Time (ms)':>12}")
+        print(f"{'Load files into a dict':<40}{load_time * 1000:>12.1f}")
+        print(f"{'Build index':<40}{build_time * 1000:>12.1f}")
+        print(f"{'Open index (mmap)':<40}{open_time * 1000:>12.3f}")
+        print(f"\n{f'{args.batch:,} lookups':<40}{'Time (ms)':>12}{'us/lookup':>12}")
+        for label, seconds in [
+            ('dict.get (after loading)', dict_time),
+            ('index.get (bisect + decode)', get_time),
+            ('index.get_many', batch_time),
+            ('index.find_many (NumPy)' if numpy() else 'index.find_many', find_time),
+            ('index.find_many (bisect)', plain_time),
+        ]:
+            print(f"{label:<40}{seconds * 1000:>12.2f}{seconds * 1e6 / len(keys):>12.2f}")
+        print(f"\n{len(prefixes)} prefix scans ({sum(scans):,} rows): {scan_time * 1000:.2f} ms")
+        print(f"Index file: {index_file.stat().st_size / 1e6:.1f} MB")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
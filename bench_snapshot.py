@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark for opening the hierarchy from a binary snapshot.
+
+Times cold start (load + first lookup) of:
+- HierarchyIndex.from_file on hierarchy.json (JSON parse and dict building)
+- HierarchySnapshot on the compiled snapshot (mmap, no parsing)
+
+and the cost of name lookups and path queries on each. Checks that both
+return the same units.
+
+Usage:
+    python bench_snapshot.py
+    python bench_snapshot.py --repeat 200
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from hierarchy_index import HierarchyIndex
+from hierarchy_snapshot import HierarchySnapshot, build_snapshot
+
+
+def timed(func, repeat):
+    """Run func repeat times; return (seconds per call, last result)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark hierarchy snapshot loading'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=50,
+        help='Times each measurement is repeated (default: 50)'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='Hierarchy JSON file (default: hierarchy.json)'
+    )
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_file = Path(tmp) / "hierarchy.snap"
+        build_snapshot(args.file, snapshot_file)
+
+        index = HierarchyIndex.from_file(args.file)
+        names = list(dict.fromkeys(index.names))
+        lookup = names[len(names) // 2]
+
+        def open_json():
+            loaded = HierarchyIndex.from_file(args.file)
+            return [unit.id for unit in loaded.find(lookup)]
+
+        def open_snapshot():
+            with HierarchySnapshot(snapshot_file) as loaded:
+                return [unit.id for unit in loaded.find(lookup)]
+
+        print("=" * 70)
+        print(f"Hierarchy Snapshot Benchmark ({len(index):,} units)")
+        print("=" * 70)
+
+        json_open, json_ids = timed(open_json, args.repeat)
+        snap_open, snap_ids = timed(open_snapshot, args.repeat)
+        print(f"\n{'Cold start + lookup':<28}{'ms':>10}")
+        print(f"{'hierarchy.json':<28}{json_open * 1000:>10.2f}")
+        print(f"{'snapshot (mmap)':<28}{snap_open * 1000:>10.2f}")
+
+        with HierarchySnapshot(snapshot_file) as snapshot:
+            print(f"\n{'All names looked up':<28}{'ms':>10}")
+            for label, loaded in [("HierarchyIndex", index), ("HierarchySnapshot", snapshot)]:
+                elapsed, _ = timed(lambda: [loaded.find(name) for name in names], 1)
+                print(f"{label:<28}{elapsed * 1000:>10.2f}")
+
+            same = json_ids == snap_ids and all(
+                snapshot.path(unit_id) == index.path(unit_id) for unit_id in range(len(index))
+            )
+        print(f"\nResults vs JSON index: {'identical' if same else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
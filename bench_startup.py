@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the start-up time of the hierarchy.py subcommands.
+
+Every run is a fresh interpreter started with -X importtime, as when a
+script is launched from cron or an editor:
+- wall: median wall-clock time of the whole process
+- imports: time spent importing modules, from the -X importtime report
+- heaviest: the slowest top-level imports of the last run
+
+"<command> --help" measures start-up alone (parse the command line and
+exit); "validate --file" also validates one sd_negeri file. An empty
+interpreter (python -c pass) is included as the floor.
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py --runs 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).parent
+
+# (label, arguments after the interpreter)
+CASES = [
+    ('python -c pass', ['-c', 'pass']),
+    ('validate --help', ['hierarchy.py', 'validate', '--help']),
+    ('validate --file', ['hierarchy.py', 'validate', '--file', 'sd_negeri_ajibarang.json']),
+    ('export --help', ['hierarchy.py', 'export', '--help']),
+    ('update --help', ['hierarchy.py', 'update', '--help']),
+    ('enrich --help', ['hierarchy.py', 'enrich', '--help']),
+    ('watch --help', ['hierarchy.py', 'watch', '--help']),
+    ('npsn get', ['hierarchy.py', 'npsn', 'get', '20302232']),
+]
+
+# Wall-clock goal for a cold validate run, in milliseconds
+VALIDATE_TARGET_MS = 100
+
+
+def parse_importtime(stderr):
+    """
+    Read a -X importtime report.
+
+    Returns:
+        (total import time in ms, list of (ms, module) for top-level imports)
+    """
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented by two spaces per level
+        if name.startswith('  '):
+            continue
+        top_level.append((int(cumulative) / 1000, name.strip()))
+    return sum(ms for ms, _ in top_level), top_level
+
+
+def measure(args, runs):
+    """
+    Start a fresh interpreter several times.
+
+    Returns:
+        (median wall time in ms, median import time in ms, top-level imports of the last run)
+    """
+    walls = []
+    imports = []
+    top_level = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + args,
+            cwd=BASE_DIR, capture_output=True, text=True
+        )
+        walls.append((time.perf_counter() - start) * 1000)
+        total, top_level = parse_importtime(result.stderr)
+        imports.append(total)
+    return statistics.median(walls), statistics.median(imports), top_level
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark cold start-up of the hierarchy.py subcommands'
+    )
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=10,
+        help='Interpreter starts per case (default: 10)'
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"Start-up Benchmark (median of {args.runs} runs, -X importtime)")
+    print("=" * 70)
+    print(f"\n{'Case':<20}{'Wall (ms)':>11}{'Imports (ms)':>14}  Heaviest imports")
+
+    results = {}
+    for label, case_args in CASES:
+        wall, imports, top_level = measure(case_args, args.runs)
+        results[label] = wall
+        heaviest = sorted(top_level, reverse=True)[:3]
+        names = ', '.join(f"{name} {ms:.0f}" for ms, name in heaviest)
+        print(f"{label:<20}{wall:>11.1f}{imports:>14.1f}  {names}")
+
+    validate_ms = results['validate --file']
+    status = "✓" if validate_ms < VALIDATE_TARGET_MS else "✗"
+    print(f"\n{status} validate --file: {validate_ms:.0f} ms (target < {VALIDATE_TARGET_MS} ms)")
+
+
+if __name__ == "__main__":
+    main()
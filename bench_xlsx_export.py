@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for XLSX export: standard create_xlsx vs. create_xlsx_streaming.
+
+Writes synthetic hierarchy records to temporary files and reports rows per
+second and peak Python memory for each path.
+
+Usage:
+    python bench_xlsx_export.py
+    python bench_xlsx_export.py --rows 200000
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from export_to_xlsx import create_xlsx, create_xlsx_streaming
+
+
+def synthetic_records(count):
+    """
+    Generate synthetic flattened hierarchy records.
+
+    Args:
+        count: Number of records to generate
+
+    Yields:
+        Record dictionaries in the flatten_hierarchy format
+    """
+    for i in range(count):
+        yield {
+            'nama_unit': f"Sekolah Dasar Negeri {i} Kecamatan Contoh",
+            'nama_parent': f"UPTD Pendidikan Wilayah {i // 500}",
+            'eselon': '',
+            'jabatan': 'Kepala Sekolah',
+            'jabatan_lengkap': f"Kepala Sekolah Dasar Negeri {i}",
+            'kode_jabatan': 'KODE',
+            'catatan': '',
+        }
+
+
+def run(name, func, make_data, output_file, rows, track_memory):
+    """Run one export path and return (seconds, peak_bytes)."""
+    data = make_data()
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(data, output_file)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if track_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark XLSX export paths'
+    )
+    parser.add_argument(
+        '--rows',
+        type=int,
+        default=100000,
+        help='Number of synthetic rows to write (default: 100000)'
+    )
+
+    args = parser.parse_args()
+    rows = args.rows
+
+    print("=" * 70)
+    print(f"XLSX Export Benchmark ({rows} rows)")
+    print("=" * 70)
+
+    paths = [
+        # The standard path takes a fully built list, as main() does today
+        ("create_xlsx", create_xlsx, lambda: list(synthetic_records(rows))),
+        # The streaming path pulls rows straight from a generator
+        ("create_xlsx_streaming", create_xlsx_streaming, lambda: synthetic_records(rows)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"\n{'Mode':<25}{'Time (s)':>10}{'Rows/s':>12}{'Peak MB':>10}{'Size MB':>10}")
+        for name, func, make_data in paths:
+            output_file = str(Path(tmpdir) / f"{name}.xlsx")
+            elapsed, _ = run(name, func, make_data, output_file, rows, track_memory=False)
+            _, peak = run(name, func, make_data, output_file, rows, track_memory=True)
+            size = Path(output_file).stat().st_size
+            print(f"{name:<25}{elapsed:>10.2f}{rows / elapsed:>12.0f}"
+                  f"{peak / 1e6:>10.1f}{size / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
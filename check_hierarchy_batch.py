@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Check that hierarchy_batch.apply_batch applies a unit's edits in the
+order of the operations.
+
+Applies a batch of renames followed by AddJabatan to a copy of
+hierarchy.json and fails unless every renamed unit was classified under
+its new name.
+
+Usage:
+    python check_hierarchy_batch.py
+    python check_hierarchy_batch.py --renames 200
+"""
+
+import argparse
+import copy
+import time
+from pathlib import Path
+
+import jabatan_rules
+from hierarchy_batch import AddJabatan, Rename, apply_batch
+from json_stream import load_json
+
+
+def top_level_renames(data, count):
+    """Rename the first top-level organizations from 'Dinas ...' to 'Badan ...'."""
+    renames = []
+    for unit in data:
+        if len(renames) == count:
+            break
+        if unit['name'].startswith('Dinas '):
+            renames.append(((unit['name'],), 'Badan ' + unit['name'][len('Dinas '):]))
+    return renames
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check that a rename + classify batch classifies the new names'
+    )
+    parser.add_argument(
+        '--renames',
+        type=int,
+        default=20,
+        help='Top-level Dinas units to rename (default: 20)'
+    )
+
+    args = parser.parse_args()
+    data = load_json(Path(__file__).parent / "hierarchy.json")
+    renames = top_level_renames(data, args.renames)
+
+    print("=" * 70)
+    print(f"Batch Order Check ({len(renames)} renames + add_jabatan)")
+    print("=" * 70)
+
+    work = copy.deepcopy(data)
+    operations = [Rename(path, name) for path, name in renames] + [AddJabatan()]
+    start = time.perf_counter()
+    result = apply_batch(work, operations)
+    elapsed = time.perf_counter() - start
+
+    units = {unit['name']: unit for unit in work}
+    for _, new_name in renames:
+        unit = units[new_name]
+        expected = jabatan_rules.determine_jabatan(new_name, unit.get('eselon', ''))
+        assert unit['jabatan'] == expected, f"{new_name}: {unit['jabatan']!r} != {expected!r}"
+
+    print(f"\nUnits changed per operation: {result['changed'][-1]} by add_jabatan, "
+          f"{sum(result['changed'][:-1])} renamed")
+    print(f"apply_batch: {elapsed * 1000:.1f} ms")
+    print("✓ Renamed units are classified under their new names")
+
+
+if __name__ == "__main__":
+    main()
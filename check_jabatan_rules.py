@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Check that the jabatan_rules tables give the same results as the original
+if/elif functions.
+
+baseline_determine_jabatan (from add_jabatan_field.py), and
+baseline_generate_kode_jabatan and baseline_simplify_jabatan (from
+export_to_xlsx.py) are the functions as they were before the rules became
+tables in jabatan_rules.py; they are kept here unchanged as the reference.
+For every unit of the hierarchy files the check compares:
+- determine_jabatan for the unit's name at every eselon level (and none)
+- generate_kode_jabatan and simplify_jabatan for the unit's stored jabatan
+  and for every jabatan derived above
+
+Any difference is printed and the script exits with status 1.
+
+Usage:
+    python check_jabatan_rules.py
+    python check_jabatan_rules.py hierarchy.json hierarchy.json.bak hierarchy.json.bak3
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import jabatan_rules
+from json_stream import iter_nodes
+
+
+BASE_DIR = Path(__file__).parent
+
+# Eselon levels every name is classified at; '' is a unit without eselon
+ESELON_LEVELS = ['', 'I', 'II.a', 'II.b', 'III.a', 'III.b', 'IV.a', 'IV.b', 'V.a']
+
+# Differences printed before the rest are only counted
+MAX_REPORTED = 20
+
+
+def baseline_determine_jabatan(name: str, eselon: str, parent_name: str = "") -> str:
+    """
+    Determine the appropriate jabatan (position title) based on organization name and type.
+    
+    Args:
+        name: Organization/unit name
+        eselon: Echelon level
+        parent_name: Parent organization name (for context)
+    
+    Returns:
+        Appropriate jabatan title with full unit name
+    """
+    name_lower = name.lower()
+    
+    # Top-level organization titles (Eselon II.b and higher)
+    if eselon in ["II.a", "II.b", "I"]:
+        # Sekretariat Daerah
+        if "sekretariat daerah" in name_lower:
+            return "Sekretaris Daerah"
+        
+        # Sekretariat DPRD
+        if "sekretariat dprd" in name_lower:
+            return "Sekretaris DPRD"
+        
+        # BPBD - Kepala Pelaksana BPBD
+        if "badan penanggulangan bencana daerah" in name_lower or "bpbd" in name_lower:
+            return "Kepala Pelaksana BPBD"
+        
+        # Other Badan (agencies) - include full name
+        if name.startswith("Badan "):
+            return f"Kepala {name}"
+        
+        # Dinas (departments) - include full name
+        if name.startswith("Dinas ") or name.startswith("DINAS "):
+            return f"Kepala {name}"
+        
+        # Inspektorat
+        if "inspektorat" in name_lower:
+            return "Inspektur Daerah"
+        
+        # Satpol PP
+        if "satpol pp" in name_lower or "satuan polisi pamong praja" in name_lower:
+            return "Kepala Satpol PP"
+        
+        # Kecamatan
+        if name.startswith("Kecamatan "):
+            return "Camat"
+        
+        # RSUD (Regional Public Hospital)
+        if "rsud" in name_lower or "rumah sakit umum daerah" in name_lower:
+            return "Direktur RSUD"
+        
+        # Asisten (Assistant)
+        if name.startswith("Asisten "):
+            return "Asisten Sekretaris Daerah"
+    
+    # Eselon III (mid-level)
+    if eselon in ["III.a", "III.b"]:
+        # Kecamatan (sub-district)
+        if name.startswith("Kecamatan "):
+            return "Camat"
+        
+        # Sekretariat (within agencies/organizations, not "Sekretariat Daerah")
+        if name.startswith("Sekretariat ") and name != "Sekretariat Daerah":
+            # Remove "Sekretariat " prefix from the unit name to get parent organization name
+            # e.g., "Sekretariat Badan X" -> "Sekretaris Badan X" (not "Sekretaris Sekretariat Badan X")
+            parent_org_name = name.replace("Sekretariat ", "", 1)
+            return f"Sekretaris {parent_org_name}"
+        
+        # Bagian (Section) - include full name
+        if name.startswith("Bagian "):
+            return f"Kepala {name}"
+        
+        # Bidang (Division) - include full name
+        if name.startswith("Bidang "):
+            return f"Kepala {name}"
+        
+        # Klinik - include full name
+        if "klinik" in name_lower:
+            return f"Kepala {name}"
+        
+        # RSUD at this level - include full name
+        if "rsud" in name_lower or "rumah sakit" in name_lower:
+            return f"Direktur {name}"
+        
+        # Puskesmas (Community Health Center) - include full name
+        if "puskesmas" in name_lower:
+            return f"Kepala {name}"
+        
+        # Laboratorium - include full name
+        if "laboratorium" in name_lower:
+            return f"Kepala {name}"
+        
+        # Kantor (Office) - include full name
+        if "kantor" in name_lower:
+            return f"Kepala {name}"
+        
+        # Kelurahan (Urban Village) - include full name
+        if "kelurahan" in name_lower:
+            return f"Lurah {name}"
+    
+    # Eselon IV (lower level)
+    if eselon in ["IV.a", "IV.b"]:
+        # Subbagian (Sub-section) - include full name
+        if name.startswith("Subbagian ") or name.startswith("Sub Bagian "):
+            return f"Kepala {name}"
+        
+        # Subbidang (Sub-division) - include full name
+        if name.startswith("Subbidang ") or name.startswith("Sub Bidang "):
+            return f"Kepala {name}"
+        
+        # Seksi (Section) - include full name
+        if name.startswith("Seksi "):
+            return f"Kepala {name}"
+        
+        # Desa (Village) - include full name
+        if "desa" in name_lower or name.startswith("Desa "):
+            return f"Kepala {name}"
+    
+    # Default fallback based on organizational hierarchy
+    if eselon == "I":
+        return "Pimpinan"
+    elif eselon in ["II.a", "II.b"]:
+        return "Kepala"
+    elif eselon in ["III.a", "III.b"]:
+        return "Kepala"
+    elif eselon in ["IV.a", "IV.b"]:
+        return "Kepala"
+    
+    # If no eselon, return generic title
+    return "Pejabat"
+
+
+def baseline_generate_kode_jabatan(jabatan, unit_name):
+    """
+    Generate a position code (kode_jabatan) based on the position title and unit name.
+    
+    Args:
+        jabatan: Position title
+        unit_name: Unit name
+    
+    Returns:
+        Position code string
+    """
+    jabatan_lower = jabatan.lower()
+    unit_lower = unit_name.lower()
+    
+    # Sekretaris Daerah
+    if "sekretaris daerah" in jabatan_lower:
+        return "SEKDA"
+    
+    # Sekretaris DPRD
+    if "sekretaris dprd" in jabatan_lower:
+        return "SEKDPRD"
+    
+    # Kepala Pelaksana BPBD
+    if "kepala pelaksana bpbd" in jabatan_lower:
+        return "KAPEL_BPBD"
+    
+    # Kepala Badan
+    if "kepala badan" in jabatan_lower:
+        # Extract key words from unit name
+        if "kepegawaian" in unit_lower:
+            return "KABKP"
+        elif "keuangan" in unit_lower:
+            return "KABKAD"
+        elif "penanggulangan bencana" in unit_lower or "bpbd" in unit_lower:
+            return "KABPBD"
+        elif "kesatuan bangsa" in unit_lower:
+            return "KABKESBANGPOL"
+        elif "pendapatan" in unit_lower:
+            return "KABAPENDA"
+        elif "perencanaan" in unit_lower:
+            return "KABAPPEDA"
+        else:
+            return "KABADAN"
+    
+    # Kepala Dinas
+    if "kepala dinas" in jabatan_lower:
+        if "pendidikan" in unit_lower:
+            return "KADIS_DIKDAS"
+        elif "kesehatan" in unit_lower:
+            return "KADIS_KES"
+        elif "pekerjaan umum" in unit_lower or "perumahan" in unit_lower:
+            return "KADIS_PUPR"
+        elif "sosial" in unit_lower:
+            return "KADIS_SOSIAL"
+        elif "lingkungan" in unit_lower:
+            return "KADIS_LH"
+        else:
+            return "KADIS"
+    
+    # Kepala Bagian
+    if "kepala bagian" in jabatan_lower:
+        if "umum" in unit_lower and "protokol" in unit_lower:
+            return "KB_UMUM_PROT"
+        elif "umum" in unit_lower:
+            return "KB_UMUM"
+        elif "keuangan" in unit_lower:
+            return "KB_KEUANGAN"
+        else:
+            return "KABAG"
+    
+    # Kepala Bidang
+    if "kepala bidang" in jabatan_lower:
+        if "pendidikan dasar" in unit_lower:
+            return "KABID_DIKDAS"
+        else:
+            return "KABID"
+    
+    # Kepala Subbagian
+    if "kepala subbagian" in jabatan_lower or "kepala sub bagian" in jabatan_lower:
+        if "keuangan" in unit_lower:
+            return "KASUBAG_KEU"
+        elif "umum" in unit_lower:
+            return "KASUBAG_UMUM"
+        else:
+            return "KASUBAG"
+    
+    # Sekretaris (for agencies/organizations)
+    if "sekretaris" in jabatan_lower and "sekretaris daerah" not in jabatan_lower:
+        return "SEKRET"
+    
+    # Inspektur
+    if "inspektur" in jabatan_lower:
+        return "INSPEKTUR"
+    
+    # Camat
+    if "camat" in jabatan_lower:
+        return "CAMAT"
+    
+    # Default
+    return "KODE"
+
+
+def baseline_simplify_jabatan(jabatan):
+    """
+    Simplify jabatan by removing unit-specific names.
+    
+    Args:
+        jabatan: Full position title
+    
+    Returns:
+        Simplified position title
+    """
+    if not jabatan:
+        return jabatan
+    
+    jabatan_lower = jabatan.lower()
+    
+    # Rules for simplification:
+    # 1. "Kepala Badan X" -> "Kepala Badan"
+    if jabatan_lower.startswith('kepala badan '):
+        return 'Kepala Badan'
+    
+    # 2. "Sekretaris Badan X" -> "Sekretaris Badan"
+    elif jabatan_lower.startswith('sekretaris badan '):
+        return 'Sekretaris Badan'
+    
+    # 3. "Kepala Dinas X" -> "Kepala Dinas"
+    elif jabatan_lower.startswith('kepala dinas '):
+        return 'Kepala Dinas'
+    
+    # 4. "Sekretaris Dinas X" -> "Sekretaris Dinas" 
+    elif jabatan_lower.startswith('sekretaris dinas '):
+        return 'Sekretaris Dinas'
+    
+    # 5. "Direktur X" -> "Direktur"
+    elif jabatan_lower.startswith('direktur '):
+        return 'Direktur'
+    
+    # 6. "Kepala UPKP" (special case, should remain as is)
+    # 7. "Kepala UPTD" (special case, should remain as is)
+    # For other cases, return as is
+    return jabatan
+
+
+def check_file(json_file, mismatches):
+    """
+    Compare the rule tables with the baseline on every unit of one file.
+
+    Args:
+        json_file: Hierarchy JSON file
+        mismatches: List that receives (function, arguments, baseline, tables)
+
+    Returns:
+        Number of comparisons
+    """
+    checks = [
+        ('determine_jabatan', baseline_determine_jabatan, jabatan_rules.determine_jabatan),
+        ('generate_kode_jabatan', baseline_generate_kode_jabatan, jabatan_rules.generate_kode_jabatan),
+        ('simplify_jabatan', baseline_simplify_jabatan, jabatan_rules.simplify_jabatan),
+    ]
+    determine, kode, simplify = checks
+    count = 0
+
+    def compare(check, *args):
+        nonlocal count
+        label, baseline, tables = check
+        expected = baseline(*args)
+        actual = tables(*args)
+        count += 1
+        if expected != actual:
+            mismatches.append((label, args, expected, actual))
+        return expected
+
+    for _, unit in iter_nodes(json_file):
+        name = unit.get('name')
+        if not isinstance(name, str):
+            continue
+        jabatan = {unit.get('jabatan') or ''}
+        for eselon in dict.fromkeys(ESELON_LEVELS + [unit.get('eselon') or '']):
+            jabatan.add(compare(determine, name, eselon))
+        for value in sorted(jabatan):
+            compare(kode, value, name)
+            compare(simplify, value)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check jabatan_rules against the original if/elif functions'
+    )
+    parser.add_argument(
+        'files',
+        nargs='*',
+        default=['hierarchy.json'],
+        help='Hierarchy JSON files (default: hierarchy.json)'
+    )
+
+    args = parser.parse_args()
+
+    mismatches = []
+    total = 0
+    for name in args.files:
+        json_file = BASE_DIR / name
+        if not json_file.exists():
+            print(f"Error: {json_file} not found!")
+            sys.exit(1)
+        count = check_file(json_file, mismatches)
+        total += count
+        print(f"{json_file.name}: {count:,} comparisons")
+
+    for label, call_args, expected, actual in mismatches[:MAX_REPORTED]:
+        print(f"  ✗ {label}{call_args!r}: baseline {expected!r}, tables {actual!r}")
+    if mismatches:
+        print(f"\n✗ {len(mismatches)} of {total:,} results differ from the baseline")
+        sys.exit(1)
+    print(f"\n✓ All {total:,} results match the baseline")
+
+
+if __name__ == "__main__":
+    main()
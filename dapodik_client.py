@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Async client for the Dapodik reference pages (referensi.data.kemendikdasmen.go.id).
+
+Pages are fetched with one shared aiohttp session (connection pool) and a
+bounded number of requests in flight. Transient failures are retried with
+exponential backoff. Responses are kept in an on-disk HTTP cache and
+revalidated with conditional requests (ETag / If-Modified-Since), so
+unchanged pages cost a 304 instead of a full download.
+
+The site layout assumed here:
+- the region page lists kecamatan as links to /pendidikan/dikdas/<kode>/3
+- each kecamatan page /pendidikan/dikdas/<kode>/3/all/5/all holds a table
+  with columns No, NPSN, Nama Satuan Pendidikan, Alamat, Kelurahan, Status
+
+Pages are parsed while they download (see dapodik_parser.py).
+
+Requirements:
+    pip install aiohttp
+
+Usage:
+    from dapodik_client import fetch_kecamatan_schools
+    schools = asyncio.run(fetch_kecamatan_schools(["Ajibarang", "Banyumas"]))
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from urllib.parse import urljoin
+
+from dapodik_parser import RegionLinkParser, SchoolTableParser, normalize_kecamatan
+
+
+BASE_URL = "https://referensi.data.kemendikdasmen.go.id"
+
+# Kode wilayah for Kabupaten Banyumas, Jawa Tengah
+KODE_WILAYAH = "030211"
+
+REGION_PATH = "/pendidikan/dikdas/{kode}/2"
+KECAMATAN_PATH = "/pendidikan/dikdas/{kode}/3/all/5/all"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# On-disk HTTP cache, relative to this script
+HTTP_CACHE_DIR = ".http_cache"
+
+# HTTP statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Bytes read from the network per parser feed
+CHUNK_SIZE = 64 * 1024
+
+
+class FetchError(Exception):
+    """Raised when a page cannot be fetched after all retries."""
+
+
+class HttpCache:
+    """
+    On-disk cache of response bodies with their validators.
+
+    Each URL is stored as <sha1>.body plus <sha1>.json holding the URL,
+    ETag and Last-Modified headers.
+
+    Args:
+        cache_dir: Directory for cache files
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def get(self, url) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached entry for a URL.
+
+        Returns:
+            Dictionary with 'etag', 'last_modified' and 'body' (bytes), or None
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['body'] = body_path.read_bytes()
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry
+
+    def store(self, url, body: bytes, etag=None, last_modified=None):
+        """Store a response body and its validators."""
+        meta_path, body_path = self._paths(url)
+        tmp_body = body_path.with_suffix('.tmp')
+        tmp_body.write_bytes(body)
+        tmp_body.replace(body_path)
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+        }
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+
+    def touch(self, url):
+        """Record that a cached entry was revalidated."""
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['stored_at'] = time.time()
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+        except (OSError, json.JSONDecodeError):
+            pass
+
+
+class DapodikClient:
+    """
+    Shared async HTTP client with bounded concurrency, retries and caching.
+
+    Use as an async context manager:
+
+        async with DapodikClient() as client:
+            body = await client.fetch(url)
+
+    Args:
+        base_url: Site root (override to point at a local fixture server)
+        concurrency: Maximum requests in flight
+        retries: Retries per request after the first attempt
+        backoff: Base delay in seconds; attempt n waits backoff * 2**n (+ jitter)
+        timeout: Total timeout per request in seconds
+        cache_dir: HTTP cache directory (None disables the cache)
+    """
+
+    def __init__(self, base_url=BASE_URL, concurrency=8, retries=3, backoff=0.5,
+                 timeout=30, cache_dir=None):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = HttpCache(cache_dir) if cache_dir else None
+        self.stats = {'requests': 0, 'downloaded': 0, 'not_modified': 0, 'retries': 0}
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    def url(self, path: str) -> str:
+        """Resolve a site path against base_url."""
+        return urljoin(self.base_url + '/', path.lstrip('/'))
+
+    async def fetch(self, url: str, make_parser=None):
+        """
+        Fetch a URL, using the cache and retrying transient failures.
+
+        With make_parser, the body is fed to a fresh parser chunk by chunk as
+        it arrives (or from the cache on 304), and the parser's close() result
+        is returned instead of the body.
+
+        Args:
+            url: Absolute URL
+            make_parser: Optional callable returning an object with feed(bytes) and close()
+
+        Returns:
+            Response body, or the parser result
+
+        Raises:
+            FetchError: If the page could not be fetched
+        """
+        import aiohttp
+
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._retry_delay(attempt, last_error))
+
+            try:
+                async with self._semaphore:
+                    self.stats['requests'] += 1
+                    async with self._session.get(url, headers=headers) as response:
+                        if response.status == 304 and cached:
+                            self.stats['not_modified'] += 1
+                            self.cache.touch(url)
+                            if make_parser is None:
+                                return cached['body']
+                            parser = make_parser()
+                            parser.feed(cached['body'])
+                            return parser.close()
+
+                        if response.status in RETRY_STATUSES:
+                            last_error = _RetryableStatus(response.status,
+                                                          response.headers.get('Retry-After'))
+                            continue
+
+                        if response.status != 200:
+                            raise FetchError(f"{url}: HTTP {response.status}")
+
+                        # A new parser per attempt, so a retry never sees a partial page
+                        parser = make_parser() if make_parser else None
+                        chunks = []
+                        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                            chunks.append(chunk)
+                            if parser is not None:
+                                parser.feed(chunk)
+                        body = b''.join(chunks)
+
+                        self.stats['downloaded'] += 1
+                        if self.cache:
+                            self.cache.store(url, body,
+                                             etag=response.headers.get('ETag'),
+                                             last_modified=response.headers.get('Last-Modified'))
+                        return parser.close() if parser is not None else body
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+
+        raise FetchError(f"{url}: giving up after {self.retries + 1} attempts ({last_error})")
+
+    def _retry_delay(self, attempt, last_error) -> float:
+        retry_after = getattr(last_error, 'retry_after', None)
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        delay = self.backoff * (2 ** (attempt - 1))
+        return delay + random.uniform(0, delay / 2)
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.retry_after = retry_after
+
+
+async def fetch_kecamatan_schools(kecamatan_names: List[str], base_url=BASE_URL,
+                                  kode_wilayah=KODE_WILAYAH, concurrency=8, retries=3,
+                                  cache_dir=None, stats=None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch the SD Negeri of several kecamatan concurrently.
+
+    Args:
+        kecamatan_names: Kecamatan display names
+        base_url: Site root
+        kode_wilayah: Kode wilayah of the kabupaten
+        concurrency: Maximum requests in flight
+        retries: Retries per request
+        cache_dir: HTTP cache directory (None disables the cache)
+        stats: Optional dictionary updated with client statistics
+
+    Returns:
+        Dictionary of kecamatan name -> list of school dictionaries
+        (empty list if the kecamatan is missing or its page failed)
+    """
+    async with DapodikClient(base_url, concurrency=concurrency, retries=retries,
+                             cache_dir=cache_dir) as client:
+        region_url = client.url(REGION_PATH.format(kode=kode_wilayah))
+        links = await client.fetch(region_url, lambda: RegionLinkParser(KECAMATAN_PATH))
+
+        async def fetch_one(kecamatan_name):
+            path = links.get(normalize_kecamatan(kecamatan_name))
+            if path is None:
+                print(f"  Warning: {kecamatan_name} not listed on region page")
+                return []
+            try:
+                return await client.fetch(client.url(path),
+                                          lambda: SchoolTableParser(kecamatan_name))
+            except FetchError as e:
+                print(f"  Error fetching {kecamatan_name}: {e}")
+                return []
+
+        results = await asyncio.gather(*(fetch_one(name) for name in kecamatan_names))
+
+        if stats is not None:
+            stats.update(client.stats)
+
+    return dict(zip(kecamatan_names, results))
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for referensi.data.kemendikdasmen.go.id.
+
+Serves the region page and the per-kecamatan school tables that
+dapodik_client.py expects, so fetching can be developed and benchmarked
+offline. Pages come from two sources:
+- recorded pages: with --record-dir, a request for /a/b/c is answered with
+  <record-dir>/a_b_c.html when that file exists
+- otherwise pages are generated in the site's table layout from the
+  sd_negeri_*.json files in this repository
+
+Responses carry ETag and Last-Modified headers and honour If-None-Match /
+If-Modified-Since with 304. Latency and transient 503 errors can be injected
+to exercise the client's concurrency and retry logic.
+
+Usage:
+    python dapodik_fixture_server.py --port 8765
+    python dapodik_fixture_server.py --port 8765 --latency 0.2 --fail-rate 0.1
+    python update_sd_data.py --base-url http://127.0.0.1:8765 --dry-run
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from dapodik_client import KODE_WILAYAH, REGION_PATH, KECAMATAN_PATH
+from update_sd_data import KECAMATAN_MAP
+
+
+def site_school_name(name: str) -> str:
+    """
+    Turn a repo school name back into the site's listing style.
+
+    "Sekolah Dasar Negeri 1 Banjarsari Kecamatan Ajibarang" -> "SD NEGERI 1 BANJARSARI"
+    """
+    name = name.split(' Kecamatan ')[0]
+    name = name.replace('Sekolah Dasar Negeri', 'SD NEGERI', 1)
+    return name.upper()
+
+
+def render_table(header, rows) -> str:
+    """Render a simple HTML table like the ones on the site."""
+    parts = ['<table class="display" id="table1">', '<thead><tr>']
+    parts.extend(f'<th>{html.escape(cell)}</th>' for cell in header)
+    parts.append('</tr></thead><tbody>')
+    for row in rows:
+        parts.append('<tr>')
+        parts.extend(f'<td>{cell}</td>' for cell in row)
+        parts.append('</tr>')
+    parts.append('</tbody></table>')
+    return ''.join(parts)
+
+
+def render_page(title, body) -> bytes:
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        f'<title>{html.escape(title)}</title></head><body>'
+        f'<h1>{html.escape(title)}</h1>{body}</body></html>'
+    ).encode('utf-8')
+
+
+def build_fixture_pages(base_path=None, kode_wilayah=KODE_WILAYAH):
+    """
+    Generate the region page and one page per kecamatan from sd_negeri_*.json.
+
+    Args:
+        base_path: Directory holding the sd_negeri files (default: this directory)
+        kode_wilayah: Kode wilayah of the kabupaten
+
+    Returns:
+        Dictionary of URL path -> (body bytes, last-modified timestamp)
+    """
+    base_path = Path(base_path or Path(__file__).parent)
+    pages = {}
+    region_rows = []
+    region_mtime = 0
+
+    for number, (kec_key, kec_name) in enumerate(KECAMATAN_MAP.items(), start=1):
+        json_file = base_path / f"sd_negeri_{kec_key}.json"
+        if not json_file.exists():
+            continue
+
+        with open(json_file, 'r', encoding='utf-8') as f:
+            schools = json.load(f)
+        mtime = json_file.stat().st_mtime
+        region_mtime = max(region_mtime, mtime)
+
+        kode = f"{kode_wilayah}{number:02d}"
+        path = KECAMATAN_PATH.format(kode=kode)
+        region_rows.append([
+            str(number),
+            f'<a href="/pendidikan/dikdas/{kode}/3">Kec. {html.escape(kec_name)}</a>',
+            str(len(schools)),
+        ])
+
+        rows = [
+            [
+                str(idx),
+                html.escape(school.get('NPSN', '')),
+                html.escape(site_school_name(school.get('Nama Sekolah', ''))),
+                html.escape(school.get('Alamat', '')),
+                html.escape(school.get('Kelurahan', '')),
+                html.escape(school.get('Status', '')),
+            ]
+            for idx, school in enumerate(schools, start=1)
+        ]
+        header = ['No', 'NPSN', 'Nama Satuan Pendidikan', 'Alamat', 'Kelurahan', 'Status']
+        pages[path] = (render_page(f"Kec. {kec_name}", render_table(header, rows)), mtime)
+
+    region_table = render_table(['No', 'Wilayah', 'SD'], region_rows)
+    pages[REGION_PATH.format(kode=kode_wilayah)] = (render_page("Kab. Banyumas", region_table),
+                                                    region_mtime)
+    return pages
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Request handler; configuration lives on the server object."""
+
+    def do_GET(self):
+        server = self.server
+        server.count_request()
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.fail_rate and server.random.random() < server.fail_rate:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+
+        path = self.path.split('?')[0].rstrip('/') or '/'
+        page = server.lookup(path)
+        if page is None:
+            self.send_error(404)
+            return
+
+        body, mtime = page
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        last_modified = formatdate(mtime, usegmt=True)
+
+        if self._not_modified(etag, mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag, mtime) -> bool:
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')]
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server replaying Dapodik pages.
+
+    Args:
+        address: (host, port) tuple; port 0 picks a free port
+        record_dir: Optional directory of recorded pages
+        latency: Seconds to sleep before answering each request
+        fail_rate: Fraction of requests answered with 503
+        seed: Random seed for failure injection
+        quiet: Suppress per-request logging
+    """
+
+    daemon_threads = True
+    # Room for a whole burst of concurrent client connections
+    request_queue_size = 128
+
+    def __init__(self, address, record_dir=None, latency=0.0, fail_rate=0.0, seed=0, quiet=True):
+        super().__init__(address, FixtureHandler)
+        self.record_dir = Path(record_dir) if record_dir else None
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.quiet = quiet
+        self.pages = build_fixture_pages()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def lookup(self, path):
+        """Return (body, mtime) for a path, preferring recorded pages."""
+        if self.record_dir:
+            recorded = self.record_dir / (path.strip('/').replace('/', '_') + '.html')
+            if recorded.exists():
+                return recorded.read_bytes(), recorded.stat().st_mtime
+        return self.pages.get(path)
+
+
+def start_fixture_server(port=0, **options):
+    """
+    Start a fixture server on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        **options: Passed to FixtureServer
+
+    Returns:
+        Running FixtureServer (call shutdown() to stop it)
+    """
+    server = FixtureServer(('127.0.0.1', port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve offline Dapodik fixture pages'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port to listen on (default: 8765)'
+    )
+    parser.add_argument(
+        '--record-dir',
+        type=str,
+        help='Directory of recorded pages (path /a/b/c -> a_b_c.html)'
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Seconds of latency added to each response'
+    )
+    parser.add_argument(
+        '--fail-rate',
+        type=float,
+        default=0.0,
+        help='Fraction of requests answered with 503 (default: 0)'
+    )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Log every request'
+    )
+
+    args = parser.parse_args()
+
+    server = FixtureServer(('127.0.0.1', args.port), record_dir=args.record_dir,
+                           latency=args.latency, fail_rate=args.fail_rate,
+                           quiet=not args.verbose)
+    print(f"Serving Dapodik fixtures at {server.base_url}")
+    print(f"Region page: {server.base_url}{REGION_PATH.format(kode=KODE_WILAYAH)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
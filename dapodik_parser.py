@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Streaming parsers for the Dapodik reference pages.
+
+Built on html.parser.HTMLParser: bytes are fed in as they arrive and school
+records are produced as soon as each table row closes, without building a
+document tree. Memory stays bounded by one row plus the records not yet
+consumed.
+
+Usage:
+    parser = SchoolTableParser("Ajibarang")
+    for chunk in chunks:
+        parser.feed(chunk)
+        for school in parser.pop_records():
+            ...
+    parser.close()
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+
+def normalize_kecamatan(text: str) -> str:
+    """Lowercase a kecamatan label and drop 'Kec.'/'Kecamatan' and spaces."""
+    text = re.sub(r'^\s*(kec\.|kecamatan)\s*', '', text.strip().lower())
+    return re.sub(r'\s+', '', text)
+
+
+def format_school_name(raw_name: str, kecamatan_name: str) -> str:
+    """
+    Turn a Dapodik school name into the repo's naming convention.
+
+    "SD NEGERI 1 BANJARSARI" -> "Sekolah Dasar Negeri 1 Banjarsari Kecamatan Ajibarang"
+
+    Args:
+        raw_name: Name as listed on the site
+        kecamatan_name: Kecamatan display name
+
+    Returns:
+        Formatted school name
+    """
+    name = ' '.join(raw_name.split())
+    name = re.sub(r'^(SD\s*N(EGERI)?|SDN)\b', 'Sekolah Dasar Negeri', name, flags=re.IGNORECASE)
+    name = ' '.join(word if word.isdigit() else word.capitalize() for word in name.split())
+    if 'Kecamatan' not in name:
+        name = f"{name} Kecamatan {kecamatan_name}"
+    return name
+
+
+def school_from_row(row: Dict[str, str], kecamatan_name: str, number: int) -> Optional[Dict[str, Any]]:
+    """
+    Map one table row to the sd_negeri JSON schema.
+
+    Args:
+        row: Cell texts keyed by column header
+        kecamatan_name: Kecamatan display name
+        number: Value for 'No'
+
+    Returns:
+        School dictionary, or None if the row is not an SD Negeri
+    """
+    status = row.get('Status', '').strip().upper()
+    if status != 'NEGERI':
+        return None
+    return {
+        "No": str(number),
+        "NPSN": row.get('NPSN', '').strip(),
+        "Nama Sekolah": format_school_name(row.get('Nama Satuan Pendidikan', row.get('Nama', '')),
+                                           kecamatan_name),
+        "Alamat": row.get('Alamat', '').strip(),
+        "Kelurahan": row.get('Kelurahan', '').strip(),
+        "Status": "NEGERI",
+    }
+
+
+class StreamingHTMLParser(HTMLParser):
+    """
+    HTMLParser that accepts bytes chunks and decodes them incrementally.
+
+    Args:
+        encoding: Encoding of the fed bytes
+    """
+
+    def __init__(self, encoding='utf-8'):
+        super().__init__(convert_charrefs=True)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    def feed(self, data):
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        super().feed(data)
+
+    def close(self):
+        super().feed(self._decoder.decode(b'', final=True))
+        super().close()
+
+
+class SchoolTableParser(StreamingHTMLParser):
+    """
+    Extract SD Negeri records from the school table of a kecamatan page.
+
+    The first table whose header row contains 'NPSN' is used. Records are
+    available from pop_records() as soon as their row has been parsed.
+
+    Args:
+        kecamatan_name: Kecamatan display name (appended to school names)
+        encoding: Encoding of the fed bytes
+    """
+
+    def __init__(self, kecamatan_name: str, encoding='utf-8'):
+        super().__init__(encoding)
+        self.kecamatan_name = kecamatan_name
+        self.header = []
+        self.count = 0
+        self._records = []
+        self._table_depth = 0
+        self._done = False
+        self._cell = None
+        self._row_cells = None
+        # True while consecutive data events belong to the same text node
+        self._in_text = False
+
+    def handle_starttag(self, tag, attrs):
+        self._in_text = False
+        if self._done:
+            return
+        if tag == 'table':
+            self._table_depth += 1
+            if self._table_depth == 1:
+                self.header = []
+        elif not self._table_depth:
+            return
+        elif tag == 'tr':
+            self._row_cells = []
+        elif tag in ('td', 'th'):
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        self._in_text = False
+        if self._done or not self._table_depth:
+            return
+        if tag in ('td', 'th') and self._cell is not None:
+            pieces = [piece.strip() for piece in self._cell]
+            if tag == 'th':
+                self.header.append(''.join(pieces))
+            elif self._row_cells is not None:
+                self._row_cells.append(' '.join(piece for piece in pieces if piece))
+            self._cell = None
+        elif tag == 'tr':
+            self._end_row()
+        elif tag == 'table':
+            self._table_depth -= 1
+            if self._table_depth == 0 and 'NPSN' in self.header:
+                # Only the first school table is used
+                self._done = True
+
+    def handle_data(self, data):
+        if self._cell is None:
+            return
+        # A text node split across two fed chunks arrives as two events
+        if self._in_text:
+            self._cell[-1] += data
+        else:
+            self._cell.append(data)
+            self._in_text = True
+
+    def _end_row(self):
+        cells = self._row_cells
+        self._row_cells = None
+        if not cells or 'NPSN' not in self.header or len(cells) != len(self.header):
+            return
+        school = school_from_row(dict(zip(self.header, cells)), self.kecamatan_name, self.count + 1)
+        if school:
+            self.count += 1
+            self._records.append(school)
+
+    def pop_records(self) -> List[Dict[str, Any]]:
+        """Return and forget the records parsed so far."""
+        records, self._records = self._records, []
+        return records
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Finish parsing.
+
+        Returns:
+            Records not yet taken with pop_records()
+        """
+        super().close()
+        return self.pop_records()
+
+
+class RegionLinkParser(StreamingHTMLParser):
+    """
+    Extract kecamatan page links from the region page.
+
+    close() returns a dictionary of normalized kecamatan name -> kecamatan
+    page path.
+
+    Args:
+        kecamatan_path: Path template with a {kode} field for kecamatan pages
+        encoding: Encoding of the fed bytes
+    """
+
+    LINK_RE = re.compile(r'/pendidikan/dikdas/(\d+)/3(?:/|$)')
+
+    def __init__(self, kecamatan_path: str, encoding='utf-8'):
+        super().__init__(encoding)
+        self.kecamatan_path = kecamatan_path
+        self.links = {}
+        self._kode = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            match = self.LINK_RE.search(dict(attrs).get('href') or '')
+            self._kode = match.group(1) if match else None
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._kode is not None:
+            name = normalize_kecamatan(''.join(self._text))
+            self.links.setdefault(name, self.kecamatan_path.format(kode=self._kode))
+            self._kode = None
+
+    def handle_data(self, data):
+        if self._kode is not None:
+            self._text.append(data)
+
+    def close(self) -> Dict[str, str]:
+        super().close()
+        return self.links
+
+
+def iter_school_table(chunks: Iterable, kecamatan_name: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield SD Negeri records from a stream of page chunks.
+
+    Args:
+        chunks: Iterable of bytes or str pieces of the page
+        kecamatan_name: Kecamatan display name
+
+    Yields:
+        School dictionaries with keys: No, NPSN, Nama Sekolah, Alamat, Kelurahan, Status
+    """
+    parser = SchoolTableParser(kecamatan_name)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.pop_records()
+    yield from parser.close()
+
+
+def parse_school_table(html, kecamatan_name: str) -> List[Dict[str, Any]]:
+    """
+    Parse the school table of a complete kecamatan page.
+
+    Args:
+        html: Page body (bytes or str)
+        kecamatan_name: Kecamatan display name
+
+    Returns:
+        List of school dictionaries
+    """
+    return list(iter_school_table([html], kecamatan_name))
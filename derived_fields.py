@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of the fields derived from jabatan_rules.
+
+Every export and every --add-jabatan run classifies each unit again:
+jabatan from (name, eselon), kode_jabatan from (jabatan, name) and the
+simplified jabatan from jabatan. jabatan_rules caches these per process
+only. DerivedCache keeps the results on disk (.derived_cache/) between
+runs; the scripts use it only when given --derived-cache:
+- each derived field is keyed by exactly the inputs it depends on (see
+  DERIVED_FIELDS), so a unit whose inputs did not change is a dictionary
+  hit, and an edit only recomputes the units (and the fields downstream of
+  the edited field) whose inputs changed
+- no rule reads the parent unit, so the parent is not part of any key; a
+  rule that did would list it among its inputs
+- every field has its own file of one JSON entry per line, read the first
+  time the field is looked up; an export never reads the jabatan entries
+  and --add-jabatan never reads the kode_jabatan ones
+- save() appends the newly computed entries to their files instead of
+  rewriting them, so a run after a small edit writes only a few lines
+- each file starts with a hash of jabatan_rules.py; editing the rules
+  discards the cached entries
+- after a run over the whole tree, a field's file is compacted to the
+  entries that run looked up once at least half of it is stale, so the
+  files track the current tree instead of growing forever
+
+DerivedCache has the same determine_jabatan / generate_kode_jabatan /
+simplify_jabatan functions as jabatan_rules and can be passed wherever the
+rules module is accepted (AddJabatan, export_to_xlsx.make_record).
+
+Usage:
+    from derived_fields import DerivedCache
+
+    with DerivedCache() as rules:
+        rules.determine_jabatan("Dinas Pendidikan", "II.b")
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import jabatan_rules
+
+
+CACHE_DIR = Path(__file__).parent / ".derived_cache"
+
+# Derived field -> the inputs it depends on, in call order
+DERIVED_FIELDS = {
+    'determine_jabatan': ('name', 'eselon'),
+    'generate_kode_jabatan': ('jabatan', 'unit_name'),
+    'simplify_jabatan': ('jabatan',),
+}
+
+# A field's file is compacted when at most this share of its entries is still used
+COMPACT_SHARE = 0.5
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def rules_stamp():
+    """Hash of the rule definitions; cached values are only valid for the same rules."""
+    return hashlib.sha1(Path(jabatan_rules.__file__).read_bytes()).hexdigest()
+
+
+def _read_entries(path, stamp):
+    """
+    Read the entries of one field file.
+
+    The first line is the stamp; every other line is [input, ..., value].
+    A line cut short by an interrupted append is skipped.
+
+    Returns:
+        (list of entries, True if every line was read), or (None, False) if
+        the file is missing or has another stamp
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return None, False
+    header, _, body = text.partition('\n')
+    try:
+        if json.loads(header).get('stamp') != stamp:
+            return None, False
+    except (ValueError, AttributeError):
+        return None, False
+    lines = body.splitlines()
+    try:
+        # One decode for the whole file; strings never contain a raw newline
+        return json.loads('[' + ','.join(lines) + ']'), True
+    except ValueError:
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries, False
+
+
+class DerivedCache:
+    """
+    On-disk memo of jabatan_rules results, keyed by each field's inputs.
+
+    Args:
+        cache_dir: Directory holding one file per derived field (default: .derived_cache)
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.stamp = rules_stamp()
+        self.hits = 0
+        self.misses = 0
+        # Field -> {inputs: value}, loaded on the field's first lookup
+        self._tables = {}
+        # Field -> number of entries in its file (None: missing, stale or damaged)
+        self._stored = {}
+        self._new = {field: [] for field in DERIVED_FIELDS}
+        self._used = {field: set() for field in DERIVED_FIELDS}
+
+    def path(self, field):
+        return self.cache_dir / f"{field}.ndjson"
+
+    def _table(self, field):
+        table = self._tables.get(field)
+        if table is None:
+            entries, complete = _read_entries(self.path(field), self.stamp)
+            # A damaged file is rewritten on save rather than appended to
+            self._stored[field] = len(entries) if complete else None
+            table = {tuple(entry[:-1]): entry[-1] for entry in entries or ()}
+            self._tables[field] = table
+        return table
+
+    def _lookup(self, field, args):
+        table = self._table(field)
+        value = table.get(args)
+        if value is None:
+            value = getattr(jabatan_rules, field)(*args)
+            table[args] = value
+            self._new[field].append(args)
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._used[field].add(args)
+        return value
+
+    def determine_jabatan(self, name, eselon):
+        return self._lookup('determine_jabatan', (name, eselon or ''))
+
+    def generate_kode_jabatan(self, jabatan, unit_name):
+        return self._lookup('generate_kode_jabatan', (jabatan or '', unit_name))
+
+    def simplify_jabatan(self, jabatan):
+        return self._lookup('simplify_jabatan', (jabatan or '',))
+
+    def _write(self, field, keys):
+        table = self._tables[field]
+        path = self.path(field)
+        tmp_file = path.with_name(path.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(_encode({'stamp': self.stamp}) + '\n')
+            for args in keys:
+                f.write(_encode(list(args) + [table[args]]) + '\n')
+        os.replace(tmp_file, path)
+        self._stored[field] = len(keys)
+
+    def save(self, prune=True):
+        """
+        Write the entries computed since the last save to disk.
+
+        New entries are appended to their field's file. A file is only
+        rewritten when it is missing or stale, or (with prune) when at most
+        COMPACT_SHARE of its entries were looked up.
+
+        Args:
+            prune: Let files of fields used since the cache was opened be
+                compacted to the entries looked up (for runs over the whole tree)
+        """
+        for field in self._tables:
+            used = self._used[field]
+            new = self._new[field]
+            stored = self._stored[field]
+            if stored is None:
+                if new or used:
+                    self.cache_dir.mkdir(exist_ok=True)
+                    self._write(field, sorted(used if prune else self._tables[field]))
+            elif prune and used and len(used) <= COMPACT_SHARE * (stored + len(new)):
+                self._write(field, sorted(used))
+            elif new:
+                with open(self.path(field), 'a', encoding='utf-8') as f:
+                    f.write(''.join(_encode(list(args) + [self._tables[field][args]]) + '\n' for args in new))
+                self._stored[field] = stored + len(new)
+            self._new[field] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.save()
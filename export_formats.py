@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Export backends for flattened hierarchy records.
+
+Every backend is a RecordWriter: records are pushed into it one at a time
+and the file is completed on close(). Several writers can be fed from the
+same stream of records, so one flatten pass produces all requested formats:
+
+    records = iter_flatten_nodes(iter_nodes("hierarchy.json"))
+    write_records(records, open_writers({'csv': 'out.csv', 'parquet': 'out.parquet'}, keys))
+
+Formats:
+- csv: header row plus one line per record (UTF-8)
+- ndjson: one JSON object per line
+- parquet: string columns written in row groups (requires pyarrow)
+- sqlite: one table, rows inserted in batches inside a single transaction
+- xlsx: the streaming workbook of export_to_xlsx.py (requires openpyxl)
+
+Each writer writes to a temporary file next to the target. write_records
+completes every temporary file before it renames any of them into place,
+so an export that fails while writing or completing one format leaves
+none of the targets changed.
+
+Usage:
+    from export_formats import open_writers, write_records
+"""
+
+import csv
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+# Records buffered before a Parquet row group or SQLite batch is written
+BATCH_ROWS = 65536
+
+# Table written by the SQLite backend
+SQLITE_TABLE = "hierarchy"
+
+
+class ExportError(Exception):
+    """Raised when an export format cannot be written."""
+
+
+def load_pyarrow():
+    """
+    Import pyarrow (with pyarrow.parquet) on first use.
+
+    Only the Parquet backend needs it, and importing it costs more than the
+    rest of an export's start-up, so it is not imported with this module.
+
+    Returns:
+        The pyarrow module, or None if it is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+class RecordWriter(ABC):
+    """
+    Base class for export backends.
+
+    Args:
+        path: Output file
+        keys: Record keys, in column order
+    """
+
+    extension = None
+
+    def __init__(self, path, keys):
+        self.path = Path(path)
+        self.keys = list(keys)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.count = 0
+
+    @abstractmethod
+    def write(self, record):
+        """Add one record to the temporary file."""
+
+    def finish(self):
+        """Flush buffered rows and close the temporary file."""
+
+    def release(self):
+        """Close the temporary file without completing it (no flush, save or index build)."""
+
+    def commit(self):
+        """
+        Move the completed temporary file into place.
+
+        Returns:
+            Number of records written
+        """
+        os.replace(self.tmp_path, self.path)
+        return self.count
+
+    def close(self):
+        """
+        Complete the export and move it into place.
+
+        Returns:
+            Number of records written
+        """
+        self.finish()
+        return self.commit()
+
+    def abort(self):
+        """Discard the partial output."""
+        try:
+            self.release()
+        except Exception:
+            pass
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class CsvWriter(RecordWriter):
+    extension = '.csv'
+
+    def __init__(self, path, keys):
+        super().__init__(path, keys)
+        self._file = open(self.tmp_path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.keys)
+
+    def write(self, record):
+        self._writer.writerow([record.get(key, '') for key in self.keys])
+        self.count += 1
+
+    def finish(self):
+        self._file.close()
+
+    def release(self):
+        self._file.close()
+
+
+class NdjsonWriter(RecordWriter):
+    extension = '.ndjson'
+
+    def __init__(self, path, keys):
+        super().__init__(path, keys)
+        self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    def write(self, record):
+        self._file.write(self._encode({key: record.get(key, '') for key in self.keys}))
+        self._file.write('\n')
+        self.count += 1
+
+    def finish(self):
+        self._file.close()
+
+    def release(self):
+        self._file.close()
+
+
+class ParquetWriter(RecordWriter):
+    extension = '.parquet'
+
+    def __init__(self, path, keys):
+        self._pyarrow = load_pyarrow()
+        if self._pyarrow is None:
+            raise ExportError("pyarrow is required for Parquet export. Install it with: pip install pyarrow")
+        super().__init__(path, keys)
+        self._schema = self._pyarrow.schema([(key, self._pyarrow.string()) for key in self.keys])
+        self._writer = self._pyarrow.parquet.ParquetWriter(str(self.tmp_path), self._schema)
+        self._columns = [[] for _ in self.keys]
+
+    def write(self, record):
+        for column, key in zip(self._columns, self.keys):
+            column.append(record.get(key, ''))
+        self.count += 1
+        if len(self._columns[0]) >= BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if self._columns[0]:
+            self._writer.write_table(self._pyarrow.Table.from_arrays(self._columns, schema=self._schema))
+            self._columns = [[] for _ in self.keys]
+
+    def finish(self):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+    def release(self):
+        # Buffered rows are dropped; close() only writes the file footer
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class SqliteWriter(RecordWriter):
+    extension = '.sqlite'
+
+    def __init__(self, path, keys):
+        super().__init__(path, keys)
+        self.tmp_path.unlink(missing_ok=True)
+        self._db = sqlite3.connect(self.tmp_path)
+        self._db.execute("PRAGMA journal_mode = OFF")
+        self._db.execute("PRAGMA synchronous = OFF")
+        columns = ', '.join(f"{key} TEXT" for key in self.keys)
+        self._db.execute(f"CREATE TABLE {SQLITE_TABLE} (id INTEGER PRIMARY KEY, {columns})")
+        placeholders = ', '.join('?' for _ in range(len(self.keys) + 1))
+        self._insert = f"INSERT INTO {SQLITE_TABLE} VALUES ({placeholders})"
+        self._rows = []
+
+    def write(self, record):
+        self.count += 1
+        self._rows.append([self.count] + [record.get(key, '') for key in self.keys])
+        if len(self._rows) >= BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        self._db.executemany(self._insert, self._rows)
+        self._rows = []
+
+    def finish(self):
+        if self._db is None:
+            return
+        self._flush()
+        if 'nama_parent' in self.keys:
+            self._db.execute(f"CREATE INDEX {SQLITE_TABLE}_nama_parent ON {SQLITE_TABLE} (nama_parent)")
+        self._db.commit()
+        self._db.close()
+        self._db = None
+
+    def release(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class XlsxWriter(RecordWriter):
+    extension = '.xlsx'
+
+    def __init__(self, path, keys):
+        super().__init__(path, keys)
+        # Imported here: export_to_xlsx imports this module
+        from export_to_xlsx import create_streaming_sheet
+        self._workbook, self._sheet = create_streaming_sheet()
+
+    def write(self, record):
+        self._sheet.append([record.get(key, '') for key in self.keys])
+        self.count += 1
+
+    def finish(self):
+        if self._workbook is not None:
+            self._workbook.save(str(self.tmp_path))
+            self._workbook = None
+
+    def release(self):
+        # Ends the sheet's row stream without assembling the workbook;
+        # nothing has been written to tmp_path before save()
+        if self._workbook is not None:
+            self._sheet.close()
+            self._workbook = None
+
+
+# Format name -> writer class
+WRITERS = {
+    'xlsx': XlsxWriter,
+    'csv': CsvWriter,
+    'ndjson': NdjsonWriter,
+    'parquet': ParquetWriter,
+    'sqlite': SqliteWriter,
+}
+
+
+def output_path(base, fmt):
+    """Output file for a format: base with the format's extension (hierarchy_export.csv)."""
+    return Path(base).with_suffix(WRITERS[fmt].extension)
+
+
+def open_writers(outputs, keys):
+    """
+    Create one writer per requested format.
+
+    Args:
+        outputs: Dictionary of format name -> output file
+        keys: Record keys, in column order
+
+    Returns:
+        List of RecordWriter
+
+    Raises:
+        ExportError: Unknown format or missing optional dependency
+    """
+    writers = []
+    try:
+        for fmt, path in outputs.items():
+            if fmt not in WRITERS:
+                raise ExportError(f"unknown export format {fmt!r} (choose from {', '.join(WRITERS)})")
+            writers.append(WRITERS[fmt](path, keys))
+    except Exception:
+        for writer in writers:
+            writer.abort()
+        raise
+    return writers
+
+
+def write_records(records, writers):
+    """
+    Feed every record to all writers and complete the files.
+
+    All writers are finished into their temporary files first and only then
+    renamed into place, so a failure while writing or finishing any format
+    discards all partial outputs and leaves every target unchanged.
+
+    Args:
+        records: Iterable of record dictionaries
+        writers: List of RecordWriter from open_writers
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    try:
+        for record in records:
+            for writer in writers:
+                writer.write(record)
+            count += 1
+        for writer in writers:
+            writer.finish()
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+    for writer in writers:
+        writer.commit()
+    return count
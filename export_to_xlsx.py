@@ -4,66 +4,65 @@ Script to export hierarchy.json to XLSX format with nama_unit, nama_parent, esel
 
 Usage:
     python export_to_xlsx.py
+    python export_to_xlsx.py --streaming
+    python export_to_xlsx.py --incremental
+    python export_to_xlsx.py --format csv --format parquet --format sqlite
+    python export_to_xlsx.py --under "Kecamatan Ajibarang"
 """
 
+import argparse
+import hashlib
 import json
 import sys
 from pathlib import Path
 
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
-except ImportError:
-    print("Error: openpyxl library is required. Install it with: pip install openpyxl")
-    sys.exit(1)
+import derived_fields
+import jabatan_rules
+import lazy_children
+from export_formats import WRITERS, ExportError, open_writers, output_path, write_records
+from json_stream import KeyOrderError, iter_nodes, load_json
+from derived_fields import DerivedCache
+from lazy_children import ChildrenLoader, expand_nodes, find_unit
+
+
+# Output columns: (record key, column width)
+COLUMNS = [
+    ('nama_unit', 60),
+    ('nama_parent', 60),
+    ('eselon', 10),
+    ('jabatan', 50),
+    ('jabatan_lengkap', 50),
+    ('kode_jabatan', 20),
+    ('catatan', 30),
+]
+
+# Cache for --incremental exports, relative to this script
+EXPORT_CACHE_DIR = ".export_cache"
+EXPORT_MANIFEST = "manifest.json"
 
 
 def simplify_jabatan(jabatan):
     """
     Simplify jabatan by removing unit-specific names.
     
+    "Kepala Badan X" -> "Kepala Badan", "Kepala Dinas X" -> "Kepala Dinas",
+    "Direktur X" -> "Direktur", etc. See jabatan_rules.SIMPLIFY_JABATAN_RULES.
+    
     Args:
         jabatan: Full position title
     
     Returns:
         Simplified position title
     """
-    if not jabatan:
-        return jabatan
-    
-    jabatan_lower = jabatan.lower()
-    
-    # Rules for simplification:
-    # 1. "Kepala Badan X" -> "Kepala Badan"
-    if jabatan_lower.startswith('kepala badan '):
-        return 'Kepala Badan'
-    
-    # 2. "Sekretaris Badan X" -> "Sekretaris Badan"
-    elif jabatan_lower.startswith('sekretaris badan '):
-        return 'Sekretaris Badan'
-    
-    # 3. "Kepala Dinas X" -> "Kepala Dinas"
-    elif jabatan_lower.startswith('kepala dinas '):
-        return 'Kepala Dinas'
-    
-    # 4. "Sekretaris Dinas X" -> "Sekretaris Dinas" 
-    elif jabatan_lower.startswith('sekretaris dinas '):
-        return 'Sekretaris Dinas'
-    
-    # 5. "Direktur X" -> "Direktur"
-    elif jabatan_lower.startswith('direktur '):
-        return 'Direktur'
-    
-    # 6. "Kepala UPKP" (special case, should remain as is)
-    # 7. "Kepala UPTD" (special case, should remain as is)
-    # For other cases, return as is
-    return jabatan
+    return jabatan_rules.simplify_jabatan(jabatan)
 
 
 def generate_kode_jabatan(jabatan, unit_name):
     """
     Generate a position code (kode_jabatan) based on the position title and unit name.
     
+    The rules live in jabatan_rules.KODE_JABATAN_RULES.
+    
     Args:
         jabatan: Position title
         unit_name: Unit name
@@ -71,95 +70,118 @@ def generate_kode_jabatan(jabatan, unit_name):
     Returns:
         Position code string
     """
-    jabatan_lower = jabatan.lower()
-    unit_lower = unit_name.lower()
-    
-    # Sekretaris Daerah
-    if "sekretaris daerah" in jabatan_lower:
-        return "SEKDA"
-    
-    # Sekretaris DPRD
-    if "sekretaris dprd" in jabatan_lower:
-        return "SEKDPRD"
-    
-    # Kepala Pelaksana BPBD
-    if "kepala pelaksana bpbd" in jabatan_lower:
-        return "KAPEL_BPBD"
-    
-    # Kepala Badan
-    if "kepala badan" in jabatan_lower:
-        # Extract key words from unit name
-        if "kepegawaian" in unit_lower:
-            return "KABKP"
-        elif "keuangan" in unit_lower:
-            return "KABKAD"
-        elif "penanggulangan bencana" in unit_lower or "bpbd" in unit_lower:
-            return "KABPBD"
-        elif "kesatuan bangsa" in unit_lower:
-            return "KABKESBANGPOL"
-        elif "pendapatan" in unit_lower:
-            return "KABAPENDA"
-        elif "perencanaan" in unit_lower:
-            return "KABAPPEDA"
-        else:
-            return "KABADAN"
-    
-    # Kepala Dinas
-    if "kepala dinas" in jabatan_lower:
-        if "pendidikan" in unit_lower:
-            return "KADIS_DIKDAS"
-        elif "kesehatan" in unit_lower:
-            return "KADIS_KES"
-        elif "pekerjaan umum" in unit_lower or "perumahan" in unit_lower:
-            return "KADIS_PUPR"
-        elif "sosial" in unit_lower:
-            return "KADIS_SOSIAL"
-        elif "lingkungan" in unit_lower:
-            return "KADIS_LH"
-        else:
-            return "KADIS"
-    
-    # Kepala Bagian
-    if "kepala bagian" in jabatan_lower:
-        if "umum" in unit_lower and "protokol" in unit_lower:
-            return "KB_UMUM_PROT"
-        elif "umum" in unit_lower:
-            return "KB_UMUM"
-        elif "keuangan" in unit_lower:
-            return "KB_KEUANGAN"
-        else:
-            return "KABAG"
+    return jabatan_rules.generate_kode_jabatan(jabatan, unit_name)
+
+
+def make_record(item, parent_name, rules=None):
+    """
+    Build the flattened export record for a single unit.
     
-    # Kepala Bidang
-    if "kepala bidang" in jabatan_lower:
-        if "pendidikan dasar" in unit_lower:
-            return "KABID_DIKDAS"
-        else:
-            return "KABID"
-    
-    # Kepala Subbagian
-    if "kepala subbagian" in jabatan_lower or "kepala sub bagian" in jabatan_lower:
-        if "keuangan" in unit_lower:
-            return "KASUBAG_KEU"
-        elif "umum" in unit_lower:
-            return "KASUBAG_UMUM"
-        else:
-            return "KASUBAG"
+    Args:
+        item: Organizational unit dictionary (must contain 'name')
+        parent_name: Name of the parent unit (empty string for top-level)
+        rules: Optional provider of simplify_jabatan and generate_kode_jabatan
+            (e.g. a derived_fields.DerivedCache); defaults to jabatan_rules
+    
+    Returns:
+        Dictionary with keys: nama_unit, nama_parent, eselon, jabatan, jabatan_lengkap, kode_jabatan, catatan
+    """
+    unit_name = item['name']
+    eselon = item.get('eselon', '')
+    jabatan_original = item.get('jabatan', '')
+    
+    # Generate additional fields
+    if rules is None:
+        rules = jabatan_rules
+    jabatan_lengkap = jabatan_original  # Keep the original full jabatan
+    jabatan = rules.simplify_jabatan(jabatan_original)  # Simplify for jabatan column
+    kode_jabatan = rules.generate_kode_jabatan(jabatan_original, unit_name)
+    catatan = item.get('catatan', '')  # Get catatan from JSON if exists, otherwise empty
+    
+    return {
+        'nama_unit': unit_name,
+        'nama_parent': parent_name,
+        'eselon': eselon,
+        'jabatan': jabatan,
+        'jabatan_lengkap': jabatan_lengkap,
+        'kode_jabatan': kode_jabatan,
+        'catatan': catatan
+    }
+
+
+def iter_flatten_hierarchy(data, parent_name="", loader=None, rules=None):
+    """
+    Lazily flatten hierarchical JSON structure, yielding one record per unit.
+    
+    Units are yielded in the same pre-order as flatten_hierarchy. The walk uses
+    an explicit stack of child iterators instead of recursion, so it is not
+    bound by Python's recursion limit and its memory depends only on tree depth.
+    
+    Args:
+        data: List of organizational units with nested children
+        parent_name: Name of the parent unit (empty string for top-level)
+        loader: Optional lazy_children.ChildrenLoader; units with a
+            children_file then also yield the units of that file
+        rules: Optional provider of the derived fields (see make_record)
     
-    # Sekretaris (for agencies/organizations)
-    if "sekretaris" in jabatan_lower and "sekretaris daerah" not in jabatan_lower:
-        return "SEKRET"
+    Yields:
+        Dictionaries with keys: nama_unit, nama_parent, eselon, jabatan, jabatan_lengkap, kode_jabatan, catatan
+    """
+    if not isinstance(data, list):
+        return
+    
+    exhausted = object()
+    stack = [(iter(data), parent_name)]
+    while stack:
+        items, current_parent = stack[-1]
+        item = next(items, exhausted)
+        if item is exhausted:
+            stack.pop()
+            continue
+        
+        if isinstance(item, dict) and 'name' in item:
+            yield make_record(item, current_parent, rules)
+            
+            # Descend into children before moving on to the next sibling
+            children = loader.children(item) if loader is not None else item.get('children')
+            if isinstance(children, list) and children:
+                stack.append((iter(children), item['name']))
+
+
+def iter_flatten_nodes(nodes, parent_name="", rules=None):
+    """
+    Flatten a stream of (depth, unit) pairs as produced by json_stream.iter_nodes.
     
-    # Inspektur
-    if "inspektur" in jabatan_lower:
-        return "INSPEKTUR"
+    Yields the same records as iter_flatten_hierarchy on the parsed document,
+    but units are turned into records as they are read from the file, so only
+    the names of the current unit's ancestors are kept. Units without a name
+    are skipped together with their subtree.
     
-    # Camat
-    if "camat" in jabatan_lower:
-        return "CAMAT"
+    Args:
+        nodes: Iterable of (depth, unit dictionary) in pre-order
+        parent_name: Name of the parent of the top-level units
+        rules: Optional provider of the derived fields (see make_record)
     
-    # Default
-    return "KODE"
+    Yields:
+        Dictionaries with keys: nama_unit, nama_parent, eselon, jabatan, jabatan_lengkap, kode_jabatan, catatan
+    """
+    # Names of the ancestors of the next unit, indexed by depth
+    names = [parent_name]
+    # Depth of an unnamed unit whose subtree is being skipped
+    skip_depth = None
+    for depth, unit in nodes:
+        if skip_depth is not None:
+            if depth > skip_depth:
+                continue
+            skip_depth = None
+        
+        if 'name' not in unit:
+            skip_depth = depth
+            continue
+        
+        del names[depth + 1:]
+        yield make_record(unit, names[depth], rules)
+        names.append(unit['name'])
 
 
 def flatten_hierarchy(data, parent_name=""):
@@ -173,38 +195,25 @@ def flatten_hierarchy(data, parent_name=""):
     Returns:
         List of dictionaries with keys: nama_unit, nama_parent, eselon, jabatan, jabatan_lengkap, kode_jabatan, catatan
     """
-    result = []
-    
-    if isinstance(data, list):
-        for item in data:
-            if isinstance(item, dict) and 'name' in item:
-                unit_name = item['name']
-                eselon = item.get('eselon', '')
-                jabatan_original = item.get('jabatan', '')
-                
-                # Generate additional fields
-                jabatan_lengkap = jabatan_original  # Keep the original full jabatan
-                jabatan = simplify_jabatan(jabatan_original)  # Simplify for jabatan column
-                kode_jabatan = generate_kode_jabatan(jabatan_original, unit_name)
-                catatan = item.get('catatan', '')  # Get catatan from JSON if exists, otherwise empty
-                
-                record = {
-                    'nama_unit': unit_name,
-                    'nama_parent': parent_name,
-                    'eselon': eselon,
-                    'jabatan': jabatan,
-                    'jabatan_lengkap': jabatan_lengkap,
-                    'kode_jabatan': kode_jabatan,
-                    'catatan': catatan
-                }
-                result.append(record)
-                
-                # Recursively process children
-                if 'children' in item and isinstance(item['children'], list):
-                    children_results = flatten_hierarchy(item['children'], unit_name)
-                    result.extend(children_results)
-    
-    return result
+    return list(iter_flatten_hierarchy(data, parent_name))
+
+
+def require_openpyxl():
+    """
+    Import openpyxl, exiting with an install hint if it is missing.
+    
+    openpyxl is the slowest import of this script and only XLSX output
+    needs it, so the workbook functions import it when they are called.
+    
+    Returns:
+        The openpyxl module
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        print("Error: openpyxl library is required. Install it with: pip install openpyxl")
+        sys.exit(1)
+    return openpyxl
 
 
 def create_xlsx(data, output_file="hierarchy_export.xlsx"):
@@ -215,6 +224,10 @@ def create_xlsx(data, output_file="hierarchy_export.xlsx"):
         data: List of dictionaries with keys: nama_unit, nama_parent, eselon, jabatan, jabatan_lengkap, kode_jabatan, catatan
         output_file: Path to output XLSX file
     """
+    require_openpyxl()
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+    
     wb = Workbook()
     ws = wb.active
     ws.title = "Hierarchy"
@@ -263,8 +276,282 @@ def create_xlsx(data, output_file="hierarchy_export.xlsx"):
     print(f"Total records: {len(data)}")
 
 
+def create_streaming_sheet():
+    """
+    Create a write-only workbook with the styled header row already written.
+    
+    Returns:
+        (workbook, worksheet); append data rows to the worksheet, then save the workbook
+    """
+    require_openpyxl()
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+    
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Hierarchy")
+    
+    # Column widths must be set before the first row is written
+    for col_idx, (_, width) in enumerate(COLUMNS, start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+    
+    # Style headers
+    header_font = Font(bold=True, size=12, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    
+    header_row = []
+    for key, _ in COLUMNS:
+        cell = WriteOnlyCell(ws, value=key)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        header_row.append(cell)
+    ws.append(header_row)
+    return wb, ws
+
+
+def create_xlsx_streaming(records, output_file="hierarchy_export.xlsx"):
+    """
+    Create XLSX file by streaming rows into a write-only workbook.
+    
+    Rows are written as they are pulled from ``records``, so memory use does
+    not grow with the number of rows. Header styling and column widths are the
+    same as in create_xlsx.
+    
+    Args:
+        records: Iterable of dictionaries (a list or a generator) with keys: nama_unit, nama_parent, eselon, jabatan, jabatan_lengkap, kode_jabatan, catatan
+        output_file: Path to output XLSX file
+    
+    Returns:
+        Number of data rows written
+    """
+    wb, ws = create_streaming_sheet()
+    
+    # Write data
+    keys = [key for key, _ in COLUMNS]
+    count = 0
+    for record in records:
+        ws.append([record.get(key, '') for key in keys])
+        count += 1
+    
+    # Save workbook
+    wb.save(output_file)
+    print(f"Successfully created {output_file}")
+    print(f"Total records: {count}")
+    return count
+
+
+def export_fingerprint():
+    """
+    Fingerprint of the code that turns units into records.
+    
+    Cached row blocks are only reused when this matches, so editing this
+    script, the jabatan rules, the derived-field cache (derived_fields.py) or
+    the school units built for children files (lazy_children.py)
+    invalidates the cache.
+    
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha1()
+    for module_file in (__file__, jabatan_rules.__file__, derived_fields.__file__, lazy_children.__file__):
+        digest.update(Path(module_file).read_bytes())
+    return digest.hexdigest()
+
+
+def plan_export_blocks(data, loader=None):
+    """
+    Split the hierarchy into one block per top-level organization.
+    
+    Args:
+        data: List of organizational units with nested children
+        loader: Optional lazy_children.ChildrenLoader; the content of the
+            children files referenced in a block is then part of its hash
+    
+    Returns:
+        List of (unit, content hash) tuples, in document order
+    """
+    fingerprint = export_fingerprint()
+    blocks = []
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, dict) and 'name' in item:
+            content = json.dumps(item, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+            digest = hashlib.sha1(fingerprint.encode('utf-8'))
+            digest.update(content.encode('utf-8'))
+            if loader is not None:
+                digest.update(loader.fingerprint(item).encode('utf-8'))
+            blocks.append((item, digest.hexdigest()))
+    return blocks
+
+
+def load_export_manifest(cache_dir):
+    """
+    Read the incremental export manifest.
+    
+    Args:
+        cache_dir: Cache directory
+    
+    Returns:
+        Manifest dictionary (empty if missing or unreadable)
+    """
+    manifest_file = Path(cache_dir) / EXPORT_MANIFEST
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_export_manifest(cache_dir, blocks, output_file):
+    """
+    Write the incremental export manifest and drop unreferenced row blocks.
+    
+    Args:
+        cache_dir: Cache directory
+        blocks: List of (unit, content hash) tuples from plan_export_blocks
+        output_file: Path of the workbook that was written
+    """
+    cache_dir = Path(cache_dir)
+    output_stat = Path(output_file).stat()
+    manifest = {
+        'blocks': [
+            {'name': item['name'], 'hash': block_hash}
+            for item, block_hash in blocks
+        ],
+        'output': {
+            'path': str(output_file),
+            'size': output_stat.st_size,
+            'mtime_ns': output_stat.st_mtime_ns,
+        },
+    }
+    with open(cache_dir / EXPORT_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
+    referenced = {f"{block_hash}.json" for _, block_hash in blocks}
+    for block_file in (cache_dir / "blocks").glob('*.json'):
+        if block_file.name not in referenced:
+            block_file.unlink()
+
+
+def is_export_current(manifest, blocks, output_file):
+    """
+    Check whether the last export already matches the current hierarchy.
+    
+    Args:
+        manifest: Manifest from load_export_manifest
+        blocks: List of (unit, content hash) tuples from plan_export_blocks
+        output_file: Path of the workbook to write
+    
+    Returns:
+        True if the workbook on disk was produced from identical blocks
+    """
+    output = manifest.get('output', {})
+    output_file = Path(output_file)
+    if output.get('path') != str(output_file) or not output_file.exists():
+        return False
+    
+    output_stat = output_file.stat()
+    if output.get('size') != output_stat.st_size or output.get('mtime_ns') != output_stat.st_mtime_ns:
+        return False
+    
+    return [entry.get('hash') for entry in manifest.get('blocks', [])] == \
+        [block_hash for _, block_hash in blocks]
+
+
+def iter_flatten_incremental(blocks, cache_dir, stats=None, loader=None, rules=None):
+    """
+    Yield flattened records, reusing cached row blocks for unchanged subtrees.
+    
+    Each top-level organization is looked up in the cache by its content hash.
+    Cached blocks are replayed as-is; other organizations are flattened and
+    classified, and their rows are stored for the next run.
+    
+    Args:
+        blocks: List of (unit, content hash) tuples from plan_export_blocks
+        cache_dir: Cache directory
+        stats: Optional dictionary updated with 'reused' and 'rebuilt' counts
+        loader: Optional lazy_children.ChildrenLoader for children files
+        rules: Optional provider of the derived fields (see make_record)
+    
+    Yields:
+        Dictionaries with keys: nama_unit, nama_parent, eselon, jabatan, jabatan_lengkap, kode_jabatan, catatan
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('reused', 0)
+    stats.setdefault('rebuilt', 0)
+    
+    keys = [key for key, _ in COLUMNS]
+    block_dir = Path(cache_dir) / "blocks"
+    block_dir.mkdir(parents=True, exist_ok=True)
+    
+    for item, block_hash in blocks:
+        block_file = block_dir / f"{block_hash}.json"
+        
+        rows = None
+        if block_file.exists():
+            try:
+                with open(block_file, 'r', encoding='utf-8') as f:
+                    rows = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                rows = None
+        
+        if rows is not None:
+            stats['reused'] += 1
+            for row in rows:
+                yield dict(zip(keys, row))
+            continue
+        
+        stats['rebuilt'] += 1
+        rows = []
+        for record in iter_flatten_hierarchy([item], loader=loader, rules=rules):
+            rows.append([record[key] for key in keys])
+            yield record
+        
+        # Write to a temporary name first so an interrupted run leaves no partial block
+        tmp_file = block_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, separators=(',', ':'))
+        tmp_file.replace(block_file)
+
+
 def main():
     """Main function to export hierarchy to XLSX."""
+    parser = argparse.ArgumentParser(
+        description='Export hierarchy.json to XLSX'
+    )
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help='Stream rows into a write-only workbook (constant memory for large exports)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help=f'Reuse cached rows for unchanged top-level organizations (cache in {EXPORT_CACHE_DIR}/)'
+    )
+    parser.add_argument(
+        '--under',
+        type=str,
+        metavar='PATH',
+        help='Export only the subtree at PATH (names joined with " / "); children files elsewhere are not read'
+    )
+    parser.add_argument(
+        '--format',
+        action='append',
+        choices=list(WRITERS),
+        help='Output format; repeat to write several formats from one pass (default: xlsx)'
+    )
+    parser.add_argument(
+        '--derived-cache',
+        action='store_true',
+        help='Reuse derived jabatan fields of earlier runs (cached in .derived_cache/)'
+    )
+    
+    args = parser.parse_args()
+    
     # Read hierarchy.json
     json_file = Path(__file__).parent / "hierarchy.json"
     
@@ -272,20 +559,102 @@ def main():
         print(f"Error: {json_file} not found!")
         sys.exit(1)
     
-    print(f"Reading {json_file}...")
-    with open(json_file, 'r', encoding='utf-8') as f:
-        hierarchy_data = json.load(f)
-    
-    print("Flattening hierarchy...")
-    flattened_data = flatten_hierarchy(hierarchy_data)
-    
     # Create XLSX file
     output_file = Path(__file__).parent / "hierarchy_export.xlsx"
-    print(f"Creating {output_file}...")
-    create_xlsx(flattened_data, str(output_file))
+    formats = list(dict.fromkeys(args.format or ['xlsx']))
+    
+    if args.incremental and args.under:
+        parser.error("--under cannot be combined with --incremental")
+    if 'xlsx' in formats:
+        # Fail before the hierarchy is read rather than after flattening it
+        require_openpyxl()
+    
+    # Units with a children_file get the units of that file when they are walked
+    loader = ChildrenLoader(json_file.parent)
+    # Derived fields computed by earlier runs are reused on request
+    rules = DerivedCache() if args.derived_cache else None
+    
+    print(f"Reading {json_file}...")
+    if args.under:
+        unit, parent_name = find_unit(load_json(json_file), args.under, loader)
+        if unit is None:
+            print(f"Error: unit '{args.under}' not found")
+            sys.exit(1)
+        records = iter_flatten_hierarchy([unit], parent_name, loader, rules)
+    elif args.incremental:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            hierarchy_data = json.load(f)
+        
+        cache_dir = Path(__file__).parent / EXPORT_CACHE_DIR
+        blocks = plan_export_blocks(hierarchy_data, loader)
+        manifest = load_export_manifest(cache_dir)
+        
+        if formats == ['xlsx'] and is_export_current(manifest, blocks, output_file):
+            print(f"No changes since last export; {output_file} is up to date.")
+            return
+        
+        stats = {}
+        records = iter_flatten_incremental(blocks, cache_dir, stats, loader, rules)
+    else:
+        # Units are flattened as they are parsed from the file; a unit is
+        # used before its closing brace, so a field after its children list
+        # stops the stream (see the fallback below). Like the in-memory
+        # path, a document whose root is not a list exports no units.
+        nodes = iter_nodes(json_file, strict_order=True, root_unit=False)
+        records = iter_flatten_nodes(expand_nodes(nodes, loader), rules=rules)
+    
+    preview = []
+    
+    def keep_preview(records):
+        for record in records:
+            if len(preview) < 5:
+                preview.append(record)
+            yield record
+    
+    def write_output(records):
+        preview.clear()
+        if formats != ['xlsx']:
+            # Every format is written from the same pass over the records
+            outputs = {fmt: output_path(output_file, fmt) for fmt in formats}
+            print(f"Flattening hierarchy and writing {', '.join(str(path) for path in outputs.values())}...")
+            try:
+                count = write_records(keep_preview(records), open_writers(outputs, [key for key, _ in COLUMNS]))
+            except ExportError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            for path in outputs.values():
+                print(f"Successfully created {path}")
+            print(f"Total records: {count}")
+        elif args.streaming:
+            # Records are produced and written one at a time
+            print(f"Flattening hierarchy and streaming to {output_file}...")
+            create_xlsx_streaming(keep_preview(records), str(output_file))
+        else:
+            print("Flattening hierarchy...")
+            flattened_data = list(records)
+            print(f"Creating {output_file}...")
+            create_xlsx(flattened_data, str(output_file))
+            preview.extend(flattened_data[:5])
+    
+    try:
+        write_output(records)
+    except KeyOrderError as e:
+        # Nothing was written yet: outputs are only moved into place at the end
+        print(f"Note: {e}; reading the whole file instead of streaming it")
+        write_output(iter_flatten_hierarchy(load_json(json_file), loader=loader, rules=rules))
+    
+    if rules is not None:
+        # Partial runs see only some units, so they keep the other cached entries
+        rules.save(prune=not (args.incremental or args.under))
+    
+    if args.incremental:
+        # The manifest describes the workbook, so it is only kept when one was written
+        if 'xlsx' in formats:
+            save_export_manifest(cache_dir, blocks, output_file)
+        print(f"Organizations reused from cache: {stats['reused']}, rebuilt: {stats['rebuilt']}")
     
     print("\nFirst 5 records:")
-    for i, record in enumerate(flattened_data[:5], 1):
+    for i, record in enumerate(preview, 1):
         print(f"{i}. Unit: {record['nama_unit']}")
         print(f"   Parent: {record['nama_parent'] if record['nama_parent'] else '(kosong)'}")
         print(f"   Eselon: {record['eselon'] if record['eselon'] else '(kosong)'}")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Single command-line entry point for the hierarchy scripts.
+
+Each subcommand runs the main() of one script with the remaining
+arguments, so `hierarchy.py export --format csv` behaves exactly like
+`export_to_xlsx.py --format csv`. Only the script of the chosen
+subcommand is imported: this file itself imports nothing but argparse,
+and the scripts import their heavy dependencies (openpyxl, pyarrow,
+pandas, aiohttp, multiprocessing) only inside the code paths that use
+them. See bench_startup.py for the start-up times.
+
+Usage:
+    python hierarchy.py validate
+    python hierarchy.py validate --file sd_negeri_ajibarang.json
+    python hierarchy.py export --format csv
+    python hierarchy.py update --dry-run
+    python hierarchy.py enrich
+    python hierarchy.py watch --format csv
+    python hierarchy.py npsn get 20302232
+    python hierarchy.py export --help
+"""
+
+import argparse
+import importlib
+import sys
+
+
+# Subcommand -> (module whose main() it runs, description)
+COMMANDS = {
+    'validate': ('validate_sd_json', 'Validate the sd_negeri_*.json files'),
+    'export': ('export_to_xlsx', 'Export hierarchy.json to XLSX, CSV, NDJSON, Parquet or SQLite'),
+    'update': ('update_sd_data', 'Fetch current school data and update the sd_negeri files'),
+    'enrich': ('add_jabatan_field', 'Add jabatan fields to hierarchy.json'),
+    'watch': ('watch_hierarchy', 'Re-validate and re-export whenever a file is saved'),
+    'npsn': ('npsn_index', 'Look up schools by NPSN or NPSN prefix'),
+}
+
+
+def run(command, args):
+    """
+    Run the main() of a subcommand's script with the given arguments.
+
+    Args:
+        command: Key of COMMANDS
+        args: Arguments for the script (without the program name)
+    """
+    module_name, _ = COMMANDS[command]
+    # The scripts parse sys.argv; the program name shows up in their --help
+    sys.argv = [f"hierarchy.py {command}"] + list(args)
+    importlib.import_module(module_name).main()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Hierarchy and SD Negeri data tools',
+        epilog='commands:\n'
+               + ''.join(f"  {name:<10}{description}\n" for name, (_, description) in COMMANDS.items())
+               + '\nRun "hierarchy.py <command> --help" for the options of a command.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        'command',
+        choices=list(COMMANDS),
+        metavar='command',
+        help='One of: ' + ', '.join(COMMANDS)
+    )
+    parser.add_argument(
+        'args',
+        nargs=argparse.REMAINDER,
+        help='Arguments passed on to the command'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        run(args.command, args.args)
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
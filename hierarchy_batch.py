@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+"""
+Transactional batch editor for hierarchy.json.
+
+A batch is a list of operations applied in one traversal of the tree and
+committed with a single atomic write:
+- AddJabatan: set jabatan from jabatan_rules and order the fields
+  name, jabatan, eselon, ..., children
+- StripEselon: remove eselon from Puskesmas and Sekolah units
+- Rename: rename the unit at a path
+- Move: move the subtree at a path under another unit (or to the top level)
+- LinkChildrenFile: point the unit at a path to a file with more children
+  (see lazy_children.py)
+
+Paths refer to the tree as it was before the batch. Nothing is written if
+any operation fails.
+
+Instead of full-file backups, every commit appends to a write-ahead journal
+(hierarchy.json.journal, one JSON record per line). A 'begin' record with
+the file's hash before and after the edit, the operations and the previous
+fields of every changed unit is flushed to disk before the new file
+replaces the old one; a 'commit' record follows. The previous fields are
+enough to undo the batch, and an interrupted commit is resolved on the next
+run by comparing the file's hash with the journal.
+
+Usage:
+    python hierarchy_batch.py --add-jabatan --strip-eselon
+    python hierarchy_batch.py --rename "Dinas A / Bidang B" "Bidang C"
+    python hierarchy_batch.py --move "Dinas A / Bidang B" "Dinas D"
+    python hierarchy_batch.py --undo
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import jabatan_rules
+from hierarchy_index import PATH_SEPARATOR
+from json_stream import load_json
+from derived_fields import DerivedCache
+from lazy_children import CHILDREN_FILE_FIELD
+
+
+JOURNAL_SUFFIX = '.journal'
+
+
+class BatchError(ValueError):
+    """Raised when a batch cannot be applied or committed."""
+
+
+def is_school_or_puskesmas(name):
+    return 'Puskesmas' in name or 'Sekolah' in name
+
+
+def parse_path(path):
+    """Turn a PATH_SEPARATOR-joined string (or sequence) into a tuple of names."""
+    if isinstance(path, str):
+        return tuple(path.split(PATH_SEPARATOR)) if path else ()
+    return tuple(path)
+
+
+class AddJabatan:
+    """
+    Set jabatan on every unit and put its fields in the standard order.
+
+    Args:
+        rules: Provider of determine_jabatan (jabatan_rules or a
+            derived_fields.DerivedCache)
+    """
+
+    path = None
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else jabatan_rules
+
+    def describe(self):
+        return {'op': 'add_jabatan'}
+
+    def apply(self, unit):
+        ordered = {
+            'name': unit['name'],
+            'jabatan': self.rules.determine_jabatan(unit['name'], unit.get('eselon', '')),
+        }
+        if 'eselon' in unit:
+            ordered['eselon'] = unit['eselon']
+        for key, value in unit.items():
+            if key not in ordered and key != 'children':
+                ordered[key] = value
+        if 'children' in unit:
+            ordered['children'] = unit['children']
+
+        if list(ordered.items()) == list(unit.items()):
+            return False
+        unit.clear()
+        unit.update(ordered)
+        return True
+
+
+class StripEselon:
+    """
+    Remove eselon from Puskesmas and Sekolah units.
+
+    The names of the units it changed are kept in removed, in tree order.
+    """
+
+    path = None
+
+    def __init__(self):
+        self.removed = []
+
+    def describe(self):
+        return {'op': 'strip_eselon'}
+
+    def apply(self, unit):
+        if 'eselon' in unit and is_school_or_puskesmas(unit['name']):
+            del unit['eselon']
+            self.removed.append(unit['name'])
+            return True
+        return False
+
+
+class Rename:
+    """Rename the unit at a path."""
+
+    def __init__(self, path, new_name):
+        self.path = parse_path(path)
+        self.new_name = new_name
+
+    def describe(self):
+        return {'op': 'rename', 'path': list(self.path), 'name': self.new_name}
+
+    def apply(self, unit):
+        if unit['name'] == self.new_name:
+            return False
+        unit['name'] = self.new_name
+        return True
+
+
+class LinkChildrenFile:
+    """Set the children_file of the unit at a path (kept before its children)."""
+
+    def __init__(self, path, reference):
+        self.path = parse_path(path)
+        self.reference = reference
+
+    def describe(self):
+        return {'op': 'link_children_file', 'path': list(self.path), 'file': self.reference}
+
+    def apply(self, unit):
+        if unit.get(CHILDREN_FILE_FIELD) == self.reference:
+            return False
+        children = unit.pop('children', None)
+        unit[CHILDREN_FILE_FIELD] = self.reference
+        if children is not None:
+            unit['children'] = children
+        return True
+
+
+class Move:
+    """Move the subtree at a path to the end of another unit's children."""
+
+    def __init__(self, path, new_parent):
+        self.path = parse_path(path)
+        self.new_parent = parse_path(new_parent)
+
+    def describe(self):
+        return {'op': 'move', 'path': list(self.path), 'parent': list(self.new_parent)}
+
+
+def _own_fields(unit):
+    """Snapshot of a unit's fields, with children recorded only by position."""
+    return [[key, None if key == 'children' else value] for key, value in unit.items()]
+
+
+def apply_batch(data, operations):
+    """
+    Apply a batch of operations to a parsed hierarchy in place.
+
+    Field edits (AddJabatan, StripEselon, Rename) are applied during a single
+    pre-order traversal, which also locates the units that Move operations
+    refer to; the moves are then applied in order. The edits of one unit are
+    applied in the order of operations, so AddJabatan after a Rename
+    classifies the new name.
+
+    Args:
+        data: List of organizational units (hierarchy.json format)
+        operations: Sequence of operations
+
+    Returns:
+        Dictionary with 'changed' (units per operation) and 'undo' (the
+        information undo_batch needs to restore data)
+
+    Raises:
+        BatchError: If a path is not found or a move is invalid
+    """
+    if not isinstance(data, list):
+        raise BatchError("Hierarchy root must be an array")
+
+    edits = [op for op in operations if not isinstance(op, Move)]
+    global_edits = [op for op in edits if op.path is None]
+    targeted = {}
+    for op in edits:
+        if op.path is not None:
+            targeted.setdefault(op.path, []).append(op)
+    moves = [op for op in operations if isinstance(op, Move)]
+    wanted = set(targeted)
+    for move in moves:
+        wanted.add(move.path)
+        wanted.add(move.new_parent)
+
+    changed = [0] * len(operations)
+    op_number = {id(op): i for i, op in enumerate(operations)}
+    field_undo = []
+    # Units that moves refer to: path -> (unit, position in the original tree)
+    found = {(): (None, [])}
+    # Owning unit of every unit (None for top-level units)
+    owner = {}
+
+    exhausted = object()
+    # Each frame: (iterator over (index, item), owner unit, owner path, owner position)
+    stack = [(enumerate(data), None, (), [])]
+    while stack:
+        items, parent, parent_path, parent_position = stack[-1]
+        index, item = next(items, (None, exhausted))
+        if item is exhausted:
+            stack.pop()
+            continue
+        if not (isinstance(item, dict) and 'name' in item):
+            continue
+
+        path = parent_path + (item['name'],)
+        position = parent_position + [index]
+        owner[id(item)] = parent
+        if path in wanted:
+            found.setdefault(path, (item, position))
+
+        before = _own_fields(item)
+        unit_changed = False
+        unit_ops = targeted.get(path)
+        if unit_ops:
+            unit_ops = sorted(global_edits + unit_ops, key=lambda op: op_number[id(op)])
+        else:
+            unit_ops = global_edits
+        for op in unit_ops:
+            if op.apply(item):
+                changed[op_number[id(op)]] += 1
+                unit_changed = True
+        if unit_changed:
+            field_undo.append([position, before])
+
+        children = item.get('children')
+        if isinstance(children, list) and children:
+            stack.append((enumerate(children), item, path, position))
+
+    for path in targeted:
+        if path not in found:
+            raise BatchError(f"Unit not found: {PATH_SEPARATOR.join(path)}")
+
+    move_undo = []
+    for move in moves:
+        for path in (move.path, move.new_parent):
+            if path not in found:
+                raise BatchError(f"Unit not found: {PATH_SEPARATOR.join(path)}")
+        unit, _ = found[move.path]
+        new_parent, new_parent_position = found[move.new_parent]
+        if unit is None:
+            raise BatchError("Cannot move the top level")
+
+        ancestor = new_parent
+        while ancestor is not None:
+            if ancestor is unit:
+                raise BatchError(f"Cannot move {PATH_SEPARATOR.join(move.path)} into its own subtree")
+            ancestor = owner[id(ancestor)]
+
+        old_position = _position(data, owner, unit)
+        old_siblings = _children_of(data, owner[id(unit)])
+        del old_siblings[old_position[-1]]
+
+        if new_parent is not None and not isinstance(new_parent.get('children'), list):
+            # The new parent gains a children list; undo removes it again
+            field_undo.append([new_parent_position, _own_fields(new_parent)])
+            new_parent['children'] = []
+        new_siblings = _children_of(data, new_parent)
+        new_siblings.append(unit)
+        owner[id(unit)] = new_parent
+
+        move_undo.append([old_position, _position(data, owner, unit)])
+        changed[op_number[id(move)]] += 1
+
+    return {'changed': changed, 'undo': {'fields': field_undo, 'moves': move_undo}}
+
+
+def _children_of(data, unit):
+    return data if unit is None else unit['children']
+
+
+def _position(data, owner, unit):
+    """Child indexes from the top level down to unit."""
+    position = []
+    while unit is not None:
+        parent = owner[id(unit)]
+        siblings = _children_of(data, parent)
+        position.append(next(i for i, item in enumerate(siblings) if item is unit))
+        unit = parent
+    position.reverse()
+    return position
+
+
+def _unit_at(data, position):
+    unit = None
+    for index in position:
+        unit = _children_of(data, unit)[index]
+    return unit
+
+
+def undo_batch(data, undo):
+    """
+    Restore a hierarchy edited by apply_batch.
+
+    Args:
+        data: The edited hierarchy (modified in place)
+        undo: The 'undo' value returned by apply_batch
+    """
+    for old_position, new_position in reversed(undo['moves']):
+        unit = _unit_at(data, new_position)
+        del _children_of(data, _unit_at(data, new_position[:-1]))[new_position[-1]]
+        _children_of(data, _unit_at(data, old_position[:-1])).insert(old_position[-1], unit)
+
+    for position, fields in reversed(undo['fields']):
+        unit = _unit_at(data, position)
+        children = unit.get('children')
+        unit.clear()
+        for key, value in fields:
+            unit[key] = children if key == 'children' else value
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _dump(data):
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _sync_dir(path):
+    # Make the rename itself durable (not supported on every platform)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """
+    Append-only write-ahead journal next to a hierarchy file.
+
+    Args:
+        json_file: Path to the hierarchy file
+    """
+
+    def __init__(self, json_file):
+        self.json_file = Path(json_file)
+        self.path = Path(f"{json_file}{JOURNAL_SUFFIX}")
+
+    def records(self):
+        """Return all journal records, oldest first."""
+        if not self.path.exists():
+            return []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def append(self, record):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def transactions(self):
+        """Return begin records by txn number, each with its final 'state'."""
+        txns = {}
+        for record in self.records():
+            if record['state'] == 'begin':
+                txns[record['txn']] = dict(record, state='pending')
+            elif record['txn'] in txns:
+                txns[record['txn']]['state'] = record['state']
+        return txns
+
+    def recover(self):
+        """
+        Resolve a commit that was interrupted before its 'commit' record.
+
+        Returns:
+            'committed', 'aborted' or None if nothing was pending
+
+        Raises:
+            BatchError: If the file matches neither side of the pending commit
+        """
+        pending = [txn for txn in self.transactions().values() if txn['state'] == 'pending']
+        if not pending:
+            return None
+        txn = pending[-1]
+        current = file_hash(self.json_file)
+        if current == txn['post']:
+            self.append({'txn': txn['txn'], 'state': 'commit'})
+            return 'committed'
+        if current == txn['pre']:
+            self.append({'txn': txn['txn'], 'state': 'abort'})
+            return 'aborted'
+        raise BatchError(
+            f"{self.json_file} changed outside the journal while transaction {txn['txn']} was pending"
+        )
+
+    def commit(self, data, pre_hash, operations, undo, undoes=None):
+        """
+        Atomically replace the hierarchy file, journaling the change first.
+
+        Args:
+            data: New hierarchy
+            pre_hash: Hash of the file the edit was based on
+            operations: Operation descriptions for the journal
+            undo: Undo information from apply_batch
+            undoes: Transaction number this commit reverts, if any
+
+        Returns:
+            Transaction number
+        """
+        if file_hash(self.json_file) != pre_hash:
+            raise BatchError(f"{self.json_file} changed while the batch was applied")
+
+        content = _dump(data)
+        txns = self.transactions()
+        txn = max(txns, default=0) + 1
+        record = {
+            'txn': txn,
+            'state': 'begin',
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'pre': pre_hash,
+            'post': hashlib.sha256(content).hexdigest(),
+            'operations': operations,
+            'undo': undo,
+        }
+        if undoes is not None:
+            record['undoes'] = undoes
+        self.append(record)
+
+        temp_file = f"{self.json_file}.tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.json_file)
+        _sync_dir(self.json_file)
+
+        self.append({'txn': txn, 'state': 'commit'})
+        return txn
+
+
+def run_batch(json_file, operations, dry_run=False):
+    """
+    Load a hierarchy file, apply a batch and commit it through the journal.
+
+    Args:
+        json_file: Path to hierarchy.json
+        operations: Sequence of operations
+        dry_run: Apply the batch but do not write anything
+
+    Returns:
+        (transaction number or None, changed units per operation)
+
+    Raises:
+        BatchError: If the batch cannot be applied or committed
+    """
+    journal = Journal(json_file)
+    journal.recover()
+    pre_hash = file_hash(json_file)
+    data = load_json(json_file)
+
+    result = apply_batch(data, operations)
+    if dry_run or not any(result['changed']):
+        return None, result['changed']
+
+    txn = journal.commit(data, pre_hash, [op.describe() for op in operations], result['undo'])
+    return txn, result['changed']
+
+
+def undo_last(json_file):
+    """
+    Revert the most recent committed batch that has not been undone.
+
+    Args:
+        json_file: Path to hierarchy.json
+
+    Returns:
+        (number of the reverted transaction, number of the undo transaction)
+
+    Raises:
+        BatchError: If there is nothing to undo or the file no longer matches
+    """
+    journal = Journal(json_file)
+    journal.recover()
+    txns = journal.transactions()
+    undone = {txn['undoes'] for txn in txns.values() if txn['state'] == 'commit' and 'undoes' in txn}
+    candidates = [
+        txn for number, txn in sorted(txns.items())
+        if txn['state'] == 'commit' and 'undoes' not in txn and number not in undone
+    ]
+    if not candidates:
+        raise BatchError("Nothing to undo")
+    txn = candidates[-1]
+
+    pre_hash = file_hash(json_file)
+    if pre_hash != txn['post']:
+        raise BatchError(f"{json_file} changed since transaction {txn['txn']}; cannot undo it")
+
+    data = load_json(json_file)
+    undo_batch(data, txn['undo'])
+    if hashlib.sha256(_dump(data)).hexdigest() != txn['pre']:
+        raise BatchError(f"Undo of transaction {txn['txn']} does not restore the original file")
+
+    operations = [{'op': 'undo', 'txn': txn['txn']}]
+    # An undo is not itself undoable, so it records no undo information
+    number = journal.commit(data, pre_hash, operations, {'fields': [], 'moves': []}, undoes=txn['txn'])
+    return txn['txn'], number
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Apply a batch of edits to hierarchy.json in one journaled commit'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='Hierarchy JSON file (default: hierarchy.json)'
+    )
+    parser.add_argument(
+        '--add-jabatan',
+        action='store_true',
+        help='Set jabatan on every unit from jabatan_rules'
+    )
+    parser.add_argument(
+        '--strip-eselon',
+        action='store_true',
+        help='Remove eselon from Puskesmas and Sekolah units'
+    )
+    parser.add_argument(
+        '--rename',
+        nargs=2,
+        action='append',
+        default=[],
+        metavar=('PATH', 'NEW_NAME'),
+        help=f'Rename the unit at PATH (names joined with "{PATH_SEPARATOR}")'
+    )
+    parser.add_argument(
+        '--move',
+        nargs=2,
+        action='append',
+        default=[],
+        metavar=('PATH', 'NEW_PARENT'),
+        help='Move the unit at PATH under NEW_PARENT ("" for the top level)'
+    )
+    parser.add_argument(
+        '--link-children-file',
+        nargs=2,
+        action='append',
+        default=[],
+        metavar=('PATH', 'FILE'),
+        help='Read more children of the unit at PATH from FILE when it is walked'
+    )
+    parser.add_argument(
+        '--undo',
+        action='store_true',
+        help='Revert the last committed batch'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Report what would change without writing'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        print(f"Error: {args.file} not found!")
+        sys.exit(1)
+
+    try:
+        if args.undo:
+            reverted, txn = undo_last(args.file)
+            print(f"Reverted transaction {reverted} (journaled as transaction {txn})")
+            return
+
+        operations = []
+        operations.extend(Rename(path, name) for path, name in args.rename)
+        operations.extend(Move(path, parent) for path, parent in args.move)
+        operations.extend(LinkChildrenFile(path, reference) for path, reference in args.link_children_file)
+        # Classified after the structural edits, so renamed units get the jabatan of their new name
+        rules = None
+        if args.add_jabatan:
+            rules = DerivedCache()
+            operations.append(AddJabatan(rules))
+        if args.strip_eselon:
+            operations.append(StripEselon())
+        if not operations:
+            parser.error("no operations given")
+
+        txn, changed = run_batch(args.file, operations, dry_run=args.dry_run)
+    except (BatchError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if rules is not None:
+        rules.save()
+
+    for op, count in zip(operations, changed):
+        print(f"{op.describe()['op']}: {count} unit(s) changed")
+    if args.dry_run:
+        print("Dry run: nothing written.")
+    elif txn is None:
+        print("No changes.")
+    else:
+        print(f"Committed transaction {txn} to {args.file} (journal: {Journal(args.file).path.name})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+SQLite database of hierarchy.json and the sd_negeri school files.
+
+The importer loads every unit and school into one SQLite file inside a
+single transaction:
+- units: one row per unit, ids in pre-order as in HierarchyIndex, with
+  parent, depth, the nested-set end id and kode_jabatan
+- closure: one row per (ancestor, descendant) pair, including each unit with
+  itself at distance 0, so "everything under X" is one indexed join
+- schools: one row per NPSN, linked to its kecamatan unit and, when the
+  school is itself a unit of hierarchy.json, to that unit
+- sources: size and mtime of the imported files, used to detect a stale
+  database
+
+eselon, kode_jabatan, unit names and the school links are indexed; NPSN is
+the schools' primary key.
+
+Usage:
+    python hierarchy_db.py import
+    python hierarchy_db.py units "Dinas Kesehatan dan Keluarga Berencana" --eselon IV.a
+    python hierarchy_db.py schools "Kecamatan Ajibarang"
+    python hierarchy_db.py school 20302232
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import jabatan_rules
+from hierarchy_index import HierarchyIndex, PATH_SEPARATOR
+
+
+DB_FILE = "hierarchy.db"
+
+# Bump when the schema changes; older databases are rebuilt
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE sources (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER);
+CREATE TABLE units (
+    id INTEGER PRIMARY KEY,
+    parent_id INTEGER,
+    depth INTEGER NOT NULL,
+    end_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    jabatan TEXT NOT NULL,
+    eselon TEXT NOT NULL,
+    kode_jabatan TEXT NOT NULL,
+    catatan TEXT NOT NULL
+);
+CREATE TABLE closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    distance INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id)
+) WITHOUT ROWID;
+CREATE TABLE schools (
+    npsn TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    alamat TEXT NOT NULL,
+    kelurahan TEXT NOT NULL,
+    status TEXT NOT NULL,
+    kecamatan TEXT NOT NULL,
+    kecamatan_unit_id INTEGER,
+    unit_id INTEGER
+);
+"""
+
+# Created after the bulk insert, which is faster than maintaining them row by row
+INDEXES = """
+CREATE INDEX units_name ON units (name);
+CREATE INDEX units_eselon ON units (eselon);
+CREATE INDEX units_kode_jabatan ON units (kode_jabatan);
+CREATE INDEX closure_descendant ON closure (descendant_id, distance);
+CREATE INDEX schools_kecamatan_unit ON schools (kecamatan_unit_id);
+CREATE INDEX schools_unit ON schools (unit_id);
+"""
+
+UNIT_FIELDS = ('id', 'parent_id', 'depth', 'end_id', 'name', 'jabatan', 'eselon', 'kode_jabatan', 'catatan')
+SCHOOL_FIELDS = ('npsn', 'name', 'alamat', 'kelurahan', 'status', 'kecamatan', 'kecamatan_unit_id', 'unit_id')
+
+# Minimum trigram similarity for a school file's kecamatan to link to a
+# Kecamatan unit whose normalized name differs
+KECAMATAN_MIN_SCORE = 0.9
+
+
+class DatabaseError(Exception):
+    """Raised when the database cannot be built or queried."""
+
+
+def school_files(directory):
+    """The sd_negeri_*.json files of a directory, sorted by name."""
+    return sorted(Path(directory).glob('sd_negeri_*.json'))
+
+
+def kecamatan_of(school_file):
+    """Display name of the kecamatan of an sd_negeri file (sd_negeri_kedung_banteng.json -> Kedungbanteng)."""
+    from update_sd_data import KECAMATAN_MAP
+    key = Path(school_file).stem[len('sd_negeri_'):]
+    return KECAMATAN_MAP.get(key, key.replace('_', ' ').title())
+
+
+def _execute_script(db, script):
+    # executescript() would commit the open transaction first
+    for statement in script.split(';'):
+        if statement.strip():
+            db.execute(statement)
+
+
+def _source_rows(paths):
+    rows = []
+    for path in paths:
+        stat = os.stat(path)
+        rows.append((str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns))
+    return rows
+
+
+def kecamatan_resolver(names, payloads=None):
+    """
+    Resolve kecamatan names to 'Kecamatan ...' units.
+
+    A kecamatan matches a unit when the normalized names are equal or when
+    their trigram similarity is at least KECAMATAN_MIN_SCORE, which still
+    links spelling variants (Baturaden / Baturraden) but not a different
+    kecamatan with a similar name (Purwokerto Tengah / Purwokerto Timur).
+
+    Args:
+        names: Names of the Kecamatan units
+        payloads: Value returned for each name (default: the name itself)
+
+    Returns:
+        Function mapping a kecamatan name (without 'Kecamatan ') to the
+        payload of its unit, or None if no unit matches
+    """
+    from name_index import NameIndex
+    names = list(names)
+    index = NameIndex(names, names if payloads is None else payloads)
+
+    def resolve(kecamatan):
+        matches = index.search(f"Kecamatan {kecamatan}", k=1, min_score=KECAMATAN_MIN_SCORE)
+        return matches[0][2] if matches else None
+    return resolve
+
+
+def build_database(db_file, json_file, school_paths=()):
+    """
+    Import hierarchy.json and school files into a new SQLite database.
+
+    The database is written to a temporary file in one transaction and moved
+    into place, so readers never see a half-built database.
+
+    Args:
+        db_file: Path of the database to write
+        json_file: Path to hierarchy.json
+        school_paths: sd_negeri_*.json files
+
+    Returns:
+        Dictionary with 'units', 'closure' and 'schools' row counts,
+        'unlinked_files' (school files whose kecamatan matches no unit; their
+        schools have no kecamatan_unit_id) and 'duplicate_npsn' (NPSNs in
+        more than one record, as {'npsn': ..., 'occurrences': [{'file': ...,
+        'record': ...}, ...]}; the first record is imported)
+
+    Raises:
+        DatabaseError: A school file cannot be read or is not a JSON array
+    """
+    school_paths = list(school_paths)
+    index = HierarchyIndex.from_file(json_file)
+
+    units = []
+    closure = []
+    for unit_id in range(len(index)):
+        name, jabatan = index.names[unit_id], index.jabatan[unit_id]
+        parent_id = index.parent[unit_id]
+        units.append((
+            unit_id, parent_id if parent_id >= 0 else None, index.depth[unit_id], index.end[unit_id],
+            name, jabatan, index.eselon[unit_id],
+            jabatan_rules.generate_kode_jabatan(jabatan, name), index.catatan[unit_id],
+        ))
+        closure.append((unit_id, unit_id, 0))
+        for distance, ancestor_id in enumerate(index.ancestor_ids(unit_id), 1):
+            closure.append((ancestor_id, unit_id, distance))
+
+    kecamatan_ids = [unit_id for unit_id in index.roots() if index.names[unit_id].startswith('Kecamatan ')]
+    kecamatan_unit = kecamatan_resolver([index.names[unit_id] for unit_id in kecamatan_ids], kecamatan_ids)
+    schools = {}
+    occurrences = {}
+    unlinked = []
+    for school_file in school_paths:
+        kecamatan = kecamatan_of(school_file)
+        kecamatan_id = kecamatan_unit(kecamatan)
+        if kecamatan_id is None:
+            unlinked.append(Path(school_file).name)
+        try:
+            with open(school_file, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except (OSError, ValueError) as e:
+            raise DatabaseError(f"cannot read {school_file}: {e}") from e
+        if not isinstance(records, list):
+            raise DatabaseError(f"{school_file}: root element must be an array")
+        for record_index, record in enumerate(records):
+            npsn = record.get('NPSN') if isinstance(record, dict) else None
+            if not npsn:
+                continue
+            occurrences.setdefault(npsn, []).append({'file': Path(school_file).name, 'record': record_index})
+            if npsn in schools:
+                continue
+            name = record.get('Nama Sekolah', '')
+            unit_ids = index.by_name.get(name)
+            schools[npsn] = (
+                npsn, name, record.get('Alamat', ''), record.get('Kelurahan', ''),
+                record.get('Status', ''), kecamatan, kecamatan_id,
+                unit_ids[0] if unit_ids else None,
+            )
+    duplicates = [
+        {'npsn': npsn, 'occurrences': places}
+        for npsn, places in occurrences.items() if len(places) > 1
+    ]
+
+    db_file = Path(db_file)
+    tmp_file = db_file.with_name(db_file.name + '.tmp')
+    tmp_file.unlink(missing_ok=True)
+    db = sqlite3.connect(tmp_file, isolation_level=None)
+    try:
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute("BEGIN")
+        _execute_script(db, SCHEMA)
+        db.executemany(f"INSERT INTO units VALUES ({', '.join('?' * len(UNIT_FIELDS))})", units)
+        db.executemany("INSERT INTO closure VALUES (?, ?, ?)", closure)
+        db.executemany(f"INSERT INTO schools VALUES ({', '.join('?' * len(SCHOOL_FIELDS))})", schools.values())
+        db.executemany("INSERT INTO sources VALUES (?, ?, ?)", _source_rows([json_file] + school_paths))
+        db.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        _execute_script(db, INDEXES)
+        db.execute("COMMIT")
+        db.execute("ANALYZE")
+    except BaseException:
+        db.close()
+        tmp_file.unlink(missing_ok=True)
+        raise
+    db.close()
+    os.replace(tmp_file, db_file)
+    return {
+        'units': len(units), 'closure': len(closure), 'schools': len(schools),
+        'unlinked_files': unlinked, 'duplicate_npsn': duplicates,
+    }
+
+
+def is_database_current(db_file, json_file, school_paths=()):
+    """
+    Check whether a database was built from the current versions of its sources.
+
+    Returns:
+        True if the database exists, has the current schema and every source
+        has the size and modification time recorded at import
+    """
+    if not Path(db_file).exists():
+        return False
+    try:
+        expected = set(_source_rows([json_file] + list(school_paths)))
+        with sqlite3.connect(f"file:{db_file}?mode=ro", uri=True) as db:
+            version = db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            recorded = set(db.execute("SELECT path, size, mtime_ns FROM sources"))
+        db.close()
+    except (OSError, sqlite3.Error):
+        return False
+    return version == (str(SCHEMA_VERSION),) and recorded == expected
+
+
+class HierarchyDB:
+    """
+    Read-only query API over a database built by build_database.
+
+    Units and schools are returned as dictionaries with the column names of
+    their tables.
+
+    Args:
+        db_file: Path to the database
+    """
+
+    def __init__(self, db_file):
+        if not Path(db_file).exists():
+            raise DatabaseError(f"{db_file} not found")
+        self.db = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+        self.db.row_factory = sqlite3.Row
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _units(self, sql, params=()):
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def unit(self, unit_id):
+        rows = self._units("SELECT * FROM units WHERE id = ?", (unit_id,))
+        return rows[0] if rows else None
+
+    def find(self, name):
+        """All units with this exact name."""
+        return self._units("SELECT * FROM units WHERE name = ? ORDER BY id", (name,))
+
+    def get(self, path):
+        """
+        The unit at a path of names from the top level.
+
+        Args:
+            path: Sequence of names, or a PATH_SEPARATOR-joined string
+
+        Returns:
+            Unit dictionary, or None if no unit has this path
+        """
+        if isinstance(path, str):
+            path = path.split(PATH_SEPARATOR)
+        unit_id = None
+        for name in path:
+            if unit_id is None:
+                row = self.db.execute(
+                    "SELECT id FROM units WHERE name = ? AND parent_id IS NULL", (name,)).fetchone()
+            else:
+                row = self.db.execute(
+                    "SELECT id FROM units WHERE name = ? AND parent_id = ?", (name, unit_id)).fetchone()
+            if row is None:
+                return None
+            unit_id = row[0]
+        return self.unit(unit_id)
+
+    def resolve(self, name_or_path):
+        """
+        Units for a name or a PATH_SEPARATOR-joined path.
+
+        Raises:
+            DatabaseError: No unit matches
+        """
+        if PATH_SEPARATOR in name_or_path:
+            unit = self.get(name_or_path)
+            units = [unit] if unit else []
+        else:
+            units = self.find(name_or_path)
+        if not units:
+            raise DatabaseError(f"unit '{name_or_path}' not found")
+        return units
+
+    def path(self, unit_id):
+        """Names from the top level down to a unit."""
+        rows = self.db.execute(
+            "SELECT u.name FROM closure c JOIN units u ON u.id = c.ancestor_id "
+            "WHERE c.descendant_id = ? ORDER BY c.distance DESC", (unit_id,))
+        return tuple(row[0] for row in rows)
+
+    def units_under(self, unit_id, eselon=None, kode_jabatan=None, include_self=False):
+        """
+        Units in the subtree of a unit.
+
+        Args:
+            unit_id: Id of the subtree root
+            eselon: Only units with this eselon
+            kode_jabatan: Only units with this kode_jabatan
+            include_self: Also return the root itself
+
+        Returns:
+            List of unit dictionaries in pre-order
+        """
+        sql = ["SELECT u.* FROM closure c JOIN units u ON u.id = c.descendant_id WHERE c.ancestor_id = ?"]
+        params = [unit_id]
+        if not include_self:
+            sql.append("AND c.distance > 0")
+        if eselon is not None:
+            sql.append("AND u.eselon = ?")
+            params.append(eselon)
+        if kode_jabatan is not None:
+            sql.append("AND u.kode_jabatan = ?")
+            params.append(kode_jabatan)
+        sql.append("ORDER BY u.id")
+        return self._units(' '.join(sql), params)
+
+    def schools_under(self, unit_id):
+        """
+        Schools in a kecamatan, or listed as units, anywhere under a unit.
+
+        Returns:
+            List of school dictionaries ordered by NPSN
+        """
+        return self._units(
+            "SELECT s.* FROM schools s WHERE s.kecamatan_unit_id IN "
+            "(SELECT descendant_id FROM closure WHERE ancestor_id = :unit) "
+            "OR s.unit_id IN (SELECT descendant_id FROM closure WHERE ancestor_id = :unit) "
+            "ORDER BY s.npsn", {'unit': unit_id})
+
+    def school(self, npsn):
+        """The school with an NPSN, or None."""
+        rows = self._units("SELECT * FROM schools WHERE npsn = ?", (npsn,))
+        return rows[0] if rows else None
+
+
+def open_database(db_file, json_file, school_paths=()):
+    """Open a database, importing the sources first if it is missing or stale."""
+    if not is_database_current(db_file, json_file, school_paths):
+        build_database(db_file, json_file, school_paths)
+    return HierarchyDB(db_file)
+
+
+def print_import_warnings(counts):
+    """Print the unlinked school files and duplicate NPSNs reported by build_database."""
+    for name in counts['unlinked_files']:
+        print(f"  Warning: no Kecamatan unit matches {name}; its schools are not linked to a kecamatan")
+    if counts['duplicate_npsn']:
+        print(f"  Warning: NPSN used in more than one record ({len(counts['duplicate_npsn'])}), "
+              f"the first is imported:")
+        for duplicate in counts['duplicate_npsn']:
+            places = ', '.join(f"{o['file']} #{o['record']}" for o in duplicate['occurrences'])
+            print(f"    - {duplicate['npsn']}: {places}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Import hierarchy.json and the school files into SQLite and query them'
+    )
+    parser.add_argument(
+        'command',
+        choices=['import', 'units', 'schools', 'school'],
+        help='import the files, list units or schools under a unit, or look up a school by NPSN'
+    )
+    parser.add_argument(
+        'target',
+        nargs='?',
+        help='Unit name or path (units, schools) or NPSN (school)'
+    )
+    parser.add_argument(
+        '--eselon',
+        type=str,
+        help='Only units with this eselon (units)'
+    )
+    parser.add_argument(
+        '--kode-jabatan',
+        type=str,
+        help='Only units with this kode_jabatan (units)'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='Hierarchy JSON file (default: hierarchy.json)'
+    )
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=str(Path(__file__).parent / DB_FILE),
+        help=f'Database file (default: {DB_FILE})'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        print(f"Error: {args.file} not found!")
+        sys.exit(1)
+    schools = school_files(Path(args.file).parent)
+
+    if args.command != 'import' and not args.target:
+        parser.error(f"{args.command} needs a unit name or NPSN")
+
+    try:
+        if args.command == 'import' or not is_database_current(args.db, args.file, schools):
+            counts = build_database(args.db, args.file, schools)
+            print_import_warnings(counts)
+            if args.command == 'import':
+                print(f"✓ Imported {counts['units']} units ({counts['closure']} closure rows) "
+                      f"and {counts['schools']} schools into {args.db}")
+                return
+
+        with HierarchyDB(args.db) as db:
+            if args.command == 'school':
+                school = db.school(args.target)
+                if school is None:
+                    print(f"No school with NPSN {args.target}")
+                    sys.exit(1)
+                for key, value in school.items():
+                    print(f"{key}: {value if value is not None else '(kosong)'}")
+                return
+
+            for root in db.resolve(args.target):
+                if args.command == 'units':
+                    rows = db.units_under(root['id'], args.eselon, args.kode_jabatan)
+                    for unit in rows:
+                        print(f"{PATH_SEPARATOR.join(db.path(unit['id']))}  [{unit['eselon'] or '-'}]")
+                    print(f"{len(rows)} unit(s) under {root['name']}")
+                else:
+                    rows = db.schools_under(root['id'])
+                    for school in rows:
+                        print(f"{school['npsn']}  {school['name']}")
+                    print(f"{len(rows)} school(s) under {root['name']}")
+    except DatabaseError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Structural diff between two versions of hierarchy.json.
+
+Units are matched top-down from the top level:
+1. children of matched units are matched by exact name, which is the same
+   as matching by path below the nearest matched ancestor
+2. the remaining siblings are matched by fuzzy name similarity (renames)
+3. units still unmatched anywhere are matched by unique exact name (moves)
+
+Everything else is added or removed. Matched units are compared field by
+field. Steps 1 and 3 are dictionary lookups; fuzzy matching only compares
+each unmatched sibling with a bounded number of siblings that share an
+uncommon word, so the diff stays near-linear in the size of the trees.
+
+Usage:
+    python hierarchy_diff.py hierarchy.json.bak hierarchy.json
+    python hierarchy_diff.py old.json new.json --json
+"""
+
+import argparse
+import heapq
+import json
+import re
+import sys
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from hierarchy_index import HierarchyIndex, PATH_SEPARATOR
+
+
+# Minimum similarity for two sibling names to count as a rename
+RENAME_THRESHOLD = 0.6
+
+# Fields compared on matched units
+COMPARED_FIELDS = ('eselon', 'jabatan', 'catatan')
+
+# Words in more than this share of a sibling group do not select fuzzy candidates
+COMMON_WORD_SHARE = 0.5
+
+# Words in more than this many new sibling names do not select fuzzy
+# candidates either, which bounds the work per old name in large groups
+MAX_WORD_POSTINGS = 32
+
+# New names compared with each old name, those sharing the rarest words first
+CANDIDATES_PER_NAME = 10
+
+_WORD = re.compile(r'\w+')
+
+
+def name_similarity(a, b):
+    """Similarity of two unit names between 0 and 1 (case-insensitive)."""
+    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+
+
+def _words(name):
+    return set(_WORD.findall(name.lower()))
+
+
+def match_siblings(old_names, new_names, threshold=RENAME_THRESHOLD):
+    """
+    Pair up renamed siblings by fuzzy name similarity.
+
+    Only names that share an uncommon word are compared. A word is uncommon
+    when at most COMMON_WORD_SHARE of the new names and at most
+    MAX_WORD_POSTINGS of them contain it, so each old name reaches a bounded
+    number of new names through a word -> new ids index. Of those, the
+    CANDIDATES_PER_NAME sharing the rarest words are compared, which keeps
+    the cost of a group linear in its size. SequenceMatcher's cheap upper
+    bounds (real_quick_ratio, quick_ratio) skip candidates that cannot reach
+    the threshold before the exact ratio is computed. Pairs are taken
+    greedily from the most similar down.
+
+    Args:
+        old_names: Dictionary of old id -> name
+        new_names: Dictionary of new id -> name
+        threshold: Minimum similarity
+
+    Returns:
+        List of (old id, new id, similarity)
+    """
+    if not old_names or not new_names:
+        return []
+
+    by_word = {}
+    for new_id, name in new_names.items():
+        for word in _words(name):
+            by_word.setdefault(word, []).append(new_id)
+    group_size = len(old_names) + len(new_names)
+    limit = MAX_WORD_POSTINGS
+    if group_size > 4:
+        limit = min(limit, COMMON_WORD_SHARE * len(new_names))
+    by_word = {word: ids for word, ids in by_word.items() if len(ids) <= limit}
+
+    matcher = SequenceMatcher(None)
+    candidates = []
+    for old_id, old_name in old_names.items():
+        # Rarer shared words weigh more
+        weight = {}
+        for word in _words(old_name):
+            ids = by_word.get(word)
+            if ids:
+                for new_id in ids:
+                    weight[new_id] = weight.get(new_id, 0) + 1 / len(ids)
+        if not weight:
+            continue
+        # seq2 is the side SequenceMatcher indexes, so it is set once per old name
+        matcher.set_seq2(old_name.lower())
+        best = heapq.nlargest(CANDIDATES_PER_NAME, weight, key=weight.get)
+        for new_id in best:
+            matcher.set_seq1(new_names[new_id].lower())
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            score = matcher.ratio()
+            if score >= threshold:
+                candidates.append((score, old_id, new_id))
+
+    candidates.sort(key=lambda item: (-item[0], item[1], item[2]))
+    used_old, used_new = set(), set()
+    pairs = []
+    for score, old_id, new_id in candidates:
+        if old_id in used_old or new_id in used_new:
+            continue
+        used_old.add(old_id)
+        used_new.add(new_id)
+        pairs.append((old_id, new_id, score))
+    return pairs
+
+
+def _children(index, unit_id):
+    return index.roots() if unit_id < 0 else index.children_ids(unit_id)
+
+
+def match_units(old, new, threshold=RENAME_THRESHOLD):
+    """
+    Match the units of two hierarchies.
+
+    Args:
+        old: HierarchyIndex of the old version
+        new: HierarchyIndex of the new version
+        threshold: Minimum similarity for fuzzy sibling matches
+
+    Returns:
+        (old id -> new id, set of old ids matched by fuzzy name)
+    """
+    matched = {}
+    fuzzy = set()
+    matched_new = set()
+
+    def match_below(pairs):
+        # Breadth-first over matched pairs; -1 stands for the top level
+        queue = list(pairs)
+        while queue:
+            next_queue = []
+            for old_id, new_id in queue:
+                new_children = {}
+                for child in _children(new, new_id):
+                    if child not in matched_new:
+                        new_children.setdefault(new.names[child], []).append(child)
+
+                leftover_old = {}
+                for child in _children(old, old_id):
+                    if child in matched:
+                        continue
+                    same_name = new_children.get(old.names[child])
+                    if same_name:
+                        pair = (child, same_name.pop(0))
+                    else:
+                        leftover_old[child] = old.names[child]
+                        continue
+                    matched[pair[0]] = pair[1]
+                    matched_new.add(pair[1])
+                    next_queue.append(pair)
+
+                leftover_new = {
+                    child: new.names[child]
+                    for children in new_children.values() for child in children
+                }
+                for old_child, new_child, _ in match_siblings(leftover_old, leftover_new, threshold):
+                    matched[old_child] = new_child
+                    matched_new.add(new_child)
+                    fuzzy.add(old_child)
+                    next_queue.append((old_child, new_child))
+            queue = next_queue
+
+    match_below([(-1, -1)])
+
+    # Moves: units left over on both sides with a name that is unique on each side
+    old_left = {}
+    for unit_id in range(len(old)):
+        if unit_id not in matched:
+            old_left.setdefault(old.names[unit_id], []).append(unit_id)
+    new_left = {}
+    for unit_id in range(len(new)):
+        if unit_id not in matched_new:
+            new_left.setdefault(new.names[unit_id], []).append(unit_id)
+
+    moved_pairs = []
+    for name, old_ids in old_left.items():
+        new_ids = new_left.get(name)
+        if len(old_ids) == 1 and new_ids and len(new_ids) == 1:
+            matched[old_ids[0]] = new_ids[0]
+            matched_new.add(new_ids[0])
+            moved_pairs.append((old_ids[0], new_ids[0]))
+    match_below(moved_pairs)
+
+    return matched, fuzzy
+
+
+def diff_hierarchies(old, new, threshold=RENAME_THRESHOLD):
+    """
+    Compute the structural diff between two hierarchies.
+
+    Args:
+        old: HierarchyIndex of the old version
+        new: HierarchyIndex of the new version
+        threshold: Minimum similarity for renames
+
+    Returns:
+        Dictionary with lists 'added', 'removed' (subtree roots with their
+        unit count), 'renamed', 'moved' and 'changed' (one entry per field)
+    """
+    matched, fuzzy = match_units(old, new, threshold)
+    matched_new = set(matched.values())
+
+    def path(index, unit_id):
+        return PATH_SEPARATOR.join(index.path(unit_id))
+
+    result = {'added': [], 'removed': [], 'renamed': [], 'moved': [], 'changed': []}
+
+    for unit_id in range(len(old)):
+        if unit_id not in matched:
+            parent_id = old.parent[unit_id]
+            # Report only the root of each removed subtree
+            if parent_id < 0 or parent_id in matched:
+                units = sum(1 for i in old.subtree_ids(unit_id) if i not in matched)
+                result['removed'].append({'path': path(old, unit_id), 'units': units})
+            continue
+
+        new_id = matched[unit_id]
+        if old.names[unit_id] != new.names[new_id]:
+            entry = {'path': path(old, unit_id), 'name': new.names[new_id]}
+            if unit_id in fuzzy:
+                entry['similarity'] = round(name_similarity(old.names[unit_id], new.names[new_id]), 3)
+            result['renamed'].append(entry)
+
+        old_parent = old.parent[unit_id]
+        new_parent = new.parent[new_id]
+        if matched.get(old_parent, -1) != new_parent:
+            result['moved'].append({'path': path(old, unit_id), 'new_path': path(new, new_id)})
+
+        for field in COMPARED_FIELDS:
+            before = getattr(old, field)[unit_id]
+            after = getattr(new, field)[new_id]
+            if before != after:
+                result['changed'].append({
+                    'path': path(new, new_id), 'field': field, 'old': before, 'new': after,
+                })
+
+    for unit_id in range(len(new)):
+        if unit_id not in matched_new:
+            parent_id = new.parent[unit_id]
+            if parent_id < 0 or parent_id in matched_new:
+                units = sum(1 for i in new.subtree_ids(unit_id) if i not in matched_new)
+                result['added'].append({'path': path(new, unit_id), 'units': units})
+
+    return result
+
+
+def print_diff(result):
+    """Print a diff in a readable form."""
+    for entry in result['removed']:
+        print(f"- {entry['path']} ({entry['units']} unit(s))")
+    for entry in result['added']:
+        print(f"+ {entry['path']} ({entry['units']} unit(s))")
+    for entry in result['renamed']:
+        similarity = f" [{entry['similarity']:.2f}]" if 'similarity' in entry else ''
+        print(f"~ renamed {entry['path']} -> {entry['name']}{similarity}")
+    for entry in result['moved']:
+        print(f"> moved {entry['path']} -> {entry['new_path']}")
+    for entry in result['changed']:
+        print(f"* {entry['path']}: {entry['field']} "
+              f"{entry['old'] or '(kosong)'} -> {entry['new'] or '(kosong)'}")
+
+    print()
+    print(f"Added: {len(result['added'])}, Removed: {len(result['removed'])}, "
+          f"Renamed: {len(result['renamed'])}, Moved: {len(result['moved'])}, "
+          f"Field changes: {len(result['changed'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare two versions of hierarchy.json'
+    )
+    parser.add_argument(
+        'old',
+        help='Old hierarchy JSON file'
+    )
+    parser.add_argument(
+        'new',
+        help='New hierarchy JSON file'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=RENAME_THRESHOLD,
+        help=f'Minimum name similarity for a rename (default: {RENAME_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the diff as JSON'
+    )
+
+    args = parser.parse_args()
+
+    for json_file in (args.old, args.new):
+        if not Path(json_file).exists():
+            print(f"Error: {json_file} not found!")
+            sys.exit(1)
+
+    result = diff_hierarchies(HierarchyIndex.from_file(args.old), HierarchyIndex.from_file(args.new),
+                              args.threshold)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_diff(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Indexed in-memory model of hierarchy.json.
+
+The tree is loaded once into flat columns indexed by unit id. Ids are assigned
+in pre-order, so the subtree of a unit is the contiguous id range
+[id, end[id]) (the Euler-tour in/out indices). On top of that the index keeps:
+- name -> ids and path -> id dictionaries
+- a parent id array
+- children stored as ranges into one flat child-id array
+
+This gives O(1) parent, subtree and "is X under Y" queries, and ancestor
+walks proportional to depth, without re-walking the nested dicts.
+
+Usage:
+    python hierarchy_index.py "Dinas Pendidikan"
+    python hierarchy_index.py "Subbagian Keuangan" --under "Dinas Pendidikan"
+    python hierarchy_index.py "Dinas Pendidikan" --snapshot hierarchy.snap
+"""
+
+import argparse
+import json
+import sys
+from array import array
+from pathlib import Path
+
+
+# Separator used when a path is given as a single string
+PATH_SEPARATOR = " / "
+
+
+class Unit:
+    """
+    Lightweight view of one unit in a HierarchyIndex.
+
+    Attributes are read from the index columns on access, so creating a Unit
+    costs only two slots.
+    """
+
+    __slots__ = ('index', 'id')
+
+    def __init__(self, index, unit_id):
+        self.index = index
+        self.id = unit_id
+
+    @property
+    def name(self):
+        return self.index.names[self.id]
+
+    @property
+    def jabatan(self):
+        return self.index.jabatan[self.id]
+
+    @property
+    def eselon(self):
+        return self.index.eselon[self.id]
+
+    @property
+    def catatan(self):
+        return self.index.catatan[self.id]
+
+    @property
+    def depth(self):
+        return self.index.depth[self.id]
+
+    @property
+    def parent(self):
+        parent_id = self.index.parent[self.id]
+        return Unit(self.index, parent_id) if parent_id >= 0 else None
+
+    @property
+    def children(self):
+        return [Unit(self.index, child_id) for child_id in self.index.children_ids(self.id)]
+
+    @property
+    def path(self):
+        return self.index.path(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, Unit) and other.index is self.index and other.id == self.id
+
+    def __hash__(self):
+        return hash((id(self.index), self.id))
+
+    def __repr__(self):
+        return f"Unit({self.id}, {self.name!r})"
+
+
+class HierarchyIndex:
+    """
+    Flat, indexed representation of a hierarchy tree.
+
+    Args:
+        data: List of organizational units with nested children (hierarchy.json format)
+        loader: Optional lazy_children.ChildrenLoader; the units of children
+            files are then indexed as well
+    """
+
+    def __init__(self, data, loader=None):
+        self.names = []
+        self.jabatan = []
+        self.eselon = []
+        self.catatan = []
+        self.parent = array('i')
+        self.depth = array('i')
+        self.end = array('i')
+        self.by_name = {}
+        self.by_path = {}
+
+        self._build(data, loader)
+        self._build_children()
+
+    @classmethod
+    def from_file(cls, json_file, loader=None):
+        """
+        Load and index a hierarchy JSON file.
+
+        Args:
+            json_file: Path to hierarchy.json
+            loader: Optional lazy_children.ChildrenLoader
+
+        Returns:
+            HierarchyIndex
+        """
+        with open(json_file, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), loader)
+
+    def _build(self, data, loader=None):
+        if not isinstance(data, list):
+            return
+
+        exhausted = object()
+        # Each frame: (iterator over children, owner id, owner path)
+        stack = [(iter(data), -1, ())]
+        while stack:
+            items, owner_id, owner_path = stack[-1]
+            item = next(items, exhausted)
+            if item is exhausted:
+                stack.pop()
+                if owner_id >= 0:
+                    self.end[owner_id] = len(self.names)
+                continue
+
+            if not (isinstance(item, dict) and 'name' in item):
+                continue
+
+            unit_id = len(self.names)
+            name = item['name']
+            path = owner_path + (name,)
+            self.names.append(name)
+            self.jabatan.append(item.get('jabatan', ''))
+            self.eselon.append(item.get('eselon', ''))
+            self.catatan.append(item.get('catatan', ''))
+            self.parent.append(owner_id)
+            self.depth.append(len(owner_path))
+            self.end.append(unit_id + 1)
+            self.by_name.setdefault(name, []).append(unit_id)
+            # First unit wins if two siblings share a name
+            self.by_path.setdefault(path, unit_id)
+
+            children = loader.children(item) if loader is not None else item.get('children')
+            if isinstance(children, list) and children:
+                stack.append((iter(children), unit_id, path))
+
+    def _build_children(self):
+        count = len(self.names)
+        child_count = array('i', bytes(4 * (count + 1)))
+        for parent_id in self.parent:
+            child_count[parent_id + 1] += 1
+
+        # child_start[p + 1] .. child_start[p + 2] holds the children of p;
+        # slot 0 holds the roots (parent -1)
+        self.child_start = array('i', [0]) * (count + 2)
+        for i in range(count + 1):
+            self.child_start[i + 1] = self.child_start[i] + child_count[i]
+
+        fill = array('i', self.child_start[:count + 1])
+        self.child_ids = array('i', bytes(4 * count))
+        # Ids are visited in pre-order, so each child list keeps document order
+        for unit_id, parent_id in enumerate(self.parent):
+            self.child_ids[fill[parent_id + 1]] = unit_id
+            fill[parent_id + 1] += 1
+
+    def __len__(self):
+        return len(self.names)
+
+    def unit(self, unit_id):
+        """Return a Unit view for an id."""
+        return Unit(self, unit_id)
+
+    def find(self, name):
+        """
+        Return all units with the given name.
+
+        Args:
+            name: Unit name
+
+        Returns:
+            List of Unit (empty if not found)
+        """
+        return [Unit(self, unit_id) for unit_id in self.by_name.get(name, ())]
+
+    def get(self, path):
+        """
+        Return the unit at a path of names from the top level.
+
+        Args:
+            path: Sequence of names, or a string joined with PATH_SEPARATOR
+
+        Returns:
+            Unit, or None if not found
+        """
+        if isinstance(path, str):
+            path = path.split(PATH_SEPARATOR)
+        unit_id = self.by_path.get(tuple(path))
+        return Unit(self, unit_id) if unit_id is not None else None
+
+    def roots(self):
+        """Return the ids of top-level units."""
+        return self.child_ids[self.child_start[0]:self.child_start[1]]
+
+    def children_ids(self, unit_id):
+        """Return the ids of the direct children of a unit, in document order."""
+        return self.child_ids[self.child_start[unit_id + 1]:self.child_start[unit_id + 2]]
+
+    def subtree_ids(self, unit_id):
+        """Return the ids of a unit and all its descendants, in pre-order."""
+        return range(unit_id, self.end[unit_id])
+
+    def subtree_size(self, unit_id):
+        """Return the number of units in a subtree, including its root."""
+        return self.end[unit_id] - unit_id
+
+    def ancestor_ids(self, unit_id):
+        """Return the ids of a unit's ancestors, nearest first."""
+        result = []
+        parent_id = self.parent[unit_id]
+        while parent_id >= 0:
+            result.append(parent_id)
+            parent_id = self.parent[parent_id]
+        return result
+
+    def is_under(self, unit_id, ancestor_id):
+        """
+        Check whether a unit lies strictly inside another unit's subtree.
+
+        Args:
+            unit_id: Candidate descendant
+            ancestor_id: Candidate ancestor
+
+        Returns:
+            True if unit_id is a descendant of ancestor_id
+        """
+        return ancestor_id < unit_id < self.end[ancestor_id]
+
+    def path(self, unit_id):
+        """Return the names from the top-level unit down to unit_id."""
+        names = [self.names[unit_id]]
+        names.extend(self.names[i] for i in self.ancestor_ids(unit_id))
+        names.reverse()
+        return tuple(names)
+
+    def to_tree(self, unit_id):
+        """
+        Rebuild the nested hierarchy.json dictionary for one subtree.
+
+        Args:
+            unit_id: Root of the subtree
+
+        Returns:
+            Dictionary with name, jabatan, eselon, catatan (when set) and children
+        """
+        nodes = {}
+        for i in self.subtree_ids(unit_id):
+            node = {'name': self.names[i]}
+            if self.jabatan[i]:
+                node['jabatan'] = self.jabatan[i]
+            if self.eselon[i]:
+                node['eselon'] = self.eselon[i]
+            if self.catatan[i]:
+                node['catatan'] = self.catatan[i]
+            node['children'] = []
+            nodes[i] = node
+            if i != unit_id:
+                nodes[self.parent[i]]['children'].append(node)
+        return nodes[unit_id]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Query hierarchy.json through the in-memory index'
+    )
+    parser.add_argument(
+        'name',
+        help='Unit name to look up'
+    )
+    parser.add_argument(
+        '--under',
+        type=str,
+        help='Only report matches that lie under this unit'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='Hierarchy JSON file (default: hierarchy.json)'
+    )
+    parser.add_argument(
+        '--snapshot',
+        type=str,
+        help='Query a binary snapshot built by hierarchy_snapshot.py instead of the JSON file'
+    )
+
+    args = parser.parse_args()
+
+    if args.snapshot:
+        from hierarchy_snapshot import HierarchySnapshot, SnapshotError
+        try:
+            index = HierarchySnapshot(args.snapshot)
+        except (OSError, SnapshotError) as e:
+            print(f"Error: cannot open snapshot: {e}")
+            sys.exit(1)
+    elif not Path(args.file).exists():
+        print(f"Error: {args.file} not found!")
+        sys.exit(1)
+    else:
+        index = HierarchyIndex.from_file(args.file)
+    matches = index.find(args.name)
+
+    if args.under:
+        ancestors = index.find(args.under)
+        if not ancestors:
+            print(f"Error: unit '{args.under}' not found")
+            sys.exit(1)
+        matches = [
+            unit for unit in matches
+            if any(index.is_under(unit.id, ancestor.id) for ancestor in ancestors)
+        ]
+
+    if not matches:
+        print(f"No unit named '{args.name}' found")
+        sys.exit(1)
+
+    for unit in matches:
+        print(PATH_SEPARATOR.join(unit.path))
+        print(f"   Eselon: {unit.eselon if unit.eselon else '(kosong)'}")
+        print(f"   Jabatan: {unit.jabatan if unit.jabatan else '(kosong)'}")
+        print(f"   Children: {len(index.children_ids(unit.id))}")
+        print(f"   Subtree size: {index.subtree_size(unit.id)}")
+
+
+if __name__ == "__main__":
+    main()
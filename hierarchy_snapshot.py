@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Compact binary snapshot of hierarchy.json, queried through mmap.
+
+build_snapshot() compiles the hierarchy into one little-endian file:
+- an interned string table (every distinct string stored once, sorted by
+  its UTF-8 bytes so names can be found by binary search)
+- int32 columns indexed by unit id: name, jabatan, kode_jabatan and catatan
+  string ids, parent, depth and subtree end
+- a uint8 eselon enum column with its own small value table
+- the children ranges and a name-sorted unit order for lookups
+
+HierarchySnapshot opens the file with mmap and reads the columns in place,
+so opening costs no JSON parsing or dict building, and processes that open
+the same snapshot share one copy of it through the page cache. It offers
+the same queries as hierarchy_index.HierarchyIndex (plus kode_jabatan).
+
+Usage:
+    python hierarchy_snapshot.py
+    python hierarchy_snapshot.py --file hierarchy.json --output hierarchy.snap
+    python hierarchy_index.py "Dinas Pendidikan" --snapshot hierarchy.snap
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+import jabatan_rules
+from hierarchy_index import HierarchyIndex, PATH_SEPARATOR, Unit
+
+
+MAGIC = b'HSNP'
+VERSION = 1
+
+# magic, version, units, strings, eselon values, string blob size,
+# source size, source mtime (ns)
+HEADER = struct.Struct('<4sIIIIIqq')
+
+DEFAULT_SNAPSHOT = "hierarchy.snap"
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a readable hierarchy snapshot."""
+
+
+def _int_bytes(values):
+    """Little-endian int32 bytes for a sequence of ints."""
+    column = array('i', values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _pad(data):
+    """Pad to a multiple of 4 bytes so the next column stays aligned."""
+    return data + bytes(-len(data) % 4)
+
+
+def _source_stat(json_file):
+    stat = os.stat(json_file)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def build_snapshot(json_file, output_file):
+    """
+    Compile a hierarchy JSON file into a binary snapshot.
+
+    Args:
+        json_file: Path to hierarchy.json
+        output_file: Path of the snapshot to write
+
+    Returns:
+        Number of units in the snapshot
+    """
+    index = HierarchyIndex.from_file(json_file)
+    count = len(index)
+    kode_jabatan = [jabatan_rules.generate_kode_jabatan(index.jabatan[i], index.names[i])
+                    for i in range(count)]
+
+    eselon_values = sorted(set(index.eselon) | {''})
+    if len(eselon_values) > 256:
+        raise SnapshotError(f"Too many distinct eselon values: {len(eselon_values)}")
+    eselon_code = {value: code for code, value in enumerate(eselon_values)}
+
+    # Intern every string; ids follow byte order so lookups can bisect
+    encoded = {}
+    for column in (index.names, index.jabatan, kode_jabatan, index.catatan, eselon_values):
+        for text in column:
+            if text not in encoded:
+                encoded[text] = text.encode('utf-8')
+    strings = sorted(encoded, key=encoded.__getitem__)
+    sid = {text: i for i, text in enumerate(strings)}
+
+    offsets = [0]
+    for text in strings:
+        offsets.append(offsets[-1] + len(encoded[text]))
+    blob = b''.join(encoded[text] for text in strings)
+
+    name_sids = [sid[name] for name in index.names]
+    name_order = sorted(range(count), key=name_sids.__getitem__)
+
+    size, mtime_ns = _source_stat(json_file)
+    sections = [
+        HEADER.pack(MAGIC, VERSION, count, len(strings), len(eselon_values), len(blob), size, mtime_ns),
+        _int_bytes(offsets),
+        _int_bytes(name_sids),
+        _int_bytes(sid[text] for text in index.jabatan),
+        _int_bytes(sid[text] for text in kode_jabatan),
+        _int_bytes(sid[text] for text in index.catatan),
+        _int_bytes(sid[value] for value in eselon_values),
+        _pad(bytes(eselon_code[value] for value in index.eselon)),
+        _int_bytes(index.parent),
+        _int_bytes(index.depth),
+        _int_bytes(index.end),
+        _int_bytes(index.child_start),
+        _int_bytes(index.child_ids),
+        _int_bytes(name_order),
+        blob,
+    ]
+
+    # Write next to the target and swap in, so readers never see a partial file
+    temp_file = f'{output_file}.tmp'
+    with open(temp_file, 'wb') as f:
+        for section in sections:
+            f.write(section)
+    os.replace(temp_file, output_file)
+    return count
+
+
+def is_snapshot_current(snapshot_file, json_file):
+    """
+    Check whether a snapshot was built from the current version of a JSON file.
+
+    Compares the source size and modification time recorded at build time.
+
+    Args:
+        snapshot_file: Path to the snapshot
+        json_file: Path to hierarchy.json
+
+    Returns:
+        True if the snapshot exists and matches the JSON file
+    """
+    try:
+        with open(snapshot_file, 'rb') as f:
+            header = f.read(HEADER.size)
+        source = _source_stat(json_file)
+    except OSError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, version, *_, size, mtime_ns = HEADER.unpack(header)
+    return magic == MAGIC and version == VERSION and (size, mtime_ns) == source
+
+
+class _StringPool:
+    """The interned string table, decoded on access."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, string_id):
+        return str(self.blob[self.offsets[string_id]:self.offsets[string_id + 1]], 'utf-8')
+
+    def encoded(self, string_id):
+        return self.blob[self.offsets[string_id]:self.offsets[string_id + 1]].tobytes()
+
+    def find(self, text):
+        """Return the id of a string, or -1 if it is not in the table."""
+        target = text.encode('utf-8')
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.encoded(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self.encoded(lo) == target:
+            return lo
+        return -1
+
+
+class _StringColumn:
+    """Per-unit string column: unit id -> string through the pool."""
+
+    def __init__(self, pool, string_ids):
+        self.pool = pool
+        self.string_ids = string_ids
+
+    def __len__(self):
+        return len(self.string_ids)
+
+    def __getitem__(self, unit_id):
+        return self.pool[self.string_ids[unit_id]]
+
+
+class _EselonColumn:
+    """Per-unit eselon column: unit id -> value through the enum table."""
+
+    def __init__(self, values, codes):
+        self.values = values
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, unit_id):
+        return self.values[self.codes[unit_id]]
+
+
+class HierarchySnapshot(HierarchyIndex):
+    """
+    Read-only hierarchy index backed by a memory-mapped snapshot file.
+
+    The columns are views into the mapping; strings are decoded only when a
+    unit's field is read. Close the snapshot (or use it as a context manager)
+    to release the mapping.
+
+    Args:
+        snapshot_file: Path to a file written by build_snapshot
+    """
+
+    def __init__(self, snapshot_file):
+        with open(snapshot_file, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f"{snapshot_file} is empty") from None
+        self._views = []
+
+        try:
+            self._open()
+        except (SnapshotError, struct.error, TypeError, ValueError) as e:
+            self.close()
+            if isinstance(e, SnapshotError):
+                raise
+            raise SnapshotError(f"{snapshot_file} is truncated or corrupt: {e}") from None
+
+    def _open(self):
+        magic, version, count, string_count, eselon_count, blob_size, _, _ = \
+            HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Not a hierarchy snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}")
+
+        self._pos = HEADER.size
+        offsets = self._ints(string_count + 1)
+        name_sids = self._ints(count)
+        jabatan_sids = self._ints(count)
+        kode_sids = self._ints(count)
+        catatan_sids = self._ints(count)
+        eselon_sids = self._ints(eselon_count)
+        eselon_codes = self._view(count, 'B')
+        self._pos += -count % 4
+        self.parent = self._ints(count)
+        self.depth = self._ints(count)
+        self.end = self._ints(count)
+        self.child_start = self._ints(count + 2)
+        self.child_ids = self._ints(count)
+        self._name_order = self._ints(count)
+        blob = self._view(blob_size, 'B')
+
+        self._pool = _StringPool(offsets, blob)
+        self._name_sids = name_sids
+        self.names = _StringColumn(self._pool, name_sids)
+        self.jabatan = _StringColumn(self._pool, jabatan_sids)
+        self.kode_jabatan = _StringColumn(self._pool, kode_sids)
+        self.catatan = _StringColumn(self._pool, catatan_sids)
+        # Few distinct values: decode the enum table once
+        self.eselon = _EselonColumn([self._pool[string_id] for string_id in eselon_sids], eselon_codes)
+
+    def _view(self, length, fmt):
+        size = length * struct.calcsize(fmt)
+        if self._pos + size > len(self._mmap):
+            raise SnapshotError("Snapshot is truncated")
+        view = memoryview(self._mmap)[self._pos:self._pos + size].cast(fmt)
+        self._views.append(view)
+        self._pos += size
+        return view
+
+    def _ints(self, length):
+        if sys.byteorder == 'little':
+            return self._view(length, 'i')
+        # Big-endian hosts get a converted copy
+        column = array('i', self._view(length, 'B').tobytes())
+        column.byteswap()
+        return column
+
+    def close(self):
+        """Release the column views and unmap the file."""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def find(self, name):
+        """
+        Return all units with the given name.
+
+        Args:
+            name: Unit name
+
+        Returns:
+            List of Unit (empty if not found), in document order
+        """
+        string_id = self._pool.find(name)
+        if string_id < 0:
+            return []
+
+        # _name_order lists unit ids by name string id, then by unit id
+        order, name_sids = self._name_order, self._name_sids
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if name_sids[order[mid]] < string_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        result = []
+        while lo < len(order) and name_sids[order[lo]] == string_id:
+            result.append(Unit(self, order[lo]))
+            lo += 1
+        return result
+
+    def get(self, path):
+        """
+        Return the unit at a path of names from the top level.
+
+        Args:
+            path: Sequence of names, or a string joined with PATH_SEPARATOR
+
+        Returns:
+            Unit, or None if not found
+        """
+        if isinstance(path, str):
+            path = path.split(PATH_SEPARATOR)
+
+        # Follow every sibling with a matching name; the first unit in
+        # document order wins, as in HierarchyIndex
+        candidates = [-1]
+        for name in path:
+            string_id = self._pool.find(name)
+            if string_id < 0:
+                return None
+            candidates = [
+                child_id
+                for unit_id in candidates
+                for child_id in self.child_ids[self.child_start[unit_id + 1]:self.child_start[unit_id + 2]]
+                if self._name_sids[child_id] == string_id
+            ]
+            if not candidates:
+                return None
+        return Unit(self, min(candidates)) if path else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compile hierarchy.json into a binary snapshot'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='Hierarchy JSON file (default: hierarchy.json)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=str(Path(__file__).parent / DEFAULT_SNAPSHOT),
+        help=f'Snapshot file to write (default: {DEFAULT_SNAPSHOT})'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Rebuild even if the snapshot is up to date'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        print(f"Error: {args.file} not found!")
+        sys.exit(1)
+
+    if not args.force and is_snapshot_current(args.output, args.file):
+        print(f"{args.output} is up to date.")
+        return
+
+    count = build_snapshot(args.file, args.output)
+    size_kb = Path(args.output).stat().st_size / 1024
+    print(f"Wrote {args.output}: {count} units, {size_kb:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Content-addressed version store for hierarchy.json and the sd_negeri files.
+
+Versions are saved as the changes since the previous version instead of a
+full copy. A document is split into one record per unit: the unit's own
+fields plus the hashes of its children's records (a Merkle tree, like git
+trees). A record is identified by the SHA-256 of its content, so a record
+that is already stored is never written again; saving a version writes only
+the records of changed units and their ancestors.
+
+Each version file holds its root record hash, its new records and a
+structural diff against the previous version: the paths of added, changed
+and removed units (path segments are unit names, or NPSN for school lists;
+repeated sibling names get a '#n' suffix). The diff is found by walking both
+trees and skipping subtrees whose hashes are equal. Any version is rebuilt
+directly from its root hash and checked against the saved document hash.
+
+Layout (one directory per document under .hierarchy_store/):
+    <document>/versions/000001.json.gz  version metadata, diff and new records
+    <document>/objects.idx              record hash -> version that holds it
+
+Usage:
+    python hierarchy_store.py save --label nightly
+    python hierarchy_store.py list
+    python hierarchy_store.py show 3
+    python hierarchy_store.py restore 3 --output hierarchy_v3.json
+    python hierarchy_store.py save --file hierarchy.json.bak3 --document hierarchy.json
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from json_stream import load_json
+
+
+STORE_DIR = ".hierarchy_store"
+
+# Hex digits of SHA-256 kept for record ids
+HASH_LENGTH = 32
+
+# Field used as the path segment of each unit, by document
+KEY_FIELDS = {'hierarchy.json': 'name'}
+DEFAULT_KEY_FIELD = 'name'
+SCHOOL_KEY_FIELD = 'NPSN'
+
+
+class StoreError(ValueError):
+    """Raised for missing versions or a corrupt store."""
+
+
+def key_field_for(document):
+    """Return the path segment field for a document name."""
+    if document.startswith('sd_negeri_'):
+        return SCHOOL_KEY_FIELD
+    return KEY_FIELDS.get(document, DEFAULT_KEY_FIELD)
+
+
+def dump_document(data):
+    """Serialize a document the way the repo's scripts write it."""
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def _sha(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _is_unit(item, key_field):
+    return isinstance(item, dict) and isinstance(item.get(key_field), str)
+
+
+def split_records(data, key_field=DEFAULT_KEY_FIELD):
+    """
+    Split a document into content-addressed records.
+
+    A unit is a dictionary with a string key_field inside the root list or
+    a 'children' list. Its record holds its fields in order, with the
+    'children' list replaced by the hashes of the child records; anything
+    that is not a unit is kept inline as {'value': item}. The root list gets
+    a record of its own.
+
+    Args:
+        data: Parsed document
+        key_field: Field marking units
+
+    Returns:
+        (root hash, dictionary of hash -> record, number of units)
+    """
+    records = {}
+    units = 0
+
+    def add(record):
+        digest = _sha(json.dumps(record, ensure_ascii=False, separators=(',', ':')))[:HASH_LENGTH]
+        records[digest] = record
+        return digest
+
+    if not isinstance(data, list):
+        return add({'value': data}), records, units
+
+    # Post-order: a record is hashed after all of its children.
+    # Each frame: (iterator over items, hashes so far, unit or None for the root)
+    exhausted = object()
+    stack = [(iter(data), [], None)]
+    while stack:
+        items, entries, unit = stack[-1]
+        item = next(items, exhausted)
+        if item is exhausted:
+            stack.pop()
+            if unit is None:
+                digest = add({'children': entries})
+                if not stack:
+                    return digest, records, units
+            else:
+                digest = add(_unit_record(unit, entries))
+            stack[-1][1].append(digest)
+            continue
+
+        if not _is_unit(item, key_field):
+            entries.append({'value': item})
+            continue
+        units += 1
+        if isinstance(item.get('children'), list):
+            stack.append((iter(item['children']), [], item))
+        else:
+            stack[-1][1].append(add(_unit_record(item, None)))
+
+
+def _unit_record(unit, children):
+    fields = []
+    record = {'fields': fields}
+    for field, value in unit.items():
+        if field == 'children' and children is not None:
+            record['children_at'] = len(fields)
+            record['children'] = children
+        else:
+            fields.append([field, value])
+    return record
+
+
+def join_records(root, records):
+    """
+    Rebuild a document from its root hash and records.
+
+    Args:
+        root: Root record hash
+        records: Mapping of hash -> record
+
+    Returns:
+        Parsed document
+    """
+    record = records[root]
+    if 'value' in record:
+        return record['value']
+
+    data = []
+    # Each frame: (record, list to fill)
+    stack = [(record, data)]
+    while stack:
+        record, items = stack.pop()
+        for entry in record['children']:
+            if isinstance(entry, dict):
+                items.append(entry['value'])
+                continue
+            child = records[entry]
+            unit = {}
+            children_at = child.get('children_at')
+            for i, (field, value) in enumerate(child['fields']):
+                if i == children_at:
+                    unit['children'] = []
+                unit[field] = value
+            if children_at is not None:
+                if children_at == len(child['fields']):
+                    unit['children'] = []
+                stack.append((child, unit['children']))
+            items.append(unit)
+    return data
+
+
+def _keyed_children(record, get, key_field):
+    """Map path segment -> child hash for a record's unit children."""
+    result = {}
+    for entry in record.get('children', ()):
+        if isinstance(entry, dict):
+            continue
+        name = dict(get(entry)['fields'])[key_field]
+        segment = name
+        suffix = 1
+        while segment in result:
+            suffix += 1
+            segment = f"{name}#{suffix}"
+        result[segment] = entry
+    return result
+
+
+def diff_records(old_root, new_root, get, key_field=DEFAULT_KEY_FIELD):
+    """
+    Structural diff between two stored trees.
+
+    Subtrees with equal hashes are skipped, so the cost depends on the size
+    of the change.
+
+    Args:
+        old_root: Root hash of the old tree (None for an empty store)
+        new_root: Root hash of the new tree
+        get: Function hash -> record
+        key_field: Path segment field
+
+    Returns:
+        Dictionary with 'added', 'changed' and 'removed' lists of paths
+        (each path a list of segments). A unit counts as changed when its
+        own fields or the order of its children changed.
+    """
+    diff = {'added': [], 'changed': [], 'removed': []}
+
+    def collect(kind, root, path):
+        # Every unit of a subtree that is only on one side
+        stack = [(root, path)]
+        while stack:
+            digest, unit_path = stack.pop()
+            diff[kind].append(unit_path)
+            for segment, child in _keyed_children(get(digest), get, key_field).items():
+                stack.append((child, unit_path + [segment]))
+
+    if old_root is None:
+        for segment, child in _keyed_children(get(new_root), get, key_field).items():
+            collect('added', child, [segment])
+        return diff
+
+    stack = [(old_root, new_root, [])]
+    while stack:
+        old, new, path = stack.pop()
+        if old == new:
+            continue
+        old_record, new_record = get(old), get(new)
+        old_children = _keyed_children(old_record, get, key_field)
+        new_children = _keyed_children(new_record, get, key_field)
+
+        if path and (old_record['fields'] != new_record['fields']
+                     or list(old_children) != list(new_children)
+                     or old_record.get('children_at') != new_record.get('children_at')):
+            diff['changed'].append(path)
+        for segment, child in new_children.items():
+            if segment in old_children:
+                stack.append((old_children[segment], child, path + [segment]))
+            else:
+                collect('added', child, path + [segment])
+        for segment, child in old_children.items():
+            if segment not in new_children:
+                collect('removed', child, path + [segment])
+
+    for paths in diff.values():
+        paths.sort()
+    return diff
+
+
+class HierarchyStore:
+    """
+    Version store for one JSON document.
+
+    Args:
+        document: Document name (e.g. 'hierarchy.json'); selects the store directory
+        root: Directory holding STORE_DIR (default: this script's directory)
+        key_field: Path segment field (default: chosen from the document name)
+    """
+
+    def __init__(self, document, root=None, key_field=None):
+        self.document = document
+        self.key_field = key_field or key_field_for(document)
+        base = Path(root) if root is not None else Path(__file__).parent
+        self.path = base / STORE_DIR / document
+        self.versions_dir = self.path / 'versions'
+        self.index_file = self.path / 'objects.idx'
+        self._index = None
+        self._objects = {}
+
+    def _version_file(self, version_id):
+        return self.versions_dir / f"{version_id:06d}.json.gz"
+
+    def version_ids(self):
+        """Return the ids of all saved versions, oldest first."""
+        if not self.versions_dir.exists():
+            return []
+        return sorted(int(path.name.split('.')[0]) for path in self.versions_dir.glob('*.json.gz'))
+
+    def read_version(self, version_id):
+        """Return a version's stored record."""
+        try:
+            with gzip.open(self._version_file(version_id), 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise StoreError(f"No version {version_id} of {self.document}") from None
+
+    def versions(self):
+        """Return the metadata of every version (without its diff and records)."""
+        result = []
+        for version_id in self.version_ids():
+            version = self.read_version(version_id)
+            result.append({
+                key: version[key]
+                for key in ('id', 'parent', 'time', 'label', 'sha', 'root', 'units', 'stats')
+            })
+        return result
+
+    def _object_index(self):
+        if self._index is None:
+            self._index = {}
+            if self.index_file.exists():
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        digest, version_id = line.split()
+                        self._index.setdefault(digest, int(version_id))
+        return self._index
+
+    def get_record(self, digest):
+        """Return a stored record by hash."""
+        record = self._objects.get(digest)
+        if record is None:
+            holder = self._object_index().get(digest)
+            if holder is None:
+                raise StoreError(f"Record {digest} is missing from the store")
+            # Cache every record of the holding version; neighbours are likely needed too
+            self._objects.update(self.read_version(holder)['objects'])
+            record = self._objects[digest]
+        return record
+
+    def load(self, version_id):
+        """
+        Rebuild a saved version.
+
+        Args:
+            version_id: Version id
+
+        Returns:
+            Parsed document
+
+        Raises:
+            StoreError: If the version is missing or does not rebuild to its hash
+        """
+        version = self.read_version(version_id)
+
+        # Fetch the records reachable from the root
+        records = {}
+        stack = [version['root']]
+        while stack:
+            digest = stack.pop()
+            if digest in records:
+                continue
+            record = records[digest] = self.get_record(digest)
+            stack.extend(entry for entry in record.get('children', ()) if not isinstance(entry, dict))
+
+        data = join_records(version['root'], records)
+        if _sha(dump_document(data)) != version['sha']:
+            raise StoreError(f"Version {version_id} of {self.document} does not match its hash")
+        return data
+
+    def save(self, data, label=None):
+        """
+        Save a document as a new version if it differs from the latest one.
+
+        Args:
+            data: Parsed document
+            label: Optional label (e.g. 'nightly')
+
+        Returns:
+            (version id, True if a new version was written)
+        """
+        sha = _sha(dump_document(data))
+        version_ids = self.version_ids()
+        parent = self.read_version(version_ids[-1]) if version_ids else None
+        if parent is not None and parent['sha'] == sha:
+            return parent['id'], False
+
+        root, records, units = split_records(data, self.key_field)
+        index = self._object_index()
+        objects = {digest: record for digest, record in records.items() if digest not in index}
+
+        def get(digest):
+            return records[digest] if digest in records else self.get_record(digest)
+
+        diff = diff_records(parent['root'] if parent else None, root, get, self.key_field)
+
+        version_id = parent['id'] + 1 if parent else 1
+        version = {
+            'id': version_id,
+            'parent': parent['id'] if parent else None,
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'label': label,
+            'sha': sha,
+            'root': root,
+            'units': units,
+            'stats': {kind: len(paths) for kind, paths in diff.items()},
+        }
+        version.update(diff)
+        version['objects'] = objects
+
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        version_file = self._version_file(version_id)
+        temp_file = f"{version_file}.tmp"
+        with gzip.open(temp_file, 'wt', encoding='utf-8') as f:
+            json.dump(version, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, version_file)
+        # Index records only once their version file is in place
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            f.writelines(f"{digest} {version_id}\n" for digest in objects)
+        for digest in objects:
+            index[digest] = version_id
+        self._objects.update(objects)
+        return version_id, True
+
+    def save_file(self, json_file, label=None):
+        """Save the current contents of a JSON file. See save()."""
+        return self.save(load_json(json_file), label)
+
+    def restore(self, version_id, output_file):
+        """
+        Write a saved version to a file (atomically).
+
+        Args:
+            version_id: Version id
+            output_file: Path to write
+        """
+        content = dump_document(self.load(version_id))
+        temp_file = f"{output_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_file, output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Save and restore versions of hierarchy.json as structural diffs'
+    )
+    parser.add_argument(
+        'command',
+        choices=['save', 'list', 'show', 'restore'],
+        help='save the file, list versions, show a version\'s changes, or restore a version'
+    )
+    parser.add_argument(
+        'version',
+        type=int,
+        nargs='?',
+        help='Version id (show, restore)'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='JSON file to save (default: hierarchy.json)'
+    )
+    parser.add_argument(
+        '--document',
+        type=str,
+        help='Store the file under this document name (default: the file name)'
+    )
+    parser.add_argument(
+        '--label',
+        type=str,
+        help='Label for a saved version'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        help='File to restore into (default: --file)'
+    )
+
+    args = parser.parse_args()
+    store = HierarchyStore(args.document or Path(args.file).name)
+
+    try:
+        if args.command == 'save':
+            if not Path(args.file).exists():
+                print(f"Error: {args.file} not found!")
+                sys.exit(1)
+            version_id, created = store.save_file(args.file, args.label)
+            if created:
+                stats = store.read_version(version_id)['stats']
+                print(f"Saved version {version_id} of {store.document}: "
+                      f"{stats['added']} added, {stats['changed']} changed, {stats['removed']} removed")
+            else:
+                print(f"Unchanged since version {version_id}")
+        elif args.command == 'list':
+            for version in store.versions():
+                stats = version['stats']
+                print(f"{version['id']:>6}  {version['time']}  {version['units']:>6} units  "
+                      f"+{stats['added']} ~{stats['changed']} -{stats['removed']}"
+                      f"{'  ' + version['label'] if version['label'] else ''}")
+        elif args.version is None:
+            parser.error(f"{args.command} needs a version id")
+        elif args.command == 'show':
+            version = store.read_version(args.version)
+            for title, keys in [("Added", version['added']), ("Changed", version['changed']),
+                                ("Removed", version['removed'])]:
+                print(f"{title} ({len(keys)}):")
+                for path in keys:
+                    print(f"   {' / '.join(path)}")
+        else:
+            output_file = args.output or args.file
+            store.restore(args.version, output_file)
+            print(f"Restored version {args.version} of {store.document} to {output_file}")
+    except (StoreError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Declarative rule tables for jabatan, kode_jabatan and simplified jabatan.
+
+The naming rules used by add_jabatan_field.py and export_to_xlsx.py are
+written here as ordered tables. Each rule lists its conditions (prefix,
+substring or exact-name tests, optionally limited to some eselon levels) and
+the result template. The first matching rule wins.
+
+Every table is compiled once into a RuleTable:
+- all substring conditions of a field go into one combined regex, so a text
+  is scanned once no matter how many keywords the table has
+- prefix conditions go into a character trie walked from the start of the text
+- rules are pre-grouped per eselon, so only the relevant ones are checked
+
+Classification results are cached per input, e.g. per (name, eselon).
+
+Usage:
+    from jabatan_rules import determine_jabatan, generate_kode_jabatan, simplify_jabatan
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+
+# A single rule. The rule matches when at least one of any_of holds (or any_of
+# is empty), all of all_of hold and none of none_of holds. eselon limits the
+# rule to the given levels (None = every level).
+Rule = namedtuple('Rule', ['result', 'any_of', 'all_of', 'none_of', 'eselon'])
+Rule.__new__.__defaults__ = ((), (), (), None)
+
+# Size of the per-table result caches
+CACHE_SIZE = 65536
+
+
+def prefix(value, field='name'):
+    """Condition: field starts with value (case-sensitive)."""
+    return (field, 'prefix', value)
+
+
+def iprefix(value, field='name'):
+    """Condition: lowercased field starts with value."""
+    return (field, 'iprefix', value.lower())
+
+
+def contains(value, field='name'):
+    """Condition: lowercased field contains value."""
+    return (field, 'contains', value.lower())
+
+
+def equals(value, field='name'):
+    """Condition: field is exactly value."""
+    return (field, 'equals', value)
+
+
+ESELON_TOP = ("II.a", "II.b", "I")
+ESELON_MID = ("III.a", "III.b")
+ESELON_LOW = ("IV.a", "IV.b")
+
+
+# Rules for add_jabatan_field.determine_jabatan, in priority order.
+# Templates may use {name} (unit name) and {rest} (unit name without the
+# rule's matched prefix).
+JABATAN_RULES = [
+    # Top-level organization titles (Eselon II.b and higher)
+    Rule("Sekretaris Daerah", [contains("sekretariat daerah")], eselon=ESELON_TOP),
+    Rule("Sekretaris DPRD", [contains("sekretariat dprd")], eselon=ESELON_TOP),
+    Rule("Kepala Pelaksana BPBD",
+         [contains("badan penanggulangan bencana daerah"), contains("bpbd")], eselon=ESELON_TOP),
+    Rule("Kepala {name}", [prefix("Badan ")], eselon=ESELON_TOP),
+    Rule("Kepala {name}", [prefix("Dinas "), prefix("DINAS ")], eselon=ESELON_TOP),
+    Rule("Inspektur Daerah", [contains("inspektorat")], eselon=ESELON_TOP),
+    Rule("Kepala Satpol PP",
+         [contains("satpol pp"), contains("satuan polisi pamong praja")], eselon=ESELON_TOP),
+    Rule("Camat", [prefix("Kecamatan ")], eselon=ESELON_TOP),
+    Rule("Direktur RSUD", [contains("rsud"), contains("rumah sakit umum daerah")], eselon=ESELON_TOP),
+    Rule("Asisten Sekretaris Daerah", [prefix("Asisten ")], eselon=ESELON_TOP),
+
+    # Eselon III (mid-level)
+    Rule("Camat", [prefix("Kecamatan ")], eselon=ESELON_MID),
+    # "Sekretariat Badan X" -> "Sekretaris Badan X" (not "Sekretaris Sekretariat Badan X")
+    Rule("Sekretaris {rest}", [prefix("Sekretariat ")],
+         none_of=[equals("Sekretariat Daerah")], eselon=ESELON_MID),
+    Rule("Kepala {name}", [prefix("Bagian ")], eselon=ESELON_MID),
+    Rule("Kepala {name}", [prefix("Bidang ")], eselon=ESELON_MID),
+    Rule("Kepala {name}", [contains("klinik")], eselon=ESELON_MID),
+    Rule("Direktur {name}", [contains("rsud"), contains("rumah sakit")], eselon=ESELON_MID),
+    Rule("Kepala {name}", [contains("puskesmas")], eselon=ESELON_MID),
+    Rule("Kepala {name}", [contains("laboratorium")], eselon=ESELON_MID),
+    Rule("Kepala {name}", [contains("kantor")], eselon=ESELON_MID),
+    Rule("Lurah {name}", [contains("kelurahan")], eselon=ESELON_MID),
+
+    # Eselon IV (lower level)
+    Rule("Kepala {name}", [prefix("Subbagian "), prefix("Sub Bagian ")], eselon=ESELON_LOW),
+    Rule("Kepala {name}", [prefix("Subbidang "), prefix("Sub Bidang ")], eselon=ESELON_LOW),
+    Rule("Kepala {name}", [prefix("Seksi ")], eselon=ESELON_LOW),
+    Rule("Kepala {name}", [contains("desa"), prefix("Desa ")], eselon=ESELON_LOW),
+
+    # Default fallback based on organizational hierarchy
+    Rule("Pimpinan", eselon=("I",)),
+    Rule("Kepala", eselon=("II.a", "II.b")),
+    Rule("Kepala", eselon=ESELON_MID),
+    Rule("Kepala", eselon=ESELON_LOW),
+]
+
+# If no eselon rule applies, return generic title
+JABATAN_DEFAULT = "Pejabat"
+
+
+def _jabatan(value):
+    return contains(value, field='jabatan')
+
+
+def _unit(value):
+    return contains(value, field='unit')
+
+
+# Rules for export_to_xlsx.generate_kode_jabatan, in priority order
+KODE_JABATAN_RULES = [
+    Rule("SEKDA", [_jabatan("sekretaris daerah")]),
+    Rule("SEKDPRD", [_jabatan("sekretaris dprd")]),
+    Rule("KAPEL_BPBD", [_jabatan("kepala pelaksana bpbd")]),
+
+    # Kepala Badan
+    Rule("KABKP", [_jabatan("kepala badan")], all_of=[_unit("kepegawaian")]),
+    Rule("KABKAD", [_jabatan("kepala badan")], all_of=[_unit("keuangan")]),
+    Rule("KABPBD", [_unit("penanggulangan bencana"), _unit("bpbd")],
+         all_of=[_jabatan("kepala badan")]),
+    Rule("KABKESBANGPOL", [_jabatan("kepala badan")], all_of=[_unit("kesatuan bangsa")]),
+    Rule("KABAPENDA", [_jabatan("kepala badan")], all_of=[_unit("pendapatan")]),
+    Rule("KABAPPEDA", [_jabatan("kepala badan")], all_of=[_unit("perencanaan")]),
+    Rule("KABADAN", [_jabatan("kepala badan")]),
+
+    # Kepala Dinas
+    Rule("KADIS_DIKDAS", [_jabatan("kepala dinas")], all_of=[_unit("pendidikan")]),
+    Rule("KADIS_KES", [_jabatan("kepala dinas")], all_of=[_unit("kesehatan")]),
+    Rule("KADIS_PUPR", [_unit("pekerjaan umum"), _unit("perumahan")],
+         all_of=[_jabatan("kepala dinas")]),
+    Rule("KADIS_SOSIAL", [_jabatan("kepala dinas")], all_of=[_unit("sosial")]),
+    Rule("KADIS_LH", [_jabatan("kepala dinas")], all_of=[_unit("lingkungan")]),
+    Rule("KADIS", [_jabatan("kepala dinas")]),
+
+    # Kepala Bagian
+    Rule("KB_UMUM_PROT", [_jabatan("kepala bagian")], all_of=[_unit("umum"), _unit("protokol")]),
+    Rule("KB_UMUM", [_jabatan("kepala bagian")], all_of=[_unit("umum")]),
+    Rule("KB_KEUANGAN", [_jabatan("kepala bagian")], all_of=[_unit("keuangan")]),
+    Rule("KABAG", [_jabatan("kepala bagian")]),
+
+    # Kepala Bidang
+    Rule("KABID_DIKDAS", [_jabatan("kepala bidang")], all_of=[_unit("pendidikan dasar")]),
+    Rule("KABID", [_jabatan("kepala bidang")]),
+
+    # Kepala Subbagian
+    Rule("KASUBAG_KEU", [_jabatan("kepala subbagian"), _jabatan("kepala sub bagian")],
+         all_of=[_unit("keuangan")]),
+    Rule("KASUBAG_UMUM", [_jabatan("kepala subbagian"), _jabatan("kepala sub bagian")],
+         all_of=[_unit("umum")]),
+    Rule("KASUBAG", [_jabatan("kepala subbagian"), _jabatan("kepala sub bagian")]),
+
+    # Sekretaris (for agencies/organizations)
+    Rule("SEKRET", [_jabatan("sekretaris")], none_of=[_jabatan("sekretaris daerah")]),
+    Rule("INSPEKTUR", [_jabatan("inspektur")]),
+    Rule("CAMAT", [_jabatan("camat")]),
+]
+
+KODE_JABATAN_DEFAULT = "KODE"
+
+
+# Rules for export_to_xlsx.simplify_jabatan: drop unit-specific names
+SIMPLIFY_JABATAN_RULES = [
+    Rule("Kepala Badan", [iprefix("kepala badan ", field='jabatan')]),
+    Rule("Sekretaris Badan", [iprefix("sekretaris badan ", field='jabatan')]),
+    Rule("Kepala Dinas", [iprefix("kepala dinas ", field='jabatan')]),
+    Rule("Sekretaris Dinas", [iprefix("sekretaris dinas ", field='jabatan')]),
+    Rule("Direktur", [iprefix("direktur ", field='jabatan')]),
+]
+
+# Other titles (e.g. "Kepala UPKP", "Kepala UPTD") are returned as is
+SIMPLIFY_JABATAN_DEFAULT = "{jabatan}"
+
+
+class KeywordScanner:
+    """
+    Finds every condition on one field that holds for a text, in one pass.
+
+    Substring conditions are compiled into a single lookahead regex so that
+    overlapping keywords are all found; prefix conditions are stored in a
+    character trie.
+    """
+
+    def __init__(self, conditions):
+        self._contains = {}
+        self._prefix_trie = {}
+        self._iprefix_trie = {}
+        self._equals = {}
+
+        keywords = set()
+        for condition in conditions:
+            _, kind, value = condition
+            if kind == 'contains':
+                keywords.add(value)
+            elif kind == 'prefix':
+                self._add_prefix(self._prefix_trie, value, condition)
+            elif kind == 'iprefix':
+                self._add_prefix(self._iprefix_trie, value, condition)
+            elif kind == 'equals':
+                self._equals[value] = condition
+            else:
+                raise ValueError(f"Unknown condition kind: {kind}")
+
+        # At any position the regex reports only the longest keyword, so each
+        # keyword also implies the shorter keywords it starts with.
+        field = conditions[0][0] if conditions else ''
+        for keyword in keywords:
+            self._contains[keyword] = tuple(
+                (field, 'contains', other) for other in keywords if keyword.startswith(other)
+            )
+
+        if keywords:
+            alternatives = '|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+            self._regex = re.compile(f"(?=({alternatives}))")
+        else:
+            self._regex = None
+        self._needs_lower = bool(keywords or self._iprefix_trie)
+
+    @staticmethod
+    def _add_prefix(trie, value, condition):
+        node = trie
+        for char in value:
+            node = node.setdefault(char, {})
+        node[None] = condition
+
+    @staticmethod
+    def _walk_prefix(trie, text, found):
+        node = trie
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return
+            if None in node:
+                found.add(node[None])
+
+    def scan(self, text):
+        """
+        Return the set of conditions that hold for text.
+
+        Args:
+            text: Field value
+
+        Returns:
+            Set of condition tuples
+        """
+        found = set()
+        if self._prefix_trie:
+            self._walk_prefix(self._prefix_trie, text, found)
+        if text in self._equals:
+            found.add(self._equals[text])
+        if self._needs_lower:
+            text_lower = text.lower()
+            if self._iprefix_trie:
+                self._walk_prefix(self._iprefix_trie, text_lower, found)
+            if self._regex is not None:
+                for match in self._regex.finditer(text_lower):
+                    found.update(self._contains[match.group(1)])
+        return found
+
+
+class RuleTable:
+    """
+    An ordered rule table compiled for fast classification.
+
+    Args:
+        rules: List of Rule in priority order
+        default: Result template used when no rule matches
+    """
+
+    def __init__(self, rules, default):
+        self.rules = list(rules)
+        self.default = default
+
+        conditions_by_field = {}
+        for rule in self.rules:
+            for condition in (*rule.any_of, *rule.all_of, *rule.none_of):
+                conditions_by_field.setdefault(condition[0], []).append(condition)
+        self._scanners = {
+            field: KeywordScanner(conditions) for field, conditions in conditions_by_field.items()
+        }
+
+        compiled = []
+        for rule in self.rules:
+            # {rest} is the text left after the rule's first prefix condition
+            rest_prefix = next((c for c in rule.any_of if c[1] == 'prefix'), None)
+            compiled.append((
+                frozenset(rule.any_of),
+                tuple(rule.all_of),
+                tuple(rule.none_of),
+                rule.result,
+                rest_prefix,
+                rule.eselon,
+            ))
+
+        # Pre-group rules per eselon, keeping priority order
+        levels = {level for rule in self.rules if rule.eselon for level in rule.eselon}
+        self._generic = tuple(c[:5] for c in compiled if c[5] is None)
+        self._by_eselon = {
+            level: tuple(c[:5] for c in compiled if c[5] is None or level in c[5])
+            for level in levels
+        }
+
+    def classify(self, eselon=None, **fields):
+        """
+        Return the formatted result of the first matching rule.
+
+        Args:
+            eselon: Echelon level used to select rules
+            **fields: Field values, e.g. name=..., jabatan=..., unit=...
+
+        Returns:
+            Result string
+        """
+        try:
+            rules = self._by_eselon.get(eselon, self._generic)
+        except TypeError:
+            rules = self._generic
+
+        found = set()
+        for field, scanner in self._scanners.items():
+            found |= scanner.scan(fields.get(field) or '')
+
+        for any_of, all_of, none_of, result, rest_prefix in rules:
+            if any_of and found.isdisjoint(any_of):
+                continue
+            if any(c not in found for c in all_of):
+                continue
+            if any(c in found for c in none_of):
+                continue
+            return self._format(result, fields, rest_prefix, found)
+        return self._format(self.default, fields, None, found)
+
+    @staticmethod
+    def _format(template, fields, rest_prefix, found):
+        if '{' not in template:
+            return template
+        rest = ''
+        if rest_prefix is not None and rest_prefix in found:
+            rest = fields[rest_prefix[0]][len(rest_prefix[2]):]
+        return template.format(rest=rest, **fields)
+
+
+JABATAN_TABLE = RuleTable(JABATAN_RULES, JABATAN_DEFAULT)
+KODE_JABATAN_TABLE = RuleTable(KODE_JABATAN_RULES, KODE_JABATAN_DEFAULT)
+SIMPLIFY_JABATAN_TABLE = RuleTable(SIMPLIFY_JABATAN_RULES, SIMPLIFY_JABATAN_DEFAULT)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def determine_jabatan(name, eselon):
+    """
+    Determine the jabatan (position title) for a unit.
+
+    Args:
+        name: Organization/unit name
+        eselon: Echelon level
+
+    Returns:
+        Jabatan title
+    """
+    return JABATAN_TABLE.classify(eselon, name=name)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def generate_kode_jabatan(jabatan, unit_name):
+    """
+    Generate the position code (kode_jabatan) for a jabatan and unit name.
+
+    Args:
+        jabatan: Position title
+        unit_name: Unit name
+
+    Returns:
+        Position code string
+    """
+    return KODE_JABATAN_TABLE.classify(jabatan=jabatan, unit=unit_name)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def simplify_jabatan(jabatan):
+    """
+    Simplify a jabatan by removing unit-specific names.
+
+    Args:
+        jabatan: Full position title
+
+    Returns:
+        Simplified position title
+    """
+    if not jabatan:
+        return jabatan
+    return SIMPLIFY_JABATAN_TABLE.classify(jabatan=jabatan)
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON reading for hierarchy.json and the sd_negeri files.
+
+The file is read in chunks and parsed as it arrives, so memory is bounded
+by the nesting depth (plus one array item) instead of the document size:
+- iter_events() yields low-level parse events (start_map, map_key, value, ...)
+- iter_nodes() walks a name/jabatan/eselon/children tree and yields each
+  unit's own fields in pre-order, together with its depth
+- iter_items() yields the elements of a top-level array one at a time
+
+Scalar values and array items are decoded by the C json decoder on the
+buffered text; only the container structure is walked in Python.
+
+load_json() parses a whole file with orjson or msgspec when one of them is
+installed (falling back to json). With backend='auto' the readers above use
+it for files up to STREAM_THRESHOLD bytes, which is faster than streaming
+for files that comfortably fit in memory, and stream anything larger.
+
+Usage:
+    from json_stream import iter_nodes, iter_items, load_json
+
+    for depth, unit in iter_nodes("hierarchy.json"):
+        print("  " * depth + unit["name"])
+"""
+
+import io
+import json
+import os
+import re
+from itertools import chain
+from json.decoder import JSONDecoder, JSONDecodeError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# Characters read from the file per refill
+CHUNK_SIZE = 64 * 1024
+
+# With backend='auto', files up to this size are parsed in one go
+STREAM_THRESHOLD = 8 * 1024 * 1024
+
+if orjson is not None:
+    FAST_BACKEND = 'orjson'
+elif msgspec is not None:
+    FAST_BACKEND = 'msgspec'
+else:
+    FAST_BACKEND = 'json'
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = JSONDecoder()
+
+
+class JsonStreamError(ValueError):
+    """Raised for malformed JSON found while streaming."""
+
+
+class KeyOrderError(ValueError):
+    """Raised by iter_nodes(strict_order=True) for a unit field after its children list."""
+
+
+def load_json(source):
+    """
+    Parse a whole JSON document with the fastest available backend.
+
+    Args:
+        source: Path or binary/text file object
+
+    Returns:
+        Parsed document
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            data = f.read()
+    else:
+        data = source.read()
+
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def _use_fast_backend(source, backend):
+    if backend == 'load':
+        return True
+    if backend == 'stream':
+        return False
+    if backend != 'auto':
+        raise ValueError(f"Unknown backend: {backend}")
+    if not isinstance(source, (str, os.PathLike)):
+        return False
+    try:
+        return os.path.getsize(source) <= STREAM_THRESHOLD
+    except OSError:
+        return False
+
+
+class _Reader:
+    """Text buffer over a file that is refilled as parsing advances."""
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read more text, dropping what was consumed. Returns False at end of file."""
+        if self.eof:
+            return False
+        # Grow the read with the pending text so long values need few retries
+        chunk = self.fp.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, message):
+        return JsonStreamError(f"{message} (char {self.offset + self.pos})")
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def decode(self):
+        """Decode the complete value at the current position with the C decoder."""
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except JSONDecodeError as e:
+                # Cut off by the end of the buffer rather than malformed?
+                truncated = e.pos >= len(self.buf) - 8 or e.msg.startswith('Unterminated')
+                if truncated and self.fill():
+                    continue
+                self.offset += self.pos
+                raise JsonStreamError(f"{e.msg} (char {self.offset - self.pos + e.pos})") from None
+            # A number ending at the buffer end may continue in the next chunk
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _open_text(source):
+    """Return (text file, should_close) for a path or file object."""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'r', encoding='utf-8'), True
+    if isinstance(source, io.TextIOBase):
+        return source, False
+    return io.TextIOWrapper(source, encoding='utf-8'), False
+
+
+def iter_events(source, chunk_size=CHUNK_SIZE):
+    """
+    Yield parse events for a JSON document.
+
+    Events are (event, value) pairs: ('start_map', None), ('map_key', key),
+    ('end_map', None), ('start_array', None), ('end_array', None) and
+    ('value', scalar).
+
+    Args:
+        source: Path or file object
+        chunk_size: Characters read per refill
+
+    Yields:
+        (event, value) tuples
+
+    Raises:
+        JsonStreamError: On malformed JSON
+    """
+    fp, should_close = _open_text(source)
+    try:
+        yield from _events(_Reader(fp, chunk_size))
+    finally:
+        if should_close:
+            fp.close()
+
+
+def _events(reader):
+    # Open containers: True for objects, False for arrays
+    stack = []
+    char = reader.peek()
+    if not char:
+        raise reader.error("Expecting value")
+
+    while True:
+        # A value is expected at the current position
+        if char == '{':
+            reader.pos += 1
+            yield 'start_map', None
+            if reader.peek() == '}':
+                reader.pos += 1
+                yield 'end_map', None
+            else:
+                stack.append(True)
+                yield 'map_key', _read_key(reader)
+                char = reader.peek()
+                continue
+        elif char == '[':
+            reader.pos += 1
+            yield 'start_array', None
+            char = reader.peek()
+            if char == ']':
+                reader.pos += 1
+                yield 'end_array', None
+            else:
+                stack.append(False)
+                continue
+        elif char:
+            yield 'value', reader.decode()
+        else:
+            raise reader.error("Expecting value")
+
+        # After a value: separator or end of the enclosing containers
+        while True:
+            char = reader.peek()
+            if not stack:
+                if char:
+                    raise reader.error("Extra data")
+                return
+            if char == ',':
+                reader.pos += 1
+                if stack[-1]:
+                    yield 'map_key', _read_key(reader)
+                char = reader.peek()
+                break
+            if char == ('}' if stack[-1] else ']'):
+                reader.pos += 1
+                yield ('end_map' if stack.pop() else 'end_array'), None
+                continue
+            raise reader.error("Expecting ',' delimiter")
+
+
+def _read_key(reader):
+    if reader.peek() != '"':
+        raise reader.error("Expecting property name enclosed in double quotes")
+    key = reader.decode()
+    reader.expect(':')
+    return key
+
+
+def _build(event, value, events):
+    """Build the value that starts with (event, value) from the remaining events."""
+    if event == 'value':
+        return value
+    if event == 'start_map':
+        obj = {}
+        for event, key in events:
+            if event == 'end_map':
+                return obj
+            obj[key] = _build(*next(events), events)
+    # start_array
+    items = []
+    for event, value in events:
+        if event == 'end_array':
+            return items
+        items.append(_build(event, value, events))
+    return items
+
+
+def iter_items(source, backend='auto', chunk_size=CHUNK_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Args:
+        source: Path or file object
+        backend: 'stream', 'load' (parse whole file with load_json) or 'auto'
+        chunk_size: Characters read per refill when streaming
+
+    Yields:
+        Array elements
+
+    Raises:
+        TypeError: If the document is not an array
+        ValueError: On malformed JSON
+    """
+    if _use_fast_backend(source, backend):
+        data = load_json(source)
+        if not isinstance(data, list):
+            raise TypeError("JSON root must be an array")
+        yield from data
+        return
+
+    fp, should_close = _open_text(source)
+    try:
+        reader = _Reader(fp, chunk_size)
+        char = reader.peek()
+        if char != '[':
+            if not char:
+                raise reader.error("Expecting value")
+            reader.decode()
+            raise TypeError("JSON root must be an array")
+        reader.pos += 1
+
+        if reader.peek() == ']':
+            reader.pos += 1
+        else:
+            while True:
+                reader.peek()
+                yield reader.decode()
+                char = reader.peek()
+                reader.pos += 1
+                if char == ']':
+                    break
+                if char != ',':
+                    reader.pos -= 1
+                    raise reader.error("Expecting ',' delimiter")
+
+        if reader.peek():
+            raise reader.error("Extra data")
+    finally:
+        if should_close:
+            fp.close()
+
+
+def iter_nodes(source, children_key='children', backend='auto', chunk_size=CHUNK_SIZE,
+               strict_order=False, root_unit=True):
+    """
+    Walk a hierarchy document and yield each unit as soon as its fields are read.
+
+    The document is a list of units (or, with root_unit, a single unit);
+    each unit is an object whose children_key holds a list of child units.
+    Units are yielded in pre-order with their depth (0 for top-level units),
+    as dictionaries of their own fields without children_key. Non-object
+    entries in child lists are skipped.
+
+    When streaming, a unit is yielded when its children list starts, so
+    fields written after the children list are added to the same dictionary
+    only later. Consumers that use a unit right away pass strict_order=True
+    and re-read the file with backend='load' on KeyOrderError. Files written
+    by these scripts keep the children list last.
+
+    Args:
+        source: Path or file object
+        children_key: Key holding child units
+        backend: 'stream', 'load' (parse whole file with load_json) or 'auto'
+        chunk_size: Characters read per refill when streaming
+        strict_order: Raise KeyOrderError when a field follows the children list
+        root_unit: Accept an object as the document root; when False such a
+            document yields nothing, like a document that is not a list
+
+    Yields:
+        (depth, unit dictionary) tuples
+
+    Raises:
+        ValueError: On malformed JSON
+        KeyOrderError: With strict_order, on a field after a children list
+    """
+    if _use_fast_backend(source, backend):
+        yield from _walk_nodes(load_json(source), children_key, root_unit)
+        return
+
+    events = iter_events(source, chunk_size)
+    first = next(events, None)
+    if first is None or first[0] == 'value' or (first[0] == 'start_map' and not root_unit):
+        return
+    if first[0] == 'start_map':
+        # A single top-level unit
+        events = chain([first], events)
+
+    # Units whose children list is open; fields after the list go here
+    open_units = []
+    for event, value in events:
+        if event == 'start_map':
+            unit = {}
+            depth = len(open_units)
+            for event, key in events:
+                if event == 'end_map':
+                    yield depth, unit
+                    break
+                event, value = next(events)
+                if key == children_key and event == 'start_array':
+                    yield depth, unit
+                    open_units.append(unit)
+                    break
+                unit[key] = _build(event, value, events)
+        elif event == 'end_array' and open_units:
+            # Children list closed: finish the parent's remaining fields
+            unit = open_units.pop()
+            for event, key in events:
+                if event == 'end_map':
+                    break
+                if strict_order:
+                    raise KeyOrderError(f"field '{key}' follows the {children_key} list of a unit")
+                unit[key] = _build(*next(events), events)
+        elif event in ('value', 'start_array'):
+            # Scalar or nested list inside a list of units: not a unit
+            _build(event, value, events)
+
+
+def _walk_nodes(data, children_key, root_unit=True):
+    """iter_nodes over an already parsed document."""
+    if isinstance(data, dict) and root_unit:
+        data = [data]
+    elif not isinstance(data, list):
+        return
+
+    exhausted = object()
+    stack = [iter(data)]
+    while stack:
+        item = next(stack[-1], exhausted)
+        if item is exhausted:
+            stack.pop()
+            continue
+        if not isinstance(item, dict):
+            continue
+
+        children = item.get(children_key)
+        if isinstance(children, list):
+            yield len(stack) - 1, {key: value for key, value in item.items() if key != children_key}
+            stack.append(iter(children))
+        else:
+            yield len(stack) - 1, dict(item)
+
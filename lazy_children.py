@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Virtual children: units whose children live in a separate file.
+
+A unit of hierarchy.json can name a file in its children_file field, for
+example a Kecamatan unit pointing at its sd_negeri_<kecamatan>.json:
+
+    {"name": "Kecamatan Ajibarang", "eselon": "III.a",
+     "children_file": "sd_negeri_ajibarang.json", "children": [...]}
+
+The units of that file follow the unit's own children. The file is only
+read when something walks into that subtree, and is cached (per size and
+mtime) after the first read. A referenced file is either a list of units in
+hierarchy.json format or an sd_negeri school list, whose records become
+units named after the school with jabatan and npsn.
+
+- ChildrenLoader resolves, loads and caches the referenced files
+- iter_units() walks parsed data in pre-order including virtual children
+- expand_nodes() adds virtual children to a json_stream.iter_nodes() stream,
+  so full exports still stream
+- find_unit() and materialize() serve partial queries: only the files under
+  the requested unit are read
+
+Usage:
+    python lazy_children.py link
+    python lazy_children.py show "Kecamatan Ajibarang"
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from hierarchy_index import PATH_SEPARATOR
+
+
+# Unit field naming the file with additional children (relative to the hierarchy file)
+CHILDREN_FILE_FIELD = 'children_file'
+
+
+class ChildrenFileError(ValueError):
+    """Raised when a referenced children file is missing or malformed."""
+
+
+def school_unit(record):
+    """Turn one sd_negeri record into a hierarchy unit."""
+    import jabatan_rules
+    name = record.get('Nama Sekolah', '')
+    return {
+        'name': name,
+        'jabatan': jabatan_rules.determine_jabatan(name, ''),
+        'npsn': record.get('NPSN', ''),
+    }
+
+
+class ChildrenLoader:
+    """
+    Loads the files referenced by children_file fields, each at most once.
+
+    Args:
+        base_dir: Directory that references are relative to (that of hierarchy.json)
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+        self.loads = 0
+        self._cache = {}
+
+    def path(self, reference):
+        return self.base_dir / reference
+
+    def load(self, reference):
+        """
+        Units of a referenced file.
+
+        The returned list is shared between callers and must not be modified;
+        use materialize() for a private copy.
+
+        Raises:
+            ChildrenFileError: The file is missing or not a list
+        """
+        path = self.path(reference)
+        try:
+            stat = path.stat()
+        except OSError as e:
+            raise ChildrenFileError(f"children file {reference} not found") from e
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                records = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ChildrenFileError(f"children file {reference} is not valid JSON: {e}") from e
+        if not isinstance(records, list):
+            raise ChildrenFileError(f"children file {reference} must contain an array")
+        units = [
+            record if 'name' in record else school_unit(record)
+            for record in records if isinstance(record, dict)
+        ]
+        self._cache[path] = (key, units)
+        self.loads += 1
+        return units
+
+    def virtual_children(self, unit):
+        """Units loaded from the unit's children_file (empty without one)."""
+        reference = unit.get(CHILDREN_FILE_FIELD)
+        return self.load(reference) if reference else []
+
+    def children(self, unit):
+        """The unit's own children followed by its virtual children."""
+        children = unit.get('children')
+        children = children if isinstance(children, list) else []
+        if not unit.get(CHILDREN_FILE_FIELD):
+            return children
+        return children + self.virtual_children(unit)
+
+    def fingerprint(self, unit):
+        """
+        Hash of every file referenced in a subtree, without loading them as units.
+
+        Used to invalidate cached exports when a referenced file changes.
+        """
+        digest = hashlib.sha1()
+        stack = [unit]
+        while stack:
+            item = stack.pop()
+            if not isinstance(item, dict):
+                continue
+            reference = item.get(CHILDREN_FILE_FIELD)
+            if reference:
+                digest.update(reference.encode('utf-8'))
+                try:
+                    digest.update(self.path(reference).read_bytes())
+                except OSError:
+                    pass
+            children = item.get('children')
+            if isinstance(children, list):
+                stack.extend(children)
+        return digest.hexdigest()
+
+
+def iter_units(data, loader, depth=0):
+    """
+    Walk units in pre-order, including virtual children.
+
+    Args:
+        data: List of units
+        loader: ChildrenLoader
+        depth: Depth of the units in data
+
+    Yields:
+        (depth, unit) tuples
+    """
+    exhausted = object()
+    stack = [iter(data)]
+    while stack:
+        item = next(stack[-1], exhausted)
+        if item is exhausted:
+            stack.pop()
+            continue
+        if not (isinstance(item, dict) and 'name' in item):
+            continue
+        yield depth + len(stack) - 1, item
+        children = loader.children(item)
+        if children:
+            stack.append(iter(children))
+
+
+def expand_nodes(nodes, loader):
+    """
+    Add virtual children to a (depth, unit) stream such as json_stream.iter_nodes.
+
+    The virtual children of a unit are yielded after its own subtree, when
+    the stream moves past it; by then fields written after the children
+    list, including children_file, have been read as well.
+
+    Args:
+        nodes: Iterable of (depth, unit) in pre-order
+        loader: ChildrenLoader
+
+    Yields:
+        (depth, unit) tuples
+    """
+    # Units whose subtree is still being read, outermost first
+    open_units = []
+    for depth, unit in nodes:
+        while open_units and open_units[-1][0] >= depth:
+            closed_depth, closed = open_units.pop()
+            yield from iter_units(loader.virtual_children(closed), loader, closed_depth + 1)
+        yield depth, unit
+        open_units.append((depth, unit))
+    while open_units:
+        closed_depth, closed = open_units.pop()
+        yield from iter_units(loader.virtual_children(closed), loader, closed_depth + 1)
+
+
+def find_unit(data, path, loader=None):
+    """
+    The unit at a path, descending into virtual children only along the path.
+
+    Args:
+        data: List of top-level units
+        path: Sequence of names, or a PATH_SEPARATOR-joined string
+        loader: ChildrenLoader (None to ignore children files)
+
+    Returns:
+        (unit, parent name) or (None, None) if the path does not exist
+    """
+    if isinstance(path, str):
+        path = path.split(PATH_SEPARATOR)
+    units, unit, parent_name = data, None, ""
+    for name in path:
+        match = next((item for item in units if isinstance(item, dict) and item.get('name') == name), None)
+        if match is None:
+            return None, None
+        if unit is not None:
+            parent_name = unit['name']
+        unit = match
+        if loader is not None:
+            units = loader.children(unit)
+        else:
+            units = unit.get('children') if isinstance(unit.get('children'), list) else []
+    return unit, parent_name
+
+
+def materialize(unit, loader):
+    """
+    Copy a subtree with its virtual children turned into ordinary children.
+
+    Returns:
+        New unit dictionary without children_file fields
+    """
+    copy = {key: value for key, value in unit.items() if key not in ('children', CHILDREN_FILE_FIELD)}
+    children = [materialize(child, loader) for child in loader.children(unit)
+                if isinstance(child, dict) and 'name' in child]
+    if children or 'children' in unit:
+        copy['children'] = children
+    return copy
+
+
+def school_file_links(data, directory):
+    """
+    Map every top-level Kecamatan unit to the sd_negeri file of its kecamatan.
+
+    Kecamatan names are matched with hierarchy_db.kecamatan_resolver, so
+    spelling variants (Baturaden / Baturraden) still link but a file of an
+    unknown kecamatan is not linked to a similar one.
+
+    Args:
+        data: List of top-level units
+        directory: Directory with the sd_negeri_*.json files
+
+    Returns:
+        (dictionary of unit name -> file name, list of file names that
+        match no Kecamatan unit)
+    """
+    from hierarchy_db import kecamatan_of, kecamatan_resolver, school_files
+
+    kecamatan = [item['name'] for item in data
+                 if isinstance(item, dict) and item.get('name', '').startswith('Kecamatan ')]
+    resolve = kecamatan_resolver(kecamatan)
+    links = {}
+    unmatched = []
+    for school_file in school_files(directory):
+        name = resolve(kecamatan_of(school_file))
+        if name is None:
+            unmatched.append(school_file.name)
+        else:
+            links[name] = school_file.name
+    return links, unmatched
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Link school files to Kecamatan units and inspect virtual children'
+    )
+    parser.add_argument(
+        'command',
+        choices=['link', 'show'],
+        help='link every Kecamatan unit to its sd_negeri file, or show a subtree with its virtual children'
+    )
+    parser.add_argument(
+        'path',
+        nargs='?',
+        help=f'Unit path for show (names joined with "{PATH_SEPARATOR}")'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='Hierarchy JSON file (default: hierarchy.json)'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Report the links without writing (link)'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        print(f"Error: {args.file} not found!")
+        sys.exit(1)
+
+    from json_stream import load_json
+    data = load_json(args.file)
+    base_dir = Path(args.file).parent
+
+    if args.command == 'link':
+        from hierarchy_batch import BatchError, LinkChildrenFile, run_batch
+        links, unmatched = school_file_links(data, base_dir)
+        for reference in unmatched:
+            print(f"  Warning: no Kecamatan unit matches {reference}; not linked")
+        operations = [LinkChildrenFile((name,), reference) for name, reference in links.items()]
+        try:
+            txn, changed = run_batch(args.file, operations, dry_run=args.dry_run)
+        except BatchError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for (name, reference), count in zip(links.items(), changed):
+            print(f"{'linked' if count else 'unchanged'}: {name} -> {reference}")
+        if txn is not None:
+            print(f"✓ Committed as transaction {txn}")
+        return
+
+    if not args.path:
+        parser.error("show needs a unit path")
+    loader = ChildrenLoader(base_dir)
+    unit, _ = find_unit(data, args.path, loader)
+    if unit is None:
+        print(f"Error: unit '{args.path}' not found")
+        sys.exit(1)
+    try:
+        count = 0
+        for depth, item in iter_units([unit], loader):
+            print(f"{'  ' * depth}{item['name']}")
+            count += 1
+    except ChildrenFileError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"\n{count} units, {loader.loads} children file(s) read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Fuzzy name index for matching unit names against hierarchy.json.
+
+Names are normalized first (case, spacing, list markers such as "a." or
+"1\\.", trailing ";" and "terdiri dari:", "Sub Bagian" -> "subbagian") and
+then indexed by character trigrams. Similarity is the Dice coefficient of
+the trigram sets.
+
+Queries do not scan every name. Trigrams are looked up rarest first, and
+only enough of them to find every name that can still reach min_score are
+used to collect candidates (prefix filtering); the candidates are then
+scored exactly. A high threshold is tried first, which needs only the
+rarest third of the trigrams, so common ones such as "bag" are mostly never
+touched.
+
+Usage:
+    python name_index.py "bidanag ketersediaan dan stabilisasi pangan"
+    python name_index.py "Sub Bagian Keuangan" -k 10
+    python name_index.py --reconcile setting.md
+"""
+
+import argparse
+import math
+import re
+import sys
+from pathlib import Path
+
+from hierarchy_index import HierarchyIndex, PATH_SEPARATOR
+
+
+# Default minimum Dice similarity for a match
+MIN_SCORE = 0.5
+
+# Threshold tried first; most good matches clear it with few candidates
+PROBE_SCORE = 0.8
+
+# Spelling variants replaced before indexing: (pattern, replacement)
+NORMALIZE_RULES = [
+    (re.compile(r'\bsub\s+(bagian|bidang|bag)\b'), r'sub\1'),
+    (re.compile(r'\bsubbag\b'), 'subbagian'),
+    (re.compile(r'&'), ' dan '),
+]
+
+_LIST_MARKER = re.compile(r'^\s*(?:[a-z]|\d+)\s*\\?[.)]\s+')
+_TRAILING = re.compile(r'(?:[\s,;:.]|\bdan\b|\bterdiri\s+(?:dari|atas)\b)+$')
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_name(name):
+    """
+    Normalize a unit name for matching.
+
+    Args:
+        name: Raw name (e.g. a setting.md table cell)
+
+    Returns:
+        Lower-case name with single spaces and no list marker or trailing
+        punctuation
+    """
+    text = name.lower().replace('\\', '')
+    text = _LIST_MARKER.sub('', text)
+    text = _TRAILING.sub('', text)
+    for pattern, replacement in NORMALIZE_RULES:
+        text = pattern.sub(replacement, text)
+    text = _PUNCTUATION.sub(' ', text)
+    return _SPACES.sub(' ', text).strip()
+
+
+def trigrams(text):
+    """Set of character trigrams of a normalized name (padded with spaces)."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def dice(a, b):
+    """Dice coefficient of two trigram sets."""
+    if not a and not b:
+        return 1.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class NameIndex:
+    """
+    Trigram index over a list of names.
+
+    Args:
+        names: Names to index
+        payloads: Optional value per name returned with matches (e.g. a unit path)
+    """
+
+    def __init__(self, names, payloads=None):
+        self.names = list(names)
+        self.payloads = list(payloads) if payloads is not None else list(range(len(self.names)))
+        self.normalized = []
+        self.grams = []
+        self.postings = {}
+
+        # Names that normalize identically share one entry (the first of them)
+        self._groups = {}
+        for i, name in enumerate(self.names):
+            text = normalize_name(name)
+            self.normalized.append(text)
+            group = self._groups.get(text)
+            if group is not None:
+                group.append(i)
+                self.grams.append(self.grams[group[0]])
+                continue
+            self._groups[text] = [i]
+            grams = trigrams(text)
+            self.grams.append(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+    @classmethod
+    def from_hierarchy(cls, json_file):
+        """
+        Index every unit name of a hierarchy file; payloads are unit paths.
+
+        Args:
+            json_file: Path to hierarchy.json
+
+        Returns:
+            NameIndex
+        """
+        index = HierarchyIndex.from_file(json_file)
+        return cls(index.names, [index.path(i) for i in range(len(index))])
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, k=5, min_score=MIN_SCORE):
+        """
+        Return the k names most similar to a query.
+
+        Args:
+            query: Name to look up (normalized like the indexed names)
+            k: Maximum number of results
+            min_score: Minimum Dice similarity (0-1)
+
+        Returns:
+            List of (score, name, payload), best first
+        """
+        text = normalize_name(query)
+        group = self._groups.get(text)
+        if group is not None and k == 1:
+            return [(1.0, self.names[group[0]], self.payloads[group[0]])]
+
+        grams = trigrams(text)
+        if not grams:
+            return []
+
+        # Probe with a high threshold first: its prefix holds only the rarest
+        # trigrams, and if it yields k names they are the true top k
+        results = []
+        for threshold in (PROBE_SCORE, min_score):
+            if threshold < min_score:
+                continue
+            results = self._search(grams, k, threshold)
+            if len(results) >= k:
+                break
+        return results
+
+    def _search(self, grams, k, min_score):
+        # A name with Dice >= min_score shares at least this many trigrams
+        # with the query, so it contains one of the rarest len - overlap + 1
+        min_overlap = max(1, math.ceil(min_score * len(grams) / (2 - min_score)))
+        ordered = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+        candidates = set()
+        for gram in ordered[:len(ordered) - min_overlap + 1]:
+            candidates.update(self.postings.get(gram, ()))
+
+        scored = []
+        for candidate in candidates:
+            score = dice(grams, self.grams[candidate])
+            if score >= min_score:
+                scored.append((score, candidate))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        results = []
+        for score, candidate in scored:
+            # Report every indexed name behind a shared normalized form
+            for i in self._groups[self.normalized[candidate]]:
+                results.append((score, self.names[i], self.payloads[i]))
+                if len(results) == k:
+                    return results
+        return results
+
+    def reconcile(self, names, min_score=MIN_SCORE):
+        """
+        Find the best match for every name of a table.
+
+        Repeated names (after normalization) are looked up once.
+
+        Args:
+            names: Names to match
+            min_score: Minimum Dice similarity
+
+        Returns:
+            List with (score, name, payload) or None per input name
+        """
+        cache = {}
+        results = []
+        for name in names:
+            text = normalize_name(name)
+            if text not in cache:
+                matches = self.search(name, k=1, min_score=min_score)
+                cache[text] = matches[0] if matches else None
+            results.append(cache[text])
+        return results
+
+
+def setting_names(markdown_file):
+    """
+    Collect the unit names of the old and new columns of setting.md.
+
+    Args:
+        markdown_file: Path to setting.md
+
+    Returns:
+        List of names in table order (separator rows and empty cells skipped)
+    """
+    names = []
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            cells = line.strip().strip('|').split('|')
+            if len(cells) < 4:
+                continue
+            for cell in (cells[1], cells[3]):
+                cell = cell.strip()
+                if cell and not set(cell) <= set('-: ') and normalize_name(cell):
+                    names.append(cell)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Fuzzy search of unit names in hierarchy.json'
+    )
+    parser.add_argument(
+        'query',
+        nargs='?',
+        help='Name to look up'
+    )
+    parser.add_argument(
+        '-k',
+        type=int,
+        default=5,
+        help='Number of matches to show (default: 5)'
+    )
+    parser.add_argument(
+        '--min-score',
+        type=float,
+        default=MIN_SCORE,
+        help=f'Minimum similarity (default: {MIN_SCORE})'
+    )
+    parser.add_argument(
+        '--reconcile',
+        type=str,
+        metavar='MARKDOWN',
+        help='Match every name in the tables of a markdown file (e.g. setting.md)'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='Hierarchy JSON file (default: hierarchy.json)'
+    )
+
+    args = parser.parse_args()
+
+    if not args.query and not args.reconcile:
+        parser.error("give a query or --reconcile")
+    for required in (args.file, args.reconcile):
+        if required and not Path(required).exists():
+            print(f"Error: {required} not found!")
+            sys.exit(1)
+
+    index = NameIndex.from_hierarchy(args.file)
+
+    if args.reconcile:
+        names = setting_names(args.reconcile)
+        matched = 0
+        for name, match in zip(names, index.reconcile(names, args.min_score)):
+            if match is None:
+                print(f"  ---- {name}")
+                continue
+            matched += 1
+            score, _, path = match
+            print(f"  {score:.2f} {name}\n       -> {PATH_SEPARATOR.join(path)}")
+        print(f"\nMatched {matched} of {len(names)} names")
+        return
+
+    matches = index.search(args.query, args.k, args.min_score)
+    if not matches:
+        print(f"No unit similar to '{args.query}' found")
+        sys.exit(1)
+    for score, _, path in matches:
+        print(f"{score:.2f}  {PATH_SEPARATOR.join(path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Persistent NPSN index over all sd_negeri_*.json files, queried through mmap.
+
+build_npsn_index() compiles every school of the sd_negeri files into one
+little-endian file:
+- a sorted uint32 column of NPSNs (NPSNs are 8 digits, so they fit)
+- uint32 row offsets into a record store, in the same order
+- a uint32 column with the source file of each row
+- the record store: every school record as compact UTF-8 JSON
+- the source list (file names, sizes and modification times)
+
+NpsnIndex maps the file and binary-searches the NPSN column in place, so
+opening the index parses no JSON and a lookup decodes only the record it
+returns. Besides single lookups it offers:
+- get_many(): thousands of NPSNs in one call; with NumPy installed this is
+  a single vectorized searchsorted over the column
+- prefix() / scan(): all schools in an NPSN range, e.g. every NPSN starting
+  with a region code, as one contiguous slice of the column
+
+open_npsn_index() rebuilds the index first when any sd_negeri file was
+added, removed or changed since it was built, and NpsnIndex.refresh() does
+the same for an index kept open by a long-running process. Records whose
+NPSN is not 8 digits are left out (validate_sd_json.py reports them); an
+NPSN that occurs in several files is stored once per file and lookups
+return the first.
+
+Usage:
+    python npsn_index.py build
+    python npsn_index.py get 20302232 20302319
+    python npsn_index.py prefix 20302
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from hierarchy_db import school_files
+from json_stream import load_json
+
+
+MAGIC = b'NPSX'
+VERSION = 1
+
+# magic, version, rows, record store size, source list size
+HEADER = struct.Struct('<4sIIII')
+
+DEFAULT_INDEX = "npsn.idx"
+
+NPSN_DIGITS = 8
+
+
+class NpsnIndexError(ValueError):
+    """Raised when a file is not a readable NPSN index."""
+
+
+def _numpy():
+    """NumPy if it is installed (imported on first use), else None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _uint_bytes(values):
+    """Little-endian uint32 bytes for a sequence of ints."""
+    column = array('I', values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _pad(data):
+    """Pad to a multiple of 4 bytes so the next column stays aligned."""
+    return data + bytes(-len(data) % 4)
+
+
+def npsn_key(npsn):
+    """
+    Integer key of an NPSN, or None if it is not exactly 8 digits.
+
+    Args:
+        npsn: NPSN string (ints are accepted too)
+    """
+    if isinstance(npsn, int):
+        npsn = f"{npsn:0{NPSN_DIGITS}d}"
+    if not isinstance(npsn, str) or len(npsn) != NPSN_DIGITS or not npsn.isdigit():
+        return None
+    return int(npsn)
+
+
+def _source_list(directory):
+    files = []
+    for path in school_files(directory):
+        stat = os.stat(path)
+        files.append([path.name, stat.st_size, stat.st_mtime_ns])
+    return {'directory': str(Path(directory).resolve()), 'files': files}
+
+
+def build_npsn_index(directory, index_file):
+    """
+    Compile the sd_negeri files of a directory into an NPSN index.
+
+    Args:
+        directory: Directory with the sd_negeri_*.json files
+        index_file: Path of the index to write
+
+    Returns:
+        (rows indexed, records skipped for a missing or malformed NPSN)
+    """
+    # Sources are recorded before reading, so a file saved during the build
+    # makes the index stale instead of silently missing the edit
+    sources = _source_list(directory)
+    rows = []
+    skipped = 0
+    for file_id, (name, _, _) in enumerate(sources['files']):
+        records = load_json(Path(directory) / name)
+        for record in records if isinstance(records, list) else []:
+            key = npsn_key(record.get('NPSN')) if isinstance(record, dict) else None
+            if key is None:
+                skipped += 1
+                continue
+            encoded = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            rows.append((key, file_id, encoded))
+    # Stable sort: duplicates keep file order
+    rows.sort(key=lambda row: row[0])
+
+    offsets = [0]
+    for _, _, encoded in rows:
+        offsets.append(offsets[-1] + len(encoded))
+    store = b''.join(encoded for _, _, encoded in rows)
+    source_bytes = json.dumps(sources, ensure_ascii=False).encode('utf-8')
+
+    sections = [
+        HEADER.pack(MAGIC, VERSION, len(rows), len(store), len(source_bytes)),
+        _uint_bytes(key for key, _, _ in rows),
+        _uint_bytes(offsets),
+        _uint_bytes(file_id for _, file_id, _ in rows),
+        _pad(source_bytes),
+        store,
+    ]
+
+    # Write next to the target and swap in, so readers never see a partial file
+    temp_file = f'{index_file}.tmp'
+    with open(temp_file, 'wb') as f:
+        for section in sections:
+            f.write(section)
+    os.replace(temp_file, index_file)
+    return len(rows), skipped
+
+
+def _read_sources(index_file):
+    with open(index_file, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return None
+        magic, version, count, _, source_size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            return None
+        # Skip the three columns (npsn, offsets, file ids)
+        f.seek(HEADER.size + 4 * (3 * count + 1))
+        try:
+            return json.loads(f.read(source_size))
+        except ValueError:
+            return None
+
+
+def is_npsn_index_current(index_file, directory):
+    """
+    Check whether an index was built from the current sd_negeri files.
+
+    Args:
+        index_file: Path to the index
+        directory: Directory with the sd_negeri_*.json files
+
+    Returns:
+        True if the index exists and lists exactly the current files with
+        their current sizes and modification times
+    """
+    try:
+        recorded = _read_sources(index_file)
+        current = _source_list(directory)
+    except OSError:
+        return False
+    return recorded == current
+
+
+def open_npsn_index(directory, index_file=None):
+    """
+    Open the NPSN index of a directory, rebuilding it first if it is stale.
+
+    Args:
+        directory: Directory with the sd_negeri_*.json files
+        index_file: Path to the index (default: npsn.idx in directory)
+
+    Returns:
+        NpsnIndex
+    """
+    index_file = Path(index_file) if index_file else Path(directory) / DEFAULT_INDEX
+    if not is_npsn_index_current(index_file, directory):
+        build_npsn_index(directory, index_file)
+    return NpsnIndex(index_file)
+
+
+class NpsnIndex:
+    """
+    Read-only NPSN lookups backed by a memory-mapped index file.
+
+    Records are decoded only when they are returned. Close the index (or use
+    it as a context manager) to release the mapping.
+
+    Args:
+        index_file: Path to a file written by build_npsn_index
+    """
+
+    def __init__(self, index_file):
+        self.index_file = Path(index_file)
+        self._open()
+
+    def _open(self):
+        with open(self.index_file, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise NpsnIndexError(f"{self.index_file} is empty") from None
+        self._views = []
+        self._array = None
+
+        try:
+            self._read()
+        except (NpsnIndexError, struct.error, TypeError, ValueError) as e:
+            self.close()
+            if isinstance(e, NpsnIndexError):
+                raise
+            raise NpsnIndexError(f"{self.index_file} is truncated or corrupt: {e}") from None
+
+    def _read(self):
+        magic, version, count, store_size, source_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise NpsnIndexError("Not an NPSN index")
+        if version != VERSION:
+            raise NpsnIndexError(f"Unsupported NPSN index version {version}")
+
+        self._pos = HEADER.size
+        self.npsn = self._uints(count)
+        self._offsets = self._uints(count + 1)
+        self._file_ids = self._uints(count)
+        self.sources = json.loads(self._view(source_size, 'B').tobytes())
+        self._pos += -source_size % 4
+        self._store = self._view(store_size, 'B')
+        self.files = [name for name, _, _ in self.sources['files']]
+
+    def _view(self, length, fmt):
+        size = length * struct.calcsize(fmt)
+        if self._pos + size > len(self._mmap):
+            raise NpsnIndexError("NPSN index is truncated")
+        view = memoryview(self._mmap)[self._pos:self._pos + size].cast(fmt)
+        self._views.append(view)
+        self._pos += size
+        return view
+
+    def _uints(self, length):
+        if sys.byteorder == 'little':
+            return self._view(length, 'I')
+        # Big-endian hosts get a converted copy
+        column = array('I', self._view(length, 'B').tobytes())
+        column.byteswap()
+        return column
+
+    def close(self):
+        """Release the column views and unmap the file."""
+        # The NumPy view holds an export of the mapping and must go first
+        self._array = None
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.npsn)
+
+    def is_current(self):
+        """True if no sd_negeri file changed since the index was built."""
+        try:
+            return _source_list(self.sources['directory']) == self.sources
+        except OSError:
+            return False
+
+    def refresh(self):
+        """
+        Rebuild and reopen the index if any sd_negeri file changed.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        if self.is_current():
+            return False
+        directory = self.sources['directory']
+        self.close()
+        build_npsn_index(directory, self.index_file)
+        self._open()
+        return True
+
+    def record(self, row):
+        """School record of a row."""
+        return json.loads(self._store[self._offsets[row]:self._offsets[row + 1]].tobytes())
+
+    def source(self, row):
+        """Name of the sd_negeri file a row came from."""
+        return self.files[self._file_ids[row]]
+
+    def find(self, npsn):
+        """
+        Row of an NPSN (its first row if it is duplicated).
+
+        Returns:
+            Row number, or -1 if the NPSN is not indexed
+        """
+        key = npsn_key(npsn)
+        if key is None:
+            return -1
+        row = bisect.bisect_left(self.npsn, key)
+        if row < len(self.npsn) and self.npsn[row] == key:
+            return row
+        return -1
+
+    def get(self, npsn):
+        """School record of an NPSN, or None."""
+        row = self.find(npsn)
+        return self.record(row) if row >= 0 else None
+
+    def find_many(self, npsns):
+        """
+        Rows of many NPSNs at once.
+
+        With NumPy installed all NPSNs are searched in one vectorized call;
+        otherwise each is binary-searched in turn.
+
+        Args:
+            npsns: Iterable of NPSN strings
+
+        Returns:
+            List of row numbers, -1 where an NPSN is not indexed
+        """
+        keys = [npsn_key(npsn) for npsn in npsns]
+        numpy = _numpy()
+        if numpy is None or not len(self.npsn):
+            return [self.find(key) if key is not None else -1 for key in keys]
+
+        if self._array is None:
+            self._array = numpy.frombuffer(self.npsn, dtype='<u4')
+        # Malformed NPSNs get a key no 8-digit NPSN can have
+        wanted = numpy.fromiter((key if key is not None else 0xFFFFFFFF for key in keys),
+                                dtype=numpy.uint32, count=len(keys))
+        rows = numpy.searchsorted(self._array, wanted)
+        clipped = numpy.minimum(rows, len(self._array) - 1)
+        found = self._array[clipped] == wanted
+        return numpy.where(found, rows, -1).tolist()
+
+    def get_many(self, npsns):
+        """
+        School records of many NPSNs at once (see find_many).
+
+        Returns:
+            List of records, None where an NPSN is not indexed
+        """
+        return [self.record(row) if row >= 0 else None for row in self.find_many(npsns)]
+
+    def scan(self, start, stop):
+        """
+        Rows whose NPSN is in [start, stop), as a range.
+
+        Args:
+            start: Smallest NPSN (int)
+            stop: First NPSN after the range (int)
+        """
+        return range(bisect.bisect_left(self.npsn, start), bisect.bisect_left(self.npsn, stop))
+
+    def prefix(self, prefix):
+        """
+        Rows of every NPSN starting with a prefix, e.g. a region code.
+
+        Args:
+            prefix: Leading digits (1 to 8)
+
+        Returns:
+            range of row numbers, in NPSN order
+        """
+        if not prefix.isdigit() or len(prefix) > NPSN_DIGITS:
+            raise ValueError(f"NPSN prefix must be 1 to {NPSN_DIGITS} digits, got '{prefix}'")
+        width = 10 ** (NPSN_DIGITS - len(prefix))
+        return self.scan(int(prefix) * width, (int(prefix) + 1) * width)
+
+
+def print_row(index, row):
+    record = index.record(row)
+    print(f"{index.npsn[row]:0{NPSN_DIGITS}d}  {record.get('Nama Sekolah', '')}  ({index.source(row)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build and query the NPSN index of the sd_negeri files'
+    )
+    parser.add_argument(
+        'command',
+        choices=['build', 'get', 'prefix'],
+        help='build the index, look up NPSNs, or list every NPSN with a prefix'
+    )
+    parser.add_argument(
+        'values',
+        nargs='*',
+        help='NPSNs (get) or one NPSN prefix (prefix)'
+    )
+    parser.add_argument(
+        '--dir',
+        type=str,
+        default=str(Path(__file__).parent),
+        help='Directory with the sd_negeri_*.json files (default: this directory)'
+    )
+    parser.add_argument(
+        '--index',
+        type=str,
+        help=f'Index file (default: {DEFAULT_INDEX} in --dir)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Rebuild even if the index is up to date (build)'
+    )
+
+    args = parser.parse_args()
+
+    index_file = Path(args.index) if args.index else Path(args.dir) / DEFAULT_INDEX
+    if not school_files(args.dir):
+        print(f"Error: no sd_negeri_*.json files in {args.dir}")
+        sys.exit(1)
+
+    if args.command == 'build':
+        if not args.force and is_npsn_index_current(index_file, args.dir):
+            print(f"{index_file} is up to date.")
+            return
+        count, skipped = build_npsn_index(args.dir, index_file)
+        size_kb = index_file.stat().st_size / 1024
+        print(f"Wrote {index_file}: {count} schools, {size_kb:.1f} KB")
+        if skipped:
+            print(f"Skipped {skipped} record(s) without a valid NPSN")
+        return
+
+    if not args.values:
+        parser.error(f"{args.command} needs at least one value")
+    try:
+        index = open_npsn_index(args.dir, index_file)
+    except NpsnIndexError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    with index:
+        if args.command == 'get':
+            missing = 0
+            # A few NPSNs: bisect each rather than paying for the NumPy import
+            for npsn in args.values:
+                row = index.find(npsn)
+                if row < 0:
+                    print(f"{npsn}  not found")
+                    missing += 1
+                else:
+                    print_row(index, row)
+            sys.exit(1 if missing else 0)
+
+        try:
+            rows = index.prefix(args.values[0])
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for row in rows:
+            print_row(index, row)
+        print(f"\n{len(rows)} school(s)")
+
+
+if __name__ == "__main__":
+    main()
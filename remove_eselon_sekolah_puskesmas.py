@@ -2,68 +2,53 @@
 """
 Script to remove eselon field from Puskesmas and Sekolah entries in hierarchy.json
 According to the issue: schools and puskesmas should not have eselon levels
+
+The edit is committed through hierarchy_batch, so it is journaled in
+hierarchy.json.journal (undo with: python hierarchy_batch.py --undo)
+instead of writing a timestamped backup copy.
 """
 
-import json
 import sys
 
+from hierarchy_batch import BatchError, StripEselon, apply_batch, run_batch
+
 def remove_eselon_from_schools_and_puskesmas(data):
     """
-    Recursively traverse the hierarchy and remove eselon field from
-    any entry where the name contains 'Puskesmas' or 'Sekolah'
+    Traverse the hierarchy and remove eselon field from any entry where
+    the name contains 'Puskesmas' or 'Sekolah' (hierarchy_batch.StripEselon,
+    applied in memory without a journal)
     """
-    modified_count = 0
-    
-    if isinstance(data, list):
-        for item in data:
-            modified_count += remove_eselon_from_schools_and_puskesmas(item)
-    elif isinstance(data, dict):
-        # Check if this entry is a Puskesmas or Sekolah
-        if 'name' in data and ('Puskesmas' in data['name'] or 'Sekolah' in data['name']):
-            if 'eselon' in data:
-                # Remove the eselon field
-                del data['eselon']
-                modified_count += 1
-                print(f"Removed eselon from: {data['name']}")
-        
-        # Recursively process children
-        if 'children' in data:
-            modified_count += remove_eselon_from_schools_and_puskesmas(data['children'])
-    
-    return modified_count
+    strip = StripEselon()
+    apply_batch(data if isinstance(data, list) else [data], [strip])
+    for name in strip.removed:
+        print(f"Removed eselon from: {name}")
+    return len(strip.removed)
 
 def main():
-    import shutil
-    from datetime import datetime
-    
     input_file = 'hierarchy.json'
-    output_file = 'hierarchy.json'
-    
-    # Create backup before modifying
-    backup_file = f'hierarchy.json.backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
-    print(f"Creating backup: {backup_file}...")
-    shutil.copy2(input_file, backup_file)
     
     print(f"Reading {input_file}...")
+    print("\nRemoving eselon field from Puskesmas and Sekolah entries...")
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        strip = StripEselon()
+        txn, changed = run_batch(input_file, [strip])
     except FileNotFoundError:
         print(f"Error: {input_file} not found!")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except BatchError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except ValueError as e:
         print(f"Error: Invalid JSON in {input_file}: {e}")
         sys.exit(1)
     
-    print("\nRemoving eselon field from Puskesmas and Sekolah entries...")
-    modified_count = remove_eselon_from_schools_and_puskesmas(data)
+    for name in strip.removed:
+        print(f"Removed eselon from: {name}")
     
-    print(f"\nTotal entries modified: {modified_count}")
+    print(f"\nTotal entries modified: {changed[0]}")
     
-    if modified_count > 0:
-        print(f"\nWriting updated data to {output_file}...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    if txn is not None:
+        print(f"Committed to {input_file} (journal transaction {txn})")
         print("Done!")
     else:
         print("No entries were modified.")
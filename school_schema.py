@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Declarative schema for SD Negeri school records.
+
+The rules checked by validate_sd_json.py and update_sd_data.py are written
+here once, as an ordered list of fields with ordered checks. Within a field
+the first failing check is reported (later checks may assume earlier ones
+passed, e.g. a length check after a type check).
+
+A Schema is compiled once into a plain Python function: the checks are
+generated as inline code with their constants bound as globals. A valid
+record is accepted by a single short-circuit expression; only records that
+fail it go through the field-by-field checks that build the messages.
+
+Compiled validators take (record, expected_no=None) and return a list of
+error messages (empty if valid):
+- collect-all (default): every error of the record
+- fail_fast: at most the first error
+- presence_only: only missing or empty fields
+
+Usage:
+    from school_schema import validate_school
+    errors = validate_school(school, expected_no=1)
+"""
+
+from collections import namedtuple
+
+
+# A record field with its checks in order. Missing required fields are
+# reported before any check runs.
+Field = namedtuple('Field', ['name', 'checks', 'required'])
+Field.__new__.__defaults__ = ((), True)
+
+# A single check. test is a Python expression that is true when the check
+# FAILS, with {v} for the field value and {c} for constant. message is a
+# str.format template with {field}, {value}, {type}, {length} and {expected}.
+Check = namedtuple('Check', ['test', 'constant', 'message'])
+
+# Placeholder for absent fields in generated code
+_MISSING = object()
+
+
+def not_empty(message="'{field}' is empty"):
+    """Check: value is truthy."""
+    return Check('not {v}', None, message)
+
+
+def is_type(type_, message="'{field}' must be {type_name}"):
+    """Check: value is an instance of type_."""
+    return Check('not isinstance({v}, {c})', type_, message.replace('{type_name}', type_.__name__))
+
+
+def has_length(length, message="'{field}' must have length %d, got {length}"):
+    """Check: len(value) == length."""
+    return Check('len({v}) != {c}', length, message.replace('%d', str(length)))
+
+
+def is_digits(message="'{field}' must contain only digits, got '{value}'"):
+    """Check: value is a string of digits."""
+    return Check('not {v}.isdigit()', None, message)
+
+
+def contains(text, message="'{field}' should include '{text}'"):
+    """Check: text occurs in value."""
+    return Check('{c} not in {v}', text, message.replace('{text}', text))
+
+
+def equals(expected, message="'{field}' must be '{constant}', got '{value}'"):
+    """Check: value == expected."""
+    return Check('{v} != {c}', expected, message.replace('{constant}', str(expected)))
+
+
+def sequence_number(message="'{field}' should be '{expected}', got '{value}'"):
+    """Check: value equals str(expected_no) (skipped when expected_no is None)."""
+    return Check('expected is not None and {v} != expected', None, message)
+
+
+def _message(template, field, value, expected):
+    """Format an error message (only called for failing checks)."""
+    try:
+        length = len(value)
+    except TypeError:
+        length = None
+    return template.format(field=field, value=value, type=type(value),
+                           length=length, expected=expected)
+
+
+class Schema:
+    """
+    Ordered set of record fields that compiles into validator functions.
+
+    Args:
+        fields: List of Field
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.required = [field.name for field in self.fields if field.required]
+
+    def compile(self, fail_fast=False, presence_only=False):
+        """
+        Generate a validator function for this schema.
+
+        Args:
+            fail_fast: Stop at the first error
+            presence_only: Only check that required fields exist and are not empty
+
+        Returns:
+            Function (record, expected_no=None) -> list of error messages.
+            Its generated code is available as the function's 'source' attribute.
+        """
+        namespace = {'_MISSING': _MISSING, '_message': _message}
+        lines = ['def validate(record, expected_no=None):']
+
+        def report(indent, expression):
+            if fail_fast:
+                return f"{indent}return [{expression}]"
+            return f"{indent}errors.append({expression})"
+
+        def bind(prefix, value):
+            name = f"{prefix}{len(namespace)}"
+            namespace[name] = value
+            return name
+
+        uses_expected = any('expected' in check.test
+                            for field in self.fields for check in field.checks)
+        if uses_expected and not presence_only:
+            lines.append('    expected = None if expected_no is None else str(expected_no)')
+        else:
+            lines.append('    expected = None')
+
+        variables = {field.name: f"v{i}" for i, field in enumerate(self.fields)}
+        lines.extend(self._fast_path(variables, bind, presence_only))
+        if not fail_fast:
+            lines.append('    errors = []')
+
+        for field in self.fields:
+            lines.append(f"    {variables[field.name]} = record.get({field.name!r}, _MISSING)")
+
+        if presence_only:
+            for field in self.fields:
+                if not field.required:
+                    continue
+                v = variables[field.name]
+                missing = bind('M', f"Missing required field: {field.name}")
+                empty = bind('M', f"'{field.name}' is empty")
+                lines.append(f"    if {v} is _MISSING:")
+                lines.append(report('        ', missing))
+                lines.append(f"    elif not {v}:")
+                lines.append(report('        ', empty))
+        else:
+            # All missing fields first, then the checks field by field
+            for field in self.fields:
+                if field.required:
+                    missing = bind('M', f"Missing required field: {field.name}")
+                    lines.append(f"    if {variables[field.name]} is _MISSING:")
+                    lines.append(report('        ', missing))
+
+            for field in self.fields:
+                if not field.checks:
+                    continue
+                v = variables[field.name]
+                lines.append(f"    if {v} is not _MISSING:")
+                for n, check in enumerate(field.checks):
+                    constant = bind('C', check.constant) if '{c}' in check.test else ''
+                    template = bind('M', check.message)
+                    test = check.test.format(v=v, c=constant)
+                    keyword = 'if' if n == 0 else 'elif'
+                    lines.append(f"        {keyword} {test}:")
+                    lines.append(report('            ',
+                                        f"_message({template}, {field.name!r}, {v}, expected)"))
+
+        lines.append('    return []' if fail_fast else '    return errors')
+        source = '\n'.join(lines) + '\n'
+
+        exec(compile(source, '<school_schema>', 'exec'), namespace)
+        validator = namespace['validate']
+        validator.source = source
+        return validator
+
+    def _fast_path(self, variables, bind, presence_only):
+        """
+        Generate the check for a fully valid record.
+
+        Required fields are read by indexing inside try, and every check is
+        joined into one short-circuit expression. A record that passes
+        returns immediately; anything else falls through to the detailed
+        checks that produce the messages.
+        """
+        lines = ['    try:']
+        conditions = []
+        for field in self.fields:
+            v = variables[field.name]
+            if field.required:
+                lines.append(f"        {v} = record[{field.name!r}]")
+            else:
+                lines.append(f"        {v} = record.get({field.name!r}, _MISSING)")
+
+            if presence_only:
+                if field.required:
+                    conditions.append(v)
+                continue
+
+            tests = []
+            for check in field.checks:
+                constant = bind('C', check.constant) if '{c}' in check.test else ''
+                tests.append(f"not ({check.test.format(v=v, c=constant)})")
+            if tests and not field.required:
+                conditions.append(f"({v} is _MISSING or ({' and '.join(tests)}))")
+            else:
+                conditions.extend(tests)
+
+        lines.append('    except KeyError:')
+        lines.append('        pass')
+        lines.append('    else:')
+        lines.append(f"        if {' and '.join(conditions) or 'True'}:")
+        lines.append('            return []')
+        return lines
+
+
+# Schema of one record in sd_negeri_*.json. Messages match the validator's
+# historical output.
+SCHOOL_SCHEMA = Schema([
+    Field('No', [
+        is_type(str, "'No' must be string, got {type}"),
+        sequence_number("'No' should be '{expected}', got '{value}'"),
+    ]),
+    Field('NPSN', [
+        not_empty("Invalid NPSN: NPSN is empty"),
+        is_type(str, "Invalid NPSN: NPSN must be string, got {type}"),
+        has_length(8, "Invalid NPSN: NPSN must be 8 digits, got {length}"),
+        is_digits("Invalid NPSN: NPSN must contain only digits, got '{value}'"),
+    ]),
+    Field('Nama Sekolah', [
+        not_empty(),
+        is_type(str, "'Nama Sekolah' must be string"),
+        contains('Kecamatan', "'Nama Sekolah' should include 'Kecamatan [nama]': {value}"),
+    ]),
+    Field('Alamat', [
+        not_empty(),
+        is_type(str, "'Alamat' must be string"),
+    ]),
+    Field('Kelurahan', [
+        not_empty(),
+        is_type(str, "'Kelurahan' must be string"),
+    ]),
+    Field('Status', [
+        equals('NEGERI'),
+    ]),
+])
+
+# Full validation, all errors of a record
+validate_school = SCHOOL_SCHEMA.compile()
+
+# Full validation, first error only
+check_school = SCHOOL_SCHEMA.compile(fail_fast=True)
+
+# Required fields present and not empty (used before writing files)
+check_school_complete = SCHOOL_SCHEMA.compile(fail_fast=True, presence_only=True)
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Parse the nomenclature tables of setting.md into hierarchy trees.
+
+setting.md lists every organization twice, before ("old") and after ("new")
+the reorganization, in a four-column table: number, old name, number, new
+name. Each name column is rebuilt into a list of units shaped like
+hierarchy.json:
+- a row with a number starts a top-level unit
+- "a." / "b." and "1." / "2." markers nest below it; a marker continues the
+  list whose previous marker it follows (c. after b.), and a first marker
+  (a. or 1.) opens a new list under the last unit
+- unmarked rows (as under Dinas Pemberdayaan Masyarakat Dan Desa) go below a
+  unit ending in "terdiri atas:" and otherwise become siblings of the nearest
+  unit of the same kind (first word)
+- an unmarked row between two top-level units is a heading ("Badan",
+  "Kecamatan (27 kecamatan)") or a note ("Dihapus (...)") and is skipped
+- head positions ("a. Kepala Dinas", "a. direktur") are not units, and a
+  bare "sekretariat" is named after its organization as in hierarchy.json
+
+Names lose their list marker, trailing "; dan" / ", terdiri atas:" and
+repeated spaces. eselon is filled in from the kind of unit, so the trees can
+go straight through AddJabatan (see hierarchy_batch.py).
+
+The document is read line by line in one pass. Cells are handled with string
+methods; the only regex is an anchored list-marker match of a few characters,
+so long padded cells cost linear time.
+
+Usage:
+    python setting_parser.py setting.md
+    python setting_parser.py setting.md --column old --output setting_old.json
+    python setting_parser.py setting.md --add-jabatan --output setting_new.json
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+
+COLUMNS = ('old', 'new')
+
+# eselon by kind of unit (first word of the lower-cased name)
+ESELON_BY_KIND = {
+    'sekretariat': "III.a",
+    'sekretaris': "III.a",
+    'wakil': "III.a",
+    'bidang': "III.b",
+    'bagian': "III.b",
+    'subbagian': "IV.a",
+    'subbidang': "IV.a",
+    'seksi': "IV.a",
+}
+
+# eselon of top-level units by kind; everything else is II.b
+TOP_ESELON_BY_KIND = {
+    'kecamatan': "III.a",
+}
+
+# Rows naming the head of a unit rather than a unit (lower-cased)
+HEAD_TITLES = frozenset(['kepala dinas', 'kepala badan', 'kepala', 'direktur', 'camat'])
+
+# Bare secretariat rows ("b. sekretariat terdiri atas:", lower-cased)
+SECRETARIAT_NAMES = frozenset(['sekretariat', 'sekretaris'])
+
+# Spelling variants of unit kinds: lower-cased prefix -> replacement
+KIND_SPELLINGS = (
+    ('sub bagian ', "Subbagian "),
+    ('sub bidang ', "Subbidang "),
+)
+
+_MARKER = re.compile(r'([a-z]|\d{1,3})\s*\\?[.)]\s*')
+_OPENERS = ('terdiri atas', 'terdiri dari')
+_TRAILING_WORDS = ('dan',)
+
+
+class SettingParseError(ValueError):
+    """Raised when a line of setting.md cannot be parsed."""
+
+
+def split_row(line):
+    """
+    Split a table row into (old number, old cell, new number, new cell).
+
+    Returns:
+        Tuple of four stripped strings, or None for separator and non-table lines
+    """
+    line = line.strip()
+    if not line.startswith('|'):
+        return None
+    cells = line.strip('|').split('|')
+    if len(cells) < 4:
+        return None
+    cells = [cell.strip() for cell in cells[:4]]
+    if all(not cell.strip('-: ') for cell in cells):
+        return None
+    return tuple(cells)
+
+
+def parse_marker(cell):
+    """
+    Split a list marker off a cell.
+
+    Returns:
+        (marker, rest): marker is 'a'/'b'/... or a number string, None if
+        the cell has no marker
+    """
+    match = _MARKER.match(cell)
+    # A cell that is nothing but a marker is kept as a name
+    if match is None or match.end() == len(cell):
+        return None, cell
+    return match.group(1), cell[match.end():]
+
+
+def clean_name(text):
+    """
+    Strip trailing punctuation, "dan" and "terdiri atas/dari" from a name.
+
+    Returns:
+        (name, opens): opens is True when the name announced sub-units with
+        "terdiri atas:" or "terdiri dari:"
+    """
+    text = ' '.join(text.replace('\\', '').split())
+    opens = False
+    while True:
+        stripped = text.rstrip(' ,;:.')
+        lowered = stripped.lower()
+        for word in _OPENERS + _TRAILING_WORDS:
+            if lowered.endswith(word) and (len(lowered) == len(word) or lowered[-len(word) - 1] in ' ,;'):
+                stripped = stripped[:-len(word)]
+                opens = opens or word in _OPENERS
+                break
+        if stripped == text:
+            break
+        text = stripped
+
+    lowered = text.lower()
+    for spelling, replacement in KIND_SPELLINGS:
+        if lowered.startswith(spelling):
+            text = replacement + text[len(spelling):]
+            break
+    return text[:1].upper() + text[1:], opens
+
+
+def _kind(name):
+    return name.split(' ', 1)[0].lower()
+
+
+def _follows(marker, previous):
+    """True if marker comes right after previous in the same list (b after a, 3 after 2)."""
+    if previous is None or marker.isdigit() != previous.isdigit():
+        return False
+    if marker.isdigit():
+        return int(marker) == int(previous) + 1
+    return ord(marker) == ord(previous) + 1
+
+
+def _is_first(marker):
+    return marker in ('a', '1')
+
+
+class _Level:
+    """An open list level: the unit that receives children and how it was listed."""
+
+    __slots__ = ('unit', 'marker', 'kind', 'opens')
+
+    def __init__(self, unit, marker, kind, opens):
+        self.unit = unit
+        self.marker = marker
+        self.kind = kind
+        self.opens = opens
+
+
+class ColumnParser:
+    """
+    Rebuilds the units of one name column, fed one table cell at a time.
+
+    An unnumbered, unmarked cell right after a top-level unit is held back
+    until the next non-empty cell shows whether it is a heading.
+    """
+
+    def __init__(self, infer_eselon=True):
+        self.infer_eselon = infer_eselon
+        self.units = []
+        self.skipped = []
+        self._stack = []
+        self._pending = None
+
+    def feed(self, number, cell, line_number=None):
+        """Add one cell (with the number column next to it)."""
+        if not cell:
+            return
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            if number:
+                self.skipped.append(' '.join(pending.split()))
+            else:
+                self._add_plain(pending)
+
+        if number:
+            if not number.isdigit():
+                raise SettingParseError(f"line {line_number}: bad row number {number!r}")
+            self._add_top(cell)
+            return
+
+        marker, rest = parse_marker(cell)
+        if marker is not None:
+            self._add_marked(marker, rest)
+        elif len(self._stack) == 1 and not self._stack[0].unit.get('children') and not self._stack[0].opens:
+            self._pending = cell
+        else:
+            self._add_plain(cell)
+
+    def finish(self):
+        """Flush the last held-back cell; returns the list of top-level units."""
+        if self._pending is not None:
+            self._add_plain(self._pending)
+            self._pending = None
+        return self.units
+
+    def _unit(self, name, top=False):
+        unit = {'name': name}
+        if self.infer_eselon:
+            kinds = TOP_ESELON_BY_KIND if top else ESELON_BY_KIND
+            eselon = kinds.get(_kind(name), "II.b" if top else None)
+            if eselon:
+                unit['eselon'] = eselon
+        return unit
+
+    def _attach(self, parent_level, name, marker, opens):
+        if name.lower() in SECRETARIAT_NAMES:
+            # hierarchy.json names the secretariat after its organization
+            name = f"Sekretariat {self._stack[0].unit['name']}"
+        unit = self._unit(name)
+        # Head positions are kept on the stack so b. still follows a.
+        if not (len(self._stack) == 1 and name.lower() in HEAD_TITLES):
+            parent_level.unit.setdefault('children', []).append(unit)
+        self._stack.append(_Level(unit, marker, _kind(name), opens))
+
+    def _add_top(self, cell):
+        name, opens = clean_name(cell)
+        unit = self._unit(name, top=True)
+        self.units.append(unit)
+        self._stack = [_Level(unit, None, _kind(name), opens)]
+
+    def _add_marked(self, marker, rest):
+        if not self._stack:
+            self.skipped.append(rest)
+            return
+        name, opens = clean_name(rest)
+        if not _is_first(marker):
+            # Continue the deepest list this marker follows on from
+            for depth in range(len(self._stack) - 1, 0, -1):
+                if _follows(marker, self._stack[depth].marker):
+                    del self._stack[depth:]
+                    self._attach(self._stack[-1], name, marker, opens)
+                    return
+            # Out-of-sequence marker: sibling in the deepest list of its kind
+            for depth in range(len(self._stack) - 1, 0, -1):
+                previous = self._stack[depth].marker
+                if previous is not None and previous.isdigit() == marker.isdigit():
+                    del self._stack[depth:]
+                    self._attach(self._stack[-1], name, marker, opens)
+                    return
+        elif len(self._stack) > 1 and self._stack[-1].marker is not None \
+                and self._stack[-1].marker.isdigit() == marker.isdigit() and not self._stack[-1].opens:
+            # "a." right after an item of the same list kind restarts that list
+            del self._stack[-1]
+        self._attach(self._stack[-1], name, marker, opens)
+
+    def _add_plain(self, cell):
+        if not self._stack:
+            self.skipped.append(cell)
+            return
+        name, opens = clean_name(cell)
+        kind = _kind(name)
+        if not self._stack[-1].opens:
+            while len(self._stack) > 1 and self._stack[-1].marker is None and self._stack[-1].kind != kind:
+                del self._stack[-1]
+            if len(self._stack) > 1 and self._stack[-1].marker is None:
+                del self._stack[-1]
+        self._attach(self._stack[-1], name, None, opens)
+
+
+def parse_setting(lines, infer_eselon=True):
+    """
+    Parse the tables of setting.md into old and new hierarchies.
+
+    Args:
+        lines: Iterable of lines (e.g. an open file)
+        infer_eselon: Fill in eselon from the kind of unit
+
+    Returns:
+        Dictionary with 'old' and 'new' (lists of units) and 'skipped'
+        (headings and notes per column)
+    """
+    parsers = {column: ColumnParser(infer_eselon) for column in COLUMNS}
+    for line_number, line in enumerate(lines, 1):
+        row = split_row(line)
+        if row is None:
+            continue
+        old_number, old_cell, new_number, new_cell = row
+        parsers['old'].feed(old_number, old_cell, line_number)
+        parsers['new'].feed(new_number, new_cell, line_number)
+
+    result = {column: parser.finish() for column, parser in parsers.items()}
+    result['skipped'] = {column: parser.skipped for column, parser in parsers.items()}
+    return result
+
+
+def parse_setting_file(markdown_file, infer_eselon=True):
+    """Parse a setting.md file; see parse_setting."""
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        return parse_setting(f, infer_eselon)
+
+
+def count_units(units):
+    """Total number of units in a list of trees."""
+    total = 0
+    stack = list(units)
+    while stack:
+        unit = stack.pop()
+        total += 1
+        stack.extend(unit.get('children', ()))
+    return total
+
+
+def print_tree(units, indent=0):
+    for unit in units:
+        eselon = f" [{unit['eselon']}]" if unit.get('eselon') else ''
+        print(f"{'  ' * indent}- {unit['name']}{eselon}")
+        print_tree(unit.get('children', ()), indent + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Parse the nomenclature tables of setting.md into hierarchy trees'
+    )
+    parser.add_argument(
+        'markdown',
+        nargs='?',
+        default=str(Path(__file__).parent / "setting.md"),
+        help='Markdown file with the tables (default: setting.md)'
+    )
+    parser.add_argument(
+        '--column',
+        choices=COLUMNS,
+        default='new',
+        help='Which column to output (default: new)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        help='Write the trees as hierarchy.json-style JSON to this file instead of printing them'
+    )
+    parser.add_argument(
+        '--no-eselon',
+        action='store_true',
+        help='Do not fill in eselon'
+    )
+    parser.add_argument(
+        '--add-jabatan',
+        action='store_true',
+        help='Fill in jabatan with the rules of add_jabatan_field.py'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.markdown).exists():
+        print(f"Error: {args.markdown} not found!")
+        sys.exit(1)
+
+    try:
+        result = parse_setting_file(args.markdown, infer_eselon=not args.no_eselon)
+    except SettingParseError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    units = result[args.column]
+
+    if args.add_jabatan:
+        from hierarchy_batch import AddJabatan, apply_batch
+        apply_batch(units, [AddJabatan()])
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(units, f, indent=2, ensure_ascii=False)
+        print(f"✓ Wrote {len(units)} organizations ({count_units(units)} units) to {args.output}")
+    else:
+        print_tree(units)
+        print()
+        print(f"{args.column}: {len(units)} organizations, {count_units(units)} units")
+
+    skipped = result['skipped'][args.column]
+    if skipped:
+        print(f"Skipped headings/notes: {', '.join(skipped)}")
+
+
+if __name__ == "__main__":
+    main()
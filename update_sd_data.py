@@ -9,10 +9,12 @@ Data source: https://referensi.data.kemendikdasmen.go.id/
 Alternative: https://data.kemendikdasmen.go.id/
 
 Requirements:
-    pip install requests beautifulsoup4 pandas
+    pip install aiohttp pandas
 
 Usage:
     python update_sd_data.py
+    python update_sd_data.py --concurrency 4
+    python update_sd_data.py --base-url http://127.0.0.1:8765   # offline fixture server
     
 Note: If websites are blocked, use manual mode by downloading CSV/Excel from:
     https://data.kemendikdasmen.go.id/data-induk
@@ -21,10 +23,16 @@ Note: If websites are blocked, use manual mode by downloading CSV/Excel from:
 import json
 import sys
 import os
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import argparse
 
+from hierarchy_store import STORE_DIR, HierarchyStore
+from school_schema import check_school_complete
+
 # Kecamatan mapping: filename -> display name
 KECAMATAN_MAP = {
     "ajibarang": "Ajibarang",
@@ -57,92 +65,103 @@ KECAMATAN_MAP = {
 }
 
 
-def fetch_schools_from_website(kecamatan_name: str) -> List[Dict[str, Any]]:
+def fetch_all_schools_from_website(kecamatan_names: List[str], base_url: Optional[str] = None,
+                                   concurrency: int = 8, use_cache: bool = True
+                                   ) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Fetch school data from didaksmen website for a specific kecamatan.
+    Fetch school data for several kecamatan concurrently.
+    
+    All pages are fetched by one asyncio client (see dapodik_client.py) with a
+    shared connection pool, bounded concurrency, retries with backoff and an
+    on-disk HTTP cache revalidated with ETag/If-Modified-Since.
     
     Args:
-        kecamatan_name: Name of the kecamatan
+        kecamatan_names: Names of the kecamatan
+        base_url: Site root (default: the official site; use a fixture server offline)
+        concurrency: Maximum requests in flight
+        use_cache: Keep and revalidate responses in the HTTP cache
         
     Returns:
-        List of school dictionaries with keys: No, NPSN, Nama Sekolah, Alamat, Kelurahan, Status
-        
-    Note:
-        ⚠️ INCOMPLETE IMPLEMENTATION ⚠️
-        This function is a TEMPLATE and requires website-specific implementation.
-        
-        The actual website structure needs to be inspected and parsing logic implemented.
-        Until then, this function will return empty list and you should use --manual mode.
-        
-        To complete implementation:
-        1. Access the website and inspect the HTML structure
-        2. Identify the table/element containing school data
-        3. Parse the NPSN, Nama, Alamat, Kelurahan fields
-        4. Filter for SD Negeri in the specific kecamatan
-        5. Format according to required JSON structure
+        Dictionary of kecamatan name -> list of school dictionaries with keys:
+        No, NPSN, Nama Sekolah, Alamat, Kelurahan, Status (empty list on failure)
     """
     try:
-        import requests
-        from bs4 import BeautifulSoup
-        
-        # Base URL pattern for didaksmen
-        # Example: https://referensi.data.kemendikdasmen.go.id/pendidikan/dikdas/030211/3/all/5/all
-        # Where 030211 is kode wilayah for Banyumas
+        import asyncio
+        from dapodik_client import BASE_URL, HTTP_CACHE_DIR, FetchError, fetch_kecamatan_schools
         
-        # Kode wilayah mapping (this needs to be filled with actual codes)
-        KODE_WILAYAH = "030211"  # Kabupaten Banyumas, Jawa Tengah
+        print(f"Fetching {len(kecamatan_names)} kecamatan from {base_url or BASE_URL}...")
         
-        print(f"⚠️  Attempting to fetch data for {kecamatan_name}...")
-        print(f"⚠️  Note: Automatic fetching not fully implemented.")
-        print(f"⚠️  Recommendation: Use --manual mode with downloaded CSV/Excel")
+        cache_dir = Path(__file__).parent / HTTP_CACHE_DIR if use_cache else None
+        stats = {}
+        results = asyncio.run(fetch_kecamatan_schools(
+            kecamatan_names,
+            base_url=base_url or BASE_URL,
+            concurrency=concurrency,
+            cache_dir=cache_dir,
+            stats=stats,
+        ))
         
-        # This is a template - actual implementation depends on website structure
-        # Steps needed:
-        # 1. GET the page with proper headers
-        # 2. Parse the HTML table
-        # 3. Extract NPSN, Nama Sekolah, Alamat, Kelurahan
-        # 4. Filter for the specific kecamatan
-        
-        url = f"https://referensi.data.kemendikdasmen.go.id/pendidikan/dikdas/{KODE_WILAYAH}/3/all/5/all"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        # IMPLEMENTATION NEEDED: Parse website and extract school data
-        # The code below is incomplete and needs actual parsing logic
-        
-        # response = requests.get(url, headers=headers, timeout=30)
-        # response.raise_for_status()
-        # soup = BeautifulSoup(response.content, 'html.parser')
-        # schools = parse_school_table(soup, kecamatan_name)  # Needs implementation
-        
-        schools = []  # Empty until implementation is complete
-        
-        print(f"  ℹ️  Automatic fetching returned {len(schools)} schools")
-        print(f"  ℹ️  Please use --manual mode with downloaded data file")
-        return schools
+        print(f"  Requests: {stats['requests']}, downloaded: {stats['downloaded']}, "
+              f"not modified: {stats['not_modified']}, retries: {stats['retries']}")
+        return results
         
     except ImportError:
-        print("Error: requests and beautifulsoup4 are required.")
-        print("Install with: pip install requests beautifulsoup4")
-        return []
-    except Exception as e:
+        print("Error: aiohttp is required.")
+        print("Install with: pip install aiohttp")
+        return {name: [] for name in kecamatan_names}
+    except FetchError as e:
         print(f"Error fetching data: {e}")
         print(f"Recommendation: Use --manual mode instead")
-        return []
+        return {name: [] for name in kecamatan_names}
 
 
-def load_manual_data(csv_file: str, kecamatan_name: str) -> List[Dict[str, Any]]:
+def fetch_schools_from_website(kecamatan_name: str, base_url: Optional[str] = None) -> List[Dict[str, Any]]:
     """
-    Load school data from a manually downloaded CSV/Excel file.
+    Fetch school data from didaksmen website for a specific kecamatan.
+    
+    Args:
+        kecamatan_name: Name of the kecamatan
+        base_url: Site root (default: the official site)
+        
+    Returns:
+        List of school dictionaries with keys: No, NPSN, Nama Sekolah, Alamat, Kelurahan, Status
+    """
+    return fetch_all_schools_from_website([kecamatan_name], base_url)[kecamatan_name]
+
+
+def contains_mask(series, needle: str):
+    """
+    Case-insensitive substring match over a column, evaluated per unique value.
+    
+    Columns such as 'Bentuk Pendidikan' or 'Kecamatan' have only a handful of
+    distinct values even in the national export, so matching the uniques and
+    mapping back with isin is much cheaper than scanning every row.
+    
+    Args:
+        series: pandas Series
+        needle: Text to look for
+        
+    Returns:
+        Boolean Series (missing and non-string values never match)
+    """
+    needle = needle.lower()
+    hits = [value for value in series.dropna().unique()
+            if isinstance(value, str) and needle in value.lower()]
+    return series.isin(hits)
+
+
+def load_manual_frame(csv_file: str):
+    """
+    Read a manually downloaded CSV/Excel file and keep only SD Negeri rows.
+    
+    The file is parsed once; use split_by_kecamatan to get the schools of
+    every kecamatan from the result.
     
     Args:
         csv_file: Path to the CSV/Excel file
-        kecamatan_name: Name of the kecamatan to filter
         
     Returns:
-        List of school dictionaries
+        pandas DataFrame with the SD Negeri rows, or None on error
     """
     try:
         import pandas as pd
@@ -156,39 +175,128 @@ def load_manual_data(csv_file: str, kecamatan_name: str) -> List[Dict[str, Any]]
             df = pd.read_excel(csv_file)
         else:
             print("Error: Unsupported file format. Use CSV or Excel.")
-            return []
+            return None
         
-        # Filter for SD Negeri in the specific kecamatan
+        # Filter for SD Negeri
         # Adjust column names based on actual file structure
-        df_filtered = df[
-            (df['Bentuk Pendidikan'].str.contains('SD', case=False, na=False)) &
-            (df['Status Sekolah'].str.contains('NEGERI', case=False, na=False)) &
-            (df['Kecamatan'].str.contains(kecamatan_name, case=False, na=False))
+        return df[
+            contains_mask(df['Bentuk Pendidikan'], 'SD') &
+            contains_mask(df['Status Sekolah'], 'NEGERI')
         ]
         
-        # Convert to expected format
-        schools = []
-        for idx, row in df_filtered.iterrows():
-            school = {
-                "No": str(idx + 1),
-                "NPSN": str(row.get('NPSN', '')),
-                "Nama Sekolah": row.get('Nama Sekolah', ''),
-                "Alamat": row.get('Alamat', ''),
-                "Kelurahan": row.get('Desa/Kelurahan', ''),
-                "Status": "NEGERI"
-            }
-            schools.append(school)
-        
-        print(f"  Found {len(schools)} schools for {kecamatan_name}")
-        return schools
-        
     except ImportError:
         print("Error: pandas is required for manual mode.")
         print("Install with: pip install pandas openpyxl")
+        return None
+    except Exception as e:
+        print(f"Error loading manual data: {e}")
+        return None
+
+
+def schools_from_frame(df_filtered, group_keys=None):
+    """
+    Convert filtered DataFrame rows to school columns in one vectorized pass.
+    
+    Args:
+        df_filtered: DataFrame rows to convert
+        group_keys: Optional array of group labels; 'No' restarts at 1 in each group
+        
+    Returns:
+        pandas DataFrame with columns: No, NPSN, Nama Sekolah, Alamat, Kelurahan, Status
+    """
+    import pandas as pd
+    
+    def column(name):
+        if name in df_filtered.columns:
+            return df_filtered[name].to_numpy()
+        return [''] * len(df_filtered)
+    
+    if group_keys is None:
+        numbers = range(1, len(df_filtered) + 1)
+    else:
+        numbers = pd.Series(group_keys).groupby(group_keys, sort=False).cumcount().to_numpy() + 1
+    
+    if 'NPSN' in df_filtered.columns:
+        npsn = df_filtered['NPSN'].astype(str).to_numpy()
+    else:
+        npsn = column('NPSN')
+    
+    return pd.DataFrame({
+        "No": [str(n) for n in numbers],
+        "NPSN": npsn,
+        "Nama Sekolah": column('Nama Sekolah'),
+        "Alamat": column('Alamat'),
+        "Kelurahan": column('Desa/Kelurahan'),
+        "Status": "NEGERI",
+    })
+
+
+def split_by_kecamatan(df, kecamatan_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Split SD Negeri rows into school lists per kecamatan.
+    
+    A kecamatan matches every 'Kecamatan' value that contains its name
+    (case-insensitive). Matching is done once per distinct value, rows are
+    labelled with a join, and records are built column-wise and emitted with
+    a single groupby, without iterating over rows in Python.
+    
+    Args:
+        df: DataFrame from load_manual_frame
+        kecamatan_names: Display names of the kecamatan to extract
+        
+    Returns:
+        Dictionary of kecamatan name -> list of school dictionaries
+    """
+    import pandas as pd
+    
+    result = {kecamatan_name: [] for kecamatan_name in kecamatan_names}
+    
+    pairs = [
+        (value, kecamatan_name)
+        for value in df['Kecamatan'].dropna().unique() if isinstance(value, str)
+        for kecamatan_name in kecamatan_names if kecamatan_name.lower() in value.lower()
+    ]
+    if not pairs:
+        return result
+    
+    # One row per (school, matching kecamatan), in the original file order
+    labels = pd.DataFrame(pairs, columns=['Kecamatan', '_kecamatan'])
+    matched = (
+        df.assign(_row=range(len(df)))
+        .merge(labels, on='Kecamatan', how='inner')
+        .sort_values('_row', kind='stable')
+    )
+    
+    group_keys = matched['_kecamatan'].to_numpy()
+    schools = schools_from_frame(matched, group_keys)
+    for kecamatan_name, group in schools.groupby(group_keys, sort=False):
+        result[kecamatan_name] = group.to_dict('records')
+    return result
+
+
+def load_manual_data(csv_file: str, kecamatan_name: str) -> List[Dict[str, Any]]:
+    """
+    Load school data from a manually downloaded CSV/Excel file.
+    
+    Args:
+        csv_file: Path to the CSV/Excel file
+        kecamatan_name: Name of the kecamatan to filter
+        
+    Returns:
+        List of school dictionaries
+    """
+    df = load_manual_frame(csv_file)
+    if df is None:
         return []
+    
+    try:
+        schools = split_by_kecamatan(df, [kecamatan_name])[kecamatan_name]
     except Exception as e:
         print(f"Error loading manual data: {e}")
         return []
+    
+    print(f"  Found {len(schools)} schools for {kecamatan_name}")
+    return schools
 
 
 def validate_school_data(school: Dict[str, Any]) -> bool:
@@ -201,13 +309,7 @@ def validate_school_data(school: Dict[str, Any]) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    required_fields = ['No', 'NPSN', 'Nama Sekolah', 'Alamat', 'Kelurahan', 'Status']
-    
-    for field in required_fields:
-        if field not in school or not school[field]:
-            return False
-    
-    return True
+    return not check_school_complete(school)
 
 
 def update_json_file(kecamatan_key: str, schools: List[Dict[str, Any]], dry_run: bool = False):
@@ -245,18 +347,77 @@ def update_json_file(kecamatan_key: str, schools: List[Dict[str, Any]], dry_run:
         print(f"  [DRY RUN] Would update {filename} with {len(valid_schools)} schools")
         return
     
-    # Backup existing file
+    # Keep the previous contents in the version store (only changed schools are stored)
+    store = HierarchyStore(filename)
     if filepath.exists():
-        backup_path = filepath.with_suffix('.json.bak')
-        import shutil
-        shutil.copy2(filepath, backup_path)
-        print(f"  Backed up to {backup_path.name}")
+        version_id, created = store.save_file(filepath, label='before update')
+        if created:
+            print(f"  Saved previous {filename} as version {version_id}")
     
     # Write new data
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(valid_schools, f, ensure_ascii=False, indent=2)
     
-    print(f"  ✓ Updated {filename} with {len(valid_schools)} schools")
+    version_id, created = store.save(valid_schools, label='update')
+    print(f"  ✓ Updated {filename} with {len(valid_schools)} schools (version {version_id})")
+
+
+class ThreadOutput:
+    """
+    Stand-in for sys.stdout that lets worker threads buffer their own output.
+    
+    Threads that called capture() write into their own buffer; all other
+    writes go to the wrapped stream. This keeps per-kecamatan log blocks
+    readable when several kecamatan are processed at once.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def capture(self):
+        self.local.buffer = io.StringIO()
+    
+    def release(self) -> str:
+        buffer = getattr(self.local, 'buffer', None)
+        self.local.buffer = None
+        return buffer.getvalue() if buffer is not None else ""
+    
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer if buffer is not None else self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+
+
+def process_kecamatan(kec_key: str, kec_name: str, schools: List[Dict[str, Any]],
+                      dry_run: bool = False, manual: bool = True):
+    """
+    Validate and write the data of one kecamatan.
+    
+    Args:
+        kec_key: Kecamatan key (filename without extension)
+        kec_name: Kecamatan display name
+        schools: Schools from the manual file or the website
+        dry_run: If True, don't actually write files
+        manual: True if schools came from a manual file
+    """
+    print(f"Processing: {kec_name}")
+    
+    if manual:
+        print(f"  Found {len(schools)} schools for {kec_name}")
+    elif not schools:
+        print(f"  No data fetched. Consider using --manual mode.")
+        print(f"  Download data from: https://data.kemendikdasmen.go.id/data-induk")
+        print()
+        return
+    else:
+        print(f"  Fetched {len(schools)} schools for {kec_name}")
+    
+    # Update the JSON file
+    update_json_file(kec_key, schools, dry_run)
+    print()
 
 
 def main():
@@ -278,6 +439,28 @@ def main():
         action='store_true',
         help='Show what would be updated without actually updating'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of kecamatan to process in parallel (default: 1)'
+    )
+    parser.add_argument(
+        '--base-url',
+        type=str,
+        help='Site root to fetch from (e.g. a local dapodik_fixture_server.py)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Maximum concurrent requests when fetching from the website (default: 8)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not use the on-disk HTTP cache when fetching'
+    )
     
     args = parser.parse_args()
     
@@ -299,25 +482,50 @@ def main():
     print(f"Processing {len(kecamatan_list)} kecamatan(s)...")
     print()
     
+    kecamatan_names = [kec_name for _, kec_name in kecamatan_list]
+    if args.manual:
+        # Parse the manual file once and split it per kecamatan
+        df = load_manual_frame(args.manual)
+        if df is None:
+            sys.exit(1)
+        all_schools = split_by_kecamatan(df, kecamatan_names)
+    else:
+        # Fetch all kecamatan pages concurrently
+        all_schools = fetch_all_schools_from_website(kecamatan_names, args.base_url,
+                                                     args.concurrency, not args.no_cache)
+    print()
+    
     # Process each kecamatan
-    for kec_key, kec_name in kecamatan_list:
-        print(f"Processing: {kec_name}")
+    tasks = [
+        (kec_key, kec_name, all_schools.get(kec_name, []), args.dry_run, bool(args.manual))
+        for kec_key, kec_name in kecamatan_list
+    ]
+    
+    if args.jobs > 1:
+        output = ThreadOutput(sys.stdout)
         
-        if args.manual:
-            # Load from manual file
-            schools = load_manual_data(args.manual, kec_name)
-        else:
-            # Fetch from website
-            schools = fetch_schools_from_website(kec_name)
-            
-            if not schools:
-                print(f"  No data fetched. Consider using --manual mode.")
-                print(f"  Download data from: https://data.kemendikdasmen.go.id/data-induk")
-                continue
+        def run_task(task):
+            output.capture()
+            error = None
+            try:
+                process_kecamatan(*task)
+            except Exception as e:
+                error = e
+            return output.release(), error
         
-        # Update the JSON file
-        update_json_file(kec_key, schools, args.dry_run)
-        print()
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+                # Print each kecamatan's log in order as soon as it is ready
+                for log, error in executor.map(run_task, tasks):
+                    output.stream.write(log)
+                    if error is not None:
+                        raise error
+        finally:
+            sys.stdout = output.stream
+    else:
+        for task in tasks:
+            process_kecamatan(*task)
     
     print("=" * 70)
     print("Update complete!")
@@ -327,7 +535,7 @@ def main():
         print("This was a dry run. No files were modified.")
         print("Remove --dry-run to apply changes.")
     else:
-        print("Backup files (.json.bak) have been created.")
+        print(f"Previous versions are kept in {STORE_DIR}/ (see hierarchy_store.py list/restore).")
         print("Review the changes and commit if everything looks good.")
 
 
@@ -9,18 +9,26 @@ This script validates that all JSON files:
 4. Have sequential numbering
 5. Have valid NPSN format
 
+Files can be validated in parallel; NPSN values from all files are merged
+into one index so duplicates across kecamatan are reported too.
+
 Usage:
     python validate_sd_json.py
     python validate_sd_json.py --file sd_negeri_ajibarang.json
+    python validate_sd_json.py --jobs 8 --json
 """
 
 import json
+import os
 import sys
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 import re
 import argparse
 
+from json_stream import iter_items
+from school_schema import validate_school
+
 
 def validate_npsn(npsn: str) -> Tuple[bool, str]:
     """
@@ -58,64 +66,18 @@ def validate_school_record(school: Dict[str, Any], expected_no: int) -> List[str
     Returns:
         List of error messages (empty if valid)
     """
-    errors = []
-    
-    # Check required fields exist
-    required_fields = ['No', 'NPSN', 'Nama Sekolah', 'Alamat', 'Kelurahan', 'Status']
-    for field in required_fields:
-        if field not in school:
-            errors.append(f"Missing required field: {field}")
-    
-    # Validate No field
-    if 'No' in school:
-        if not isinstance(school['No'], str):
-            errors.append(f"'No' must be string, got {type(school['No'])}")
-        elif school['No'] != str(expected_no):
-            errors.append(f"'No' should be '{expected_no}', got '{school['No']}'")
-    
-    # Validate NPSN
-    if 'NPSN' in school:
-        is_valid, error_msg = validate_npsn(school['NPSN'])
-        if not is_valid:
-            errors.append(f"Invalid NPSN: {error_msg}")
-    
-    # Validate Nama Sekolah
-    if 'Nama Sekolah' in school:
-        if not school['Nama Sekolah']:
-            errors.append("'Nama Sekolah' is empty")
-        elif not isinstance(school['Nama Sekolah'], str):
-            errors.append(f"'Nama Sekolah' must be string")
-        elif 'Kecamatan' not in school['Nama Sekolah']:
-            errors.append(f"'Nama Sekolah' should include 'Kecamatan [nama]': {school['Nama Sekolah']}")
-    
-    # Validate Alamat
-    if 'Alamat' in school:
-        if not school['Alamat']:
-            errors.append("'Alamat' is empty")
-        elif not isinstance(school['Alamat'], str):
-            errors.append(f"'Alamat' must be string")
-    
-    # Validate Kelurahan
-    if 'Kelurahan' in school:
-        if not school['Kelurahan']:
-            errors.append("'Kelurahan' is empty")
-        elif not isinstance(school['Kelurahan'], str):
-            errors.append(f"'Kelurahan' must be string")
-    
-    # Validate Status
-    if 'Status' in school:
-        if school['Status'] != 'NEGERI':
-            errors.append(f"'Status' must be 'NEGERI', got '{school['Status']}'")
-    
-    return errors
+    # Rules live in school_schema.SCHOOL_SCHEMA, compiled once at import
+    return validate_school(school, expected_no)
 
 
-def validate_json_file(filepath: Path) -> Tuple[bool, List[str], Dict[str, Any]]:
+def validate_json_file(filepath: Path, npsn_records: List[Tuple[str, int]] = None
+                       ) -> Tuple[bool, List[str], Dict[str, Any]]:
     """
     Validate a single JSON file.
     
     Args:
         filepath: Path to JSON file
+        npsn_records: Optional list that receives (NPSN, record number) for every record
         
     Returns:
         Tuple of (is_valid, list of errors, stats dict)
@@ -132,58 +94,143 @@ def validate_json_file(filepath: Path) -> Tuple[bool, List[str], Dict[str, Any]]
     if not filepath.exists():
         return False, [f"File not found: {filepath}"], stats
     
-    # Try to load JSON
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        return False, [f"Invalid JSON format: {e}"], stats
-    except Exception as e:
-        return False, [f"Error reading file: {e}"], stats
+    # Track NPSN for duplicates
+    npsn_map = {}
     
-    # Check data is a list
-    if not isinstance(data, list):
-        return False, ["JSON root must be an array"], stats
+    # Validate each school as it is read from the file
+    records = iter_items(filepath)
+    while True:
+        try:
+            school = next(records)
+        except StopIteration:
+            break
+        except TypeError:
+            return False, ["JSON root must be an array"], stats
+        except ValueError as e:
+            return False, [f"Invalid JSON format: {e}"], stats
+        except Exception as e:
+            return False, [f"Error reading file: {e}"], stats
+        
+        stats['total_schools'] += 1
+        validate_record(school, stats['total_schools'], errors, stats, npsn_map, npsn_records)
     
-    if len(data) == 0:
+    if stats['total_schools'] == 0:
         return False, ["JSON array is empty"], stats
     
-    stats['total_schools'] = len(data)
+    is_valid = len(errors) == 0
+    return is_valid, errors, stats
+
+
+def validate_record(school: Any, idx: int, errors: List[str], stats: Dict[str, Any],
+                    npsn_map: Dict[str, int], npsn_records: List[Tuple[str, int]] = None):
+    """
+    Validate one record of a file and update the file's errors and stats.
+    
+    Args:
+        school: Parsed record
+        idx: Record number (1-based)
+        errors: File error list to append to
+        stats: File stats dict to update
+        npsn_map: NPSN -> first record number seen in this file
+        npsn_records: Optional list that receives (NPSN, record number)
+    """
+    if not isinstance(school, dict):
+        errors.append(f"Record {idx}: Must be an object, got {type(school)}")
+        stats['invalid_schools'] += 1
+        return
+    
+    # Validate this school
+    school_errors = validate_school_record(school, idx)
+    
+    if school_errors:
+        errors.append(f"Record {idx}:")
+        for err in school_errors:
+            errors.append(f"  - {err}")
+        stats['invalid_schools'] += 1
+    else:
+        stats['valid_schools'] += 1
     
-    # Track NPSN for duplicates
-    npsn_map = {}
+    # Check for duplicate NPSN
+    if 'NPSN' in school:
+        npsn = school['NPSN']
+        if npsn_records is not None:
+            npsn_records.append((npsn, idx))
+        if npsn in npsn_map:
+            duplicate_info = f"NPSN {npsn} appears in records {npsn_map[npsn]} and {idx}"
+            stats['duplicate_npsn'].append(duplicate_info)
+            if duplicate_info not in errors:
+                errors.append(f"Duplicate NPSN found: {duplicate_info}")
+        else:
+            npsn_map[npsn] = idx
+
+
+def validate_file_task(filepath: str) -> Dict[str, Any]:
+    """
+    Validate one file and collect its NPSN values (process pool worker).
     
-    # Validate each school
-    for idx, school in enumerate(data, 1):
-        if not isinstance(school, dict):
-            errors.append(f"Record {idx}: Must be an object, got {type(school)}")
-            stats['invalid_schools'] += 1
-            continue
-        
-        # Validate this school
-        school_errors = validate_school_record(school, idx)
+    Args:
+        filepath: Path to JSON file
         
-        if school_errors:
-            errors.append(f"Record {idx}:")
-            for err in school_errors:
-                errors.append(f"  - {err}")
-            stats['invalid_schools'] += 1
-        else:
-            stats['valid_schools'] += 1
+    Returns:
+        Dictionary with file, valid, errors, stats and npsn (list of [NPSN, record])
+    """
+    npsn_records = []
+    is_valid, errors, stats = validate_json_file(Path(filepath), npsn_records)
+    return {
+        'file': Path(filepath).name,
+        'valid': is_valid,
+        'errors': errors,
+        'stats': stats,
+        'npsn': npsn_records,
+    }
+
+
+def validate_files(files: List[Path], jobs: int = 1) -> List[Dict[str, Any]]:
+    """
+    Validate several files, optionally spread across a process pool.
+    
+    Args:
+        files: Paths to JSON files
+        jobs: Number of worker processes (1 = validate in this process)
         
-        # Check for duplicate NPSN
-        if 'NPSN' in school:
-            npsn = school['NPSN']
-            if npsn in npsn_map:
-                duplicate_info = f"NPSN {npsn} appears in records {npsn_map[npsn]} and {idx}"
-                stats['duplicate_npsn'].append(duplicate_info)
-                if duplicate_info not in errors:
-                    errors.append(f"Duplicate NPSN found: {duplicate_info}")
-            else:
-                npsn_map[npsn] = idx
+    Returns:
+        List of validate_file_task results, in the order of files
+    """
+    paths = [str(f) for f in files]
+    if jobs <= 1 or len(paths) <= 1:
+        return [validate_file_task(p) for p in paths]
     
-    is_valid = len(errors) == 0
-    return is_valid, errors, stats
+    # Imported here: multiprocessing is a large share of this script's start-up
+    from concurrent.futures import ProcessPoolExecutor
+    
+    # Hand out files in batches to keep inter-process overhead low
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(validate_file_task, paths, chunksize=chunksize))
+
+
+def find_cross_file_duplicates(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge NPSN values of all files into one index and report cross-file duplicates.
+    
+    Duplicates within a single file are already reported by validate_json_file.
+    
+    Args:
+        results: Results from validate_files
+        
+    Returns:
+        List of {'npsn': ..., 'occurrences': [{'file': ..., 'record': ...}, ...]}
+    """
+    index = {}
+    for result in results:
+        for npsn, record in result['npsn']:
+            index.setdefault(npsn, []).append({'file': result['file'], 'record': record})
+    
+    duplicates = []
+    for npsn, occurrences in index.items():
+        if len({occurrence['file'] for occurrence in occurrences}) > 1:
+            duplicates.append({'npsn': npsn, 'occurrences': occurrences})
+    return duplicates
 
 
 def print_validation_result(filename: str, is_valid: bool, errors: List[str], stats: Dict[str, Any]):
@@ -226,12 +273,25 @@ def main():
         action='store_true',
         help='Show detailed validation information'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for validation (0 = one per CPU, default: 1)'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print machine-readable results as JSON'
+    )
     
     args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
     
-    print("=" * 70)
-    print("SD Negeri JSON Validation")
-    print("=" * 70)
+    if not args.json:
+        print("=" * 70)
+        print("SD Negeri JSON Validation")
+        print("=" * 70)
     
     # Determine which files to validate
     base_path = Path(__file__).parent
@@ -245,10 +305,14 @@ def main():
         print("\nNo JSON files found to validate.")
         sys.exit(1)
     
-    print(f"\nValidating {len(files)} file(s)...\n")
+    if not args.json:
+        print(f"\nValidating {len(files)} file(s)...\n")
+    
+    results = validate_files(files, jobs)
+    cross_duplicates = find_cross_file_duplicates(results)
     
-    # Validate each file
-    all_valid = True
+    # Merge per-file results
+    all_valid = not cross_duplicates
     total_stats = {
         'files': 0,
         'valid_files': 0,
@@ -256,23 +320,44 @@ def main():
         'total_schools': 0,
         'valid_schools': 0,
         'invalid_schools': 0,
+        'cross_file_duplicate_npsn': len(cross_duplicates),
     }
     
-    for filepath in files:
-        is_valid, errors, stats = validate_json_file(filepath)
-        print_validation_result(filepath.name, is_valid, errors, stats)
-        
+    for result in results:
+        stats = result['stats']
         total_stats['files'] += 1
         total_stats['total_schools'] += stats['total_schools']
         total_stats['valid_schools'] += stats['valid_schools']
         total_stats['invalid_schools'] += stats['invalid_schools']
         
-        if is_valid:
+        if result['valid']:
             total_stats['valid_files'] += 1
         else:
             total_stats['invalid_files'] += 1
             all_valid = False
     
+    if args.json:
+        output = {
+            'valid': all_valid,
+            'summary': total_stats,
+            'files': [
+                {key: result[key] for key in ('file', 'valid', 'errors', 'stats')}
+                for result in results
+            ],
+            'cross_file_duplicates': cross_duplicates,
+        }
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+        sys.exit(0 if all_valid else 1)
+    
+    for result in results:
+        print_validation_result(result['file'], result['valid'], result['errors'], result['stats'])
+    
+    if cross_duplicates:
+        print(f"\n✗ NPSN used in more than one file ({len(cross_duplicates)}):")
+        for duplicate in cross_duplicates:
+            places = ', '.join(f"{o['file']} #{o['record']}" for o in duplicate['occurrences'])
+            print(f"    - {duplicate['npsn']}: {places}")
+    
     # Print summary
     print("\n" + "=" * 70)
     print("SUMMARY")
@@ -285,6 +370,8 @@ def main():
     print(f"  ✓ Valid: {total_stats['valid_schools']}")
     if total_stats['invalid_schools'] > 0:
         print(f"  ✗ Invalid: {total_stats['invalid_schools']}")
+    if cross_duplicates:
+        print(f"\nNPSN duplicated across files: {len(cross_duplicates)}")
     
     print("\n" + "=" * 70)
     
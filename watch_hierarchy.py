@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Watch hierarchy.json and the sd_negeri_*.json files; re-validate and
+re-export on every save.
+
+Running validate_sd_json.py and export_to_xlsx.py after each edit pays for
+interpreter start-up, imports and a full pass over every file. The watcher
+stays running and keeps its state in memory:
+- the validation result of every sd_negeri file; a save re-validates only
+  that file, and cross-file NPSN duplicates are recomputed from the kept
+  NPSN lists
+- the exported rows of every top-level organization, keyed by the same
+  content hash as --incremental exports (including the children files
+  referenced in the organization); a save re-flattens only the
+  organizations that changed
+- the parsed children files (ChildrenLoader); the derived jabatan fields
+  are cached by jabatan_rules, and with --derived-cache also on disk
+  (DerivedCache)
+
+Files are polled (size and mtime) every --interval seconds; a change is
+processed once the file has looked the same for one interval, so a save
+still being written is not read halfway. An sd_negeri file only triggers
+an export when a unit links it through children_file, and only when it is
+valid; an invalid file or hierarchy.json keeps the last export in place.
+
+Usage:
+    python watch_hierarchy.py
+    python watch_hierarchy.py --format csv --format xlsx
+    python watch_hierarchy.py --interval 0.1
+    python watch_hierarchy.py --derived-cache
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from derived_fields import DerivedCache
+from export_formats import WRITERS, ExportError, open_writers, output_path, write_records
+from export_to_xlsx import COLUMNS, iter_flatten_hierarchy, plan_export_blocks
+from json_stream import load_json
+from lazy_children import CHILDREN_FILE_FIELD, ChildrenFileError, ChildrenLoader
+from validate_sd_json import find_cross_file_duplicates, print_validation_result, validate_file_task
+
+
+# Seconds between two polls of the watched files
+POLL_INTERVAL = 0.25
+
+
+def file_state(path):
+    """(size, mtime_ns) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class Watcher:
+    """
+    In-memory validation and export state of one hierarchy directory.
+
+    Args:
+        json_file: Hierarchy JSON file; sd_negeri_*.json files are watched next to it
+        formats: Export formats (names of export_formats.WRITERS)
+        output_file: Base output file; each format gets its own extension
+        rules: Optional provider of the derived fields (e.g. a
+            derived_fields.DerivedCache); defaults to jabatan_rules
+    """
+
+    def __init__(self, json_file, formats, output_file, rules=None):
+        self.json_file = Path(json_file)
+        self.base_dir = self.json_file.parent
+        self.outputs = {fmt: output_path(output_file, fmt) for fmt in formats}
+        self.keys = [key for key, _ in COLUMNS]
+        self.loader = ChildrenLoader(self.base_dir)
+        self.rules = rules
+        # File name -> validate_file_task result
+        self.results = {}
+        # Block hash -> exported rows of one top-level organization
+        self.rows = {}
+        # Children files referenced by the current hierarchy
+        self.linked = set()
+        self.data = None
+        # Path -> state last processed / state seen in the previous poll
+        self.processed = {}
+        self.seen = {}
+
+    def watched_files(self):
+        return [self.json_file] + sorted(self.base_dir.glob('sd_negeri_*.json'))
+
+    def poll(self):
+        """
+        Files whose change has settled since they were last processed.
+
+        Returns:
+            List of paths, hierarchy.json first
+        """
+        current = {path: file_state(path) for path in self.watched_files()}
+        for path in self.processed:
+            current.setdefault(path, None)
+        settled = [
+            path for path, state in current.items()
+            if state != self.processed.get(path) and state == self.seen.get(path)
+        ]
+        self.seen = current
+        return sorted(settled, key=lambda path: path != self.json_file)
+
+    def validate(self, path):
+        """
+        Re-validate one sd_negeri file.
+
+        Returns:
+            True if the file is valid (or was removed)
+        """
+        if not path.exists():
+            self.results.pop(path.name, None)
+            print(f"- {path.name}: removed")
+            return True
+        result = validate_file_task(str(path))
+        self.results[path.name] = result
+        print_validation_result(result['file'], result['valid'], result['errors'], result['stats'])
+
+        duplicates = [
+            duplicate for duplicate in find_cross_file_duplicates(list(self.results.values()))
+            if any(occurrence['file'] == path.name for occurrence in duplicate['occurrences'])
+        ]
+        if duplicates:
+            print(f"   ✗ NPSN also used in other files ({len(duplicates)}):")
+            for duplicate in duplicates:
+                places = ', '.join(f"{o['file']} #{o['record']}" for o in duplicate['occurrences'])
+                print(f"    - {duplicate['npsn']}: {places}")
+        return result['valid'] and not duplicates
+
+    def load_hierarchy(self):
+        """
+        Re-read hierarchy.json.
+
+        Returns:
+            True if the file was parsed
+        """
+        try:
+            self.data = load_json(self.json_file)
+        except (OSError, ValueError) as e:
+            print(f"✗ {self.json_file.name}: {e}")
+            return False
+        self.linked = self._children_files(self.data)
+        return True
+
+    @staticmethod
+    def _children_files(data):
+        """Names of the files referenced by children_file fields in data."""
+        linked = set()
+        stack = list(data) if isinstance(data, list) else []
+        while stack:
+            unit = stack.pop()
+            if not isinstance(unit, dict):
+                continue
+            if unit.get(CHILDREN_FILE_FIELD):
+                linked.add(unit[CHILDREN_FILE_FIELD])
+            if isinstance(unit.get('children'), list):
+                stack.extend(unit['children'])
+        return linked
+
+    def export(self):
+        """
+        Write every output, flattening only the organizations that changed.
+
+        Returns:
+            (records written, organizations rebuilt)
+        """
+        blocks = plan_export_blocks(self.data, self.loader)
+        rows = {}
+        rebuilt = 0
+        for item, block_hash in blocks:
+            if block_hash in self.rows:
+                rows[block_hash] = self.rows[block_hash]
+                continue
+            rows[block_hash] = [
+                [record[key] for key in self.keys]
+                for record in iter_flatten_hierarchy([item], loader=self.loader, rules=self.rules)
+            ]
+            rebuilt += 1
+        records = (dict(zip(self.keys, row)) for _, block_hash in blocks for row in rows[block_hash])
+        count = write_records(records, open_writers(self.outputs, self.keys))
+        self.rows = rows
+        if self.rules is not None:
+            self.rules.save(prune=False)
+        return count, rebuilt
+
+    def process(self, paths):
+        """
+        Validate the changed files and re-export if the hierarchy is affected.
+
+        Args:
+            paths: Changed files; hierarchy.json must come first so the links
+                of the sd_negeri files are known
+        """
+        start = time.perf_counter()
+        needs_export = False
+        valid = True
+        for path in paths:
+            self.processed[path] = self.seen.get(path)
+            if path == self.json_file:
+                if not self.load_hierarchy():
+                    valid = False
+                    continue
+                needs_export = True
+            else:
+                file_valid = self.validate(path)
+                if path.name in self.linked:
+                    needs_export = True
+                    valid = valid and file_valid
+
+        if needs_export and self.data is not None:
+            if not valid:
+                print("Export skipped until the errors are fixed; previous output kept.")
+            else:
+                try:
+                    count, rebuilt = self.export()
+                except (ExportError, ChildrenFileError) as e:
+                    print(f"✗ Export failed: {e}")
+                else:
+                    names = ', '.join(path.name for path in self.outputs.values())
+                    print(f"✓ Exported {count} records to {names} "
+                          f"({rebuilt} organization(s) rebuilt)")
+        print(f"[{time.strftime('%H:%M:%S')}] {len(paths)} file(s) processed "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def run(self, interval=POLL_INTERVAL):
+        """Process every file once, then watch for changes until interrupted."""
+        # The first poll only records the initial state; everything counts as changed
+        self.seen = {path: file_state(path) for path in self.watched_files()}
+        self.process(sorted(self.seen, key=lambda path: path != self.json_file))
+        print(f"\nWatching {self.base_dir} (Ctrl+C to stop)...")
+        while True:
+            time.sleep(interval)
+            changed = self.poll()
+            if changed:
+                print()
+                self.process(changed)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Re-validate and re-export whenever hierarchy.json or an sd_negeri file is saved'
+    )
+    parser.add_argument(
+        '--file',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy.json"),
+        help='Hierarchy JSON file (default: hierarchy.json)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=str(Path(__file__).parent / "hierarchy_export.xlsx"),
+        help='Base output file; the extension follows the format (default: hierarchy_export.xlsx)'
+    )
+    parser.add_argument(
+        '--format',
+        action='append',
+        choices=list(WRITERS),
+        help='Output format; repeat for several formats (default: xlsx)'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=POLL_INTERVAL,
+        help=f'Seconds between polls (default: {POLL_INTERVAL})'
+    )
+    parser.add_argument(
+        '--derived-cache',
+        action='store_true',
+        help='Keep derived jabatan fields on disk between runs (in .derived_cache/)'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        print(f"Error: {args.file} not found!")
+        sys.exit(1)
+
+    formats = list(dict.fromkeys(args.format or ['xlsx']))
+    rules = DerivedCache() if args.derived_cache else None
+    watcher = Watcher(args.file, formats, args.output, rules)
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()